@@ -4,6 +4,11 @@ import os
 BOT_TOKEN = os.getenv("BOT_TOKEN", "")
 TON_WALLET_ADDRESS = os.getenv("TON_WALLET_ADDRESS", "")
 
+# Logging level (set LOG_LEVEL=DEBUG to see per-callback routing logs;
+# debug calls cost nothing when the level is higher because logging skips
+# formatting for suppressed records)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
 # Function to validate environment variables
 def validate_environment():
     """Validate that all required environment variables are set"""
@@ -20,10 +25,10 @@ def validate_environment():
     print("✅ Environment variables validated successfully")
     return True
 
-# Admin Configuration
-ADMIN_USER_IDS = [
+# Admin Configuration (frozenset for O(1) membership checks)
+ADMIN_USER_IDS = frozenset(
     int(x) for x in os.getenv("ADMIN_USER_IDS", "8059922747").split(",")
-]
+)
 
 # TON API Configuration
 TON_API_URL = "https://tonapi.io/v2"
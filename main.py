@@ -1,17 +1,28 @@
 from aiogram import Bot, Dispatcher, types, Router, filters, F
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, LabeledPrice
 import asyncio
-from collections import defaultdict
+import functools
+import heapq
+from collections import defaultdict, OrderedDict
+import os
 import random
+import re
 import aiohttp
 import time
 import uuid
 import sqlite3
+import orjson
 from datetime import datetime, timedelta
 import config
+import translations
+from translations import get_admin_text
 
 # Import from modular structure
 from src.models import (
+    db_connect,
+    read_conn,
+    write_conn,
     init_database,
     load_pending_payments,
     load_processed_transactions,
@@ -19,8 +30,21 @@ from src.models import (
     save_pending_payment,
     remove_pending_payment,
     save_stars_transaction,
-    save_user_data,
-    load_user_data
+    save_users_bulk,
+    load_user_data,
+    get_users_page,
+    get_user_overview_page,
+    get_package_distribution,
+    count_users,
+    get_package_stats,
+    get_level_stats,
+    get_spin_totals,
+    get_ton_totals,
+    get_stars_totals,
+    get_ton_revenue_by_package,
+    get_stars_revenue_by_package,
+    get_recent_ton_transactions,
+    get_recent_stars_transactions
 )
 
 from src.services import (
@@ -30,7 +54,10 @@ from src.services import (
     clear_user_payments
 )
 
+from src.utils.cache import TTLCache
+
 from src.utils import (
+    setup_queue_logger,
     create_keyboard,
     generate_referral_link,
     parse_referral_start,
@@ -45,10 +72,41 @@ from src.utils import (
     send_nft_reward_message
 )
 
+# Queue-backed logger so handler logging never blocks the event loop on write()
+logger = setup_queue_logger("CGSpinsBot.main", level=config.LOG_LEVEL)
+
+# Fast wall-clock timestamp formatter
+def format_now() -> str:
+    """Format the current local time as 'YYYY-MM-DD HH:MM:SS'
+
+    Builds the string manually from time.localtime() — noticeably faster than
+    datetime.now().strftime() which goes through locale-aware formatting.
+    """
+    t = time.localtime()
+    return f"{t.tm_year}-{t.tm_mon:02d}-{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+
 # Admin check function
-def is_admin(user_id: int) -> bool:
-    """Check if user is an admin"""
-    return user_id in config.ADMIN_USER_IDS
+def is_admin(user_id: int, _admins=config.ADMIN_USER_IDS) -> bool:
+    """Check if user is an admin
+
+    The admin set is a static frozenset loaded from the environment at
+    import, so membership is the whole check; binding it as a default
+    skips the config module/attribute lookups on every call.
+    """
+    return user_id in _admins
+
+# Shared denial message for admin-only commands (pre-rendered once)
+ADMIN_DENIED_TEXT = "❌ <b>Access Denied</b>\n\nThis command is only available to admins."
+
+def admin_only(handler):
+    """Decorator that rejects non-admin users before running a command handler"""
+    @functools.wraps(handler)
+    async def wrapper(message: types.Message):
+        if message.from_user.id not in config.ADMIN_USER_IDS:
+            await message.reply(ADMIN_DENIED_TEXT, parse_mode="HTML")
+            return
+        return await handler(message)
+    return wrapper
 
 # Admin notification function
 async def send_admin_nft_notification(bot, user_id: int, username: str, package: str, nft_won: str):
@@ -66,7 +124,7 @@ async def send_admin_nft_notification(bot, user_id: int, username: str, package:
 📦 <b>Package:</b> {package.title()}
 🏆 <b>NFT Won:</b> {nft_won}
 
-⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+⏰ <b>Time:</b> {format_now()}
 
 📝 <b>Action Required:</b> Please manually send the NFT to the user.
         """
@@ -103,7 +161,7 @@ async def send_admin_package_notification(bot, user_id: int, username: str, pack
 💳 <b>Payment Method:</b> {payment_method}
 💵 <b>Amount:</b> {amount}
 
-⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+⏰ <b>Time:</b> {format_now()}
 
 ✅ <b>Status:</b> Package activated successfully
         """
@@ -123,29 +181,75 @@ async def send_admin_package_notification(bot, user_id: int, username: str, pack
     except Exception as e:
         print(f"❌ [Backend] Error in send_admin_package_notification: {e}")
 
+# Last content hash sent per (chat_id, message_id). Telegram rejects edits
+# with identical content, which used to cost a full API round-trip plus an
+# exception parse on every repeat click; checking the hash locally skips the
+# call outright. LRU-capped so the map can't grow unbounded.
+_last_edit = OrderedDict()
+_LAST_EDIT_MAX = 4096
+
+
+def _edit_content_hash(text: str, reply_markup) -> int:
+    buttons = None
+    if reply_markup is not None and getattr(reply_markup, "inline_keyboard", None):
+        buttons = tuple(
+            (button.text, button.callback_data)
+            for row in reply_markup.inline_keyboard for button in row
+        )
+    return hash((text, buttons))
+
+
 # Helper function for safe message editing
-async def safe_edit_message(callback, text: str, reply_markup=None, parse_mode="HTML"):
-    """Safely edit a message with proper error handling for 'message is not modified' errors"""
+async def safe_edit_message(callback, text: str, reply_markup=None, parse_mode="HTML") -> bool:
+    """Safely edit a message, skipping the API call when content is unchanged
+
+    Returns True when the message shows the requested content (edited now,
+    or already identical), False when the edit failed — callers with a
+    fallback (e.g. sending a fresh message when the original is a photo)
+    branch on this instead of catching exceptions.
+    """
+    key = (callback.message.chat.id, callback.message.message_id)
+    content_hash = _edit_content_hash(text, reply_markup)
+    if _last_edit.get(key) == content_hash:
+        return True  # Message is already up to date, skip the round-trip
     try:
         await callback.message.edit_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
+        _last_edit[key] = content_hash
+        _last_edit.move_to_end(key)
+        while len(_last_edit) > _LAST_EDIT_MAX:
+            _last_edit.popitem(last=False)
+        return True
+    except TelegramBadRequest as e:
+        # Typed check instead of substring-scanning str(e) on every failure
+        if "message is not modified" in e.message:
+            # Message was edited outside this helper; remember its content
+            _last_edit[key] = content_hash
+            return True
+        logger.error("Error editing message: %s", e)
     except Exception as e:
-        if "message is not modified" in str(e):
-            pass  # Message is already up to date, ignore the error
-        else:
-            print(f"Error editing message: {e}")
+        logger.error("Error editing message: %s", e)
+    return False
 
-# Helper function for Stars to TON conversion
-def stars_to_ton(stars_amount: int) -> float:
+# Helper function for Stars to TON conversion. The rate is a constant, so
+# binding it as a default skips the config module/attribute lookups in the
+# per-package revenue loops (same idiom as is_admin).
+def stars_to_ton(stars_amount: int, _rate=config.STARS_TO_TON_RATE) -> float:
     """Convert Stars to TON using the correct conversion rate"""
-    return stars_amount * config.STARS_TO_TON_RATE
+    return stars_amount * _rate
 
-def ton_to_stars(ton_amount: float) -> int:
+def ton_to_stars(ton_amount: float, _rate=config.STARS_TO_TON_RATE) -> int:
     """Convert TON to Stars using the correct conversion rate"""
-    return int(ton_amount / config.STARS_TO_TON_RATE)
+    return int(ton_amount / _rate)
 
 # Utility functions for admin panel formatting
+@functools.lru_cache(maxsize=4096)
 def format_timestamp(timestamp) -> str:
-    """Format timestamp to readable format"""
+    """Format timestamp to readable format
+
+    Memoized: the same processed_at values repeat across the admin
+    dashboard tabs, and the datetime parse is pure. All inputs (None,
+    str, int, float) are hashable.
+    """
     if timestamp is None or timestamp == 'Unknown':
         return 'Unknown'
     
@@ -219,12 +323,12 @@ def ensure_user_data_loaded(user_id: int) -> bool:
 def get_user_data_from_db(user_id: int) -> dict:
     """Get user data from database"""
     try:
-        conn = sqlite3.connect('cgspins.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
+        # Pure read — use a pooled read-only connection instead of a fresh open
+        with read_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
+            row = cursor.fetchone()
+
         if row:
             columns = [description[0] for description in cursor.description]
             user_data = dict(zip(columns, row))
@@ -232,10 +336,14 @@ def get_user_data_from_db(user_id: int) -> dict:
             # Convert nfts string back to list if it exists
             if 'nfts' in user_data and user_data['nfts']:
                 try:
-                    import ast
-                    user_data['nfts'] = ast.literal_eval(user_data['nfts'])
-                except:
-                    user_data['nfts'] = []
+                    user_data['nfts'] = orjson.loads(user_data['nfts'])
+                except (orjson.JSONDecodeError, TypeError):
+                    # Legacy rows were written with str(list) and need literal_eval
+                    try:
+                        import ast
+                        user_data['nfts'] = ast.literal_eval(user_data['nfts'])
+                    except:
+                        user_data['nfts'] = []
             elif 'nfts' in user_data:
                 user_data['nfts'] = []
             
@@ -245,47 +353,192 @@ def get_user_data_from_db(user_id: int) -> dict:
         print(f"Error getting user data from DB: {e}")
         return {}
 
+# Index of users with spins_available > 0, kept in sync by save_user_data_to_db
+# (every handler that changes spins persists through it) so admin stats read
+# the active-user count in O(1) instead of scanning user_data
+active_user_ids = set()
+
+# Same idea for users with total_spins > 0 — the "active users" figure the
+# broadcast and bot-stats dashboards show. total_spins resets to 0 when a
+# package runs out, so this is a synced index, not a monotonic counter.
+spun_user_ids = set()
+
+# Write-behind buffer for bursty admin writes (mass /give_package or /ban_user
+# sweeps): staged rows are flushed in one transaction every 500ms, so a burst
+# of N commands costs one fsync instead of N. Reads are unaffected because
+# user_data in memory is the source of truth for every handler.
+_pending_writes = {}
+
+def queue_user_save(target_user_id: int) -> None:
+    """Stage a user's row for the next write-behind flush"""
+    row = user_data[target_user_id]
+    _pending_writes[target_user_id] = row
+    # Mirror the index maintenance save_user_data_to_db does; the bulk
+    # flush path doesn't route through it
+    if row.get('spins_available', 0) > 0:
+        active_user_ids.add(target_user_id)
+    else:
+        active_user_ids.discard(target_user_id)
+    if row.get('total_spins', 0) > 0:
+        spun_user_ids.add(target_user_id)
+    else:
+        spun_user_ids.discard(target_user_id)
+
+# (limit, with_package) -> (monotonic timestamp, rows). The reset/ban/give
+# menus all issue the same query, so clicking through them re-reads identical
+# data; a short TTL collapses those into one DB hit. save_user_data_to_db
+# clears the cache, which covers the ban/unban/reset/give write paths.
+_RECENT_USERS_TTL = 5  # seconds
+_recent_users_cache = {}
+
+
+# Rendered admin reports, keyed by name. Dashboards are opened far more often
+# than the underlying rows change, so each report is reused until a
+# user/transaction write marks it dirty; the TTL is a fallback for any write
+# path that slips past the invalidation hooks (and bounds how stale the
+# system figures in the bot report can get).
+_STATS_REPORTS = ('package', 'hit', 'revenue', 'bot')
+_STATS_CACHE_TTL = 60  # seconds
+_stats_cache = {}
+_stats_dirty = set()
+
+
+def _mark_stats_dirty():
+    """Flag every admin report for recompute after a data write"""
+    _stats_dirty.update(_STATS_REPORTS)
+
+
+def _get_cached_report(name: str):
+    """Return the cached report text, or None if dirty/expired/missing"""
+    if name in _stats_dirty:
+        return None
+    cached = _stats_cache.get(name)
+    if cached is not None and time.monotonic() - cached[0] < _STATS_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _store_cached_report(name: str, text: str):
+    _stats_cache[name] = (time.monotonic(), text)
+    _stats_dirty.discard(name)
+
+
+# Package distribution for the user overview: recomputing the GROUP BY on
+# every pagination click is redundant — the rows only change when a user row
+# is written. Cached in-process (the bot is a single process, so a local
+# dict gives the same hit path a shared cache service would) with write
+# invalidation from save_user_data_to_db plus a TTL backstop.
+_PKG_DIST_TTL = 30  # seconds
+_pkg_dist_cache = (0.0, None)  # (monotonic timestamp, rows)
+
+
+def _load_package_distribution():
+    global _pkg_dist_cache
+    cached_at, rows = _pkg_dist_cache
+    if rows is not None and time.monotonic() - cached_at < _PKG_DIST_TTL:
+        return rows
+    rows = get_package_distribution()
+    _pkg_dist_cache = (time.monotonic(), rows)
+    return rows
+
+
+def _invalidate_package_distribution() -> None:
+    global _pkg_dist_cache
+    _pkg_dist_cache = (0.0, None)
+
+
+def _write_staged(staged: dict) -> None:
+    """Persist a snapshot of staged rows and drop the caches they invalidate
+
+    Blocking (BEGIN IMMEDIATE + fsync); call off the event loop unless
+    shutting down.
+    """
+    save_users_bulk(staged)
+    _recent_users_cache.clear()
+    _invalidate_package_distribution()
+    _mark_stats_dirty()
+
+def flush_pending_writes() -> None:
+    """Persist all staged rows in a single transaction (blocking)"""
+    if not _pending_writes:
+        return
+    staged = dict(_pending_writes)
+    _pending_writes.clear()
+    _write_staged(staged)
+
+async def pending_writes_flusher():
+    """Background task that flushes staged admin writes every 500ms"""
+    while True:
+        await asyncio.sleep(0.5)
+        try:
+            if not _pending_writes:
+                continue
+            # Snapshot + clear on the event loop so no queue_user_save can
+            # land between the copy and the clear, then push the sqlite
+            # transaction to a worker thread: with busy_timeout=5000 a
+            # concurrent writer could otherwise pin the loop for seconds
+            staged = dict(_pending_writes)
+            _pending_writes.clear()
+            await asyncio.to_thread(_write_staged, staged)
+        except Exception as e:
+            print(f"❌ [Backend] Error flushing pending writes: {e}")
+
 def save_user_data_to_db(user_id: int, user_data: dict) -> bool:
     """Save user data to database with proper error handling and logging"""
     try:
-        conn = sqlite3.connect('cgspins.db')
-        cursor = conn.cursor()
-        
-        # Use INSERT OR REPLACE to handle both new and existing users
-        cursor.execute("""
-            INSERT OR REPLACE INTO users 
-            (user_id, balance, package, level, spin_points, hits, total_spins, 
-             spins_available, referrals, referred_by, payment_method, nfts, 
-             language, lang, username, banned, banned_at, banned_by, 
-             influencer_earnings, influencer_tier, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            user_id,
-            user_data.get('balance', 0),
-            user_data.get('package', 'None'),
-            user_data.get('level', 'Spinner'),
-            user_data.get('spin_points', 0),
-            user_data.get('hits', 0),
-            user_data.get('total_spins', 0),
-            user_data.get('spins_available', 0),
-            user_data.get('referrals', 0),
-            user_data.get('referred_by'),
-            user_data.get('payment_method', ''),
-            str(user_data.get('nfts', [])),
-            user_data.get('language', 'en'),
-            user_data.get('lang', 'en'),
-            user_data.get('username', ''),
-            user_data.get('banned', 0),
-            user_data.get('banned_at', ''),
-            user_data.get('banned_by', 0),
-            user_data.get('influencer_earnings', 0.0),
-            user_data.get('influencer_tier'),
-            user_data.get('created_at', datetime.now().isoformat()),
-            user_data.get('updated_at', datetime.now().isoformat())
-        ))
-        
-        conn.commit()
-        conn.close()
+        with write_conn() as conn:
+            cursor = conn.cursor()
+
+            # Use INSERT OR REPLACE to handle both new and existing users
+            cursor.execute("""
+                INSERT OR REPLACE INTO users
+                (user_id, balance, package, level, spin_points, hits, total_spins,
+                 spins_available, referrals, referred_by, payment_method, nfts,
+                 language, lang, username, banned, banned_at, banned_by,
+                 influencer_earnings, influencer_tier, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                user_id,
+                user_data.get('balance', 0),
+                user_data.get('package', 'None'),
+                user_data.get('level', 'Spinner'),
+                user_data.get('spin_points', 0),
+                user_data.get('hits', 0),
+                user_data.get('total_spins', 0),
+                user_data.get('spins_available', 0),
+                user_data.get('referrals', 0),
+                user_data.get('referred_by'),
+                user_data.get('payment_method', ''),
+                orjson.dumps(user_data.get('nfts', [])).decode(),
+                user_data.get('language', 'en'),
+                user_data.get('lang', 'en'),
+                user_data.get('username', ''),
+                user_data.get('banned', 0),
+                user_data.get('banned_at', ''),
+                user_data.get('banned_by', 0),
+                user_data.get('influencer_earnings', 0.0),
+                user_data.get('influencer_tier'),
+                user_data.get('created_at', datetime.now().isoformat()),
+                user_data.get('updated_at', datetime.now().isoformat())
+            ))
+
+            conn.commit()
+
+        # Keep the active-users indexes in sync with the persisted record
+        if user_data.get('spins_available', 0) > 0:
+            active_user_ids.add(user_id)
+        else:
+            active_user_ids.discard(user_id)
+        if user_data.get('total_spins', 0) > 0:
+            spun_user_ids.add(user_id)
+        else:
+            spun_user_ids.discard(user_id)
+
+        # The admin selection menus cache this table; drop the stale rows
+        _recent_users_cache.clear()
+        _invalidate_package_distribution()
+        _mark_stats_dirty()
+
         print(f"✅ [Database] Successfully saved user {user_id} data to database")
         return True
     except Exception as e:
@@ -295,7 +548,7 @@ def save_user_data_to_db(user_id: int, user_data: dict) -> bool:
 def update_user_username(user_id: int, username: str) -> bool:
     """Update user's username in database"""
     try:
-        conn = sqlite3.connect('cgspins.db')
+        conn = db_connect()
         cursor = conn.cursor()
         cursor.execute("UPDATE users SET username = ? WHERE user_id = ?", (username, user_id))
         conn.commit()
@@ -339,6 +592,21 @@ user_data = defaultdict(lambda: {
     "payment_method": None  # Track which payment method was used (stars/ton)
 })
 
+
+def update_user_cache(target_user_id: int, patch: dict):
+    """Apply a patch to the in-memory user_data entry, if one exists.
+
+    Handlers whose local variable shadows the module-level user_data used to
+    reach it via globals()['user_data']; this accessor makes the dependency
+    explicit and resolves the cache through a normal global load. Uses .get
+    so it never creates defaultdict entries for users not in the cache.
+    """
+    cached = user_data.get(target_user_id)
+    if cached is not None:
+        cached.update(patch)
+    return cached
+
+
 # Track message types for each user
 user_messages = defaultdict(lambda: {"type": "video"})
 
@@ -348,10 +616,92 @@ last_menu_send = defaultdict(lambda: 0)
 # Track callback processing to prevent duplicates
 processing_callbacks = set()
 
+# Admins currently in broadcast mode. Kept out of user_data so toggling this
+# transient flag never triggers a user-record DB write.
+broadcast_mode_admins = set()
+
+# Short-TTL cache for referral stats so back-to-back clicks (view → copy → share)
+# reuse one computation instead of re-traversing user_data each time
+referral_stats_cache = TTLCache(max_size=10000, default_ttl=30)
+
+def get_referral_stats_cached(user_id: int):
+    """Get referral stats for a user, cached for a short TTL"""
+    stats = referral_stats_cache.get(user_id)
+    if stats is None:
+        stats = get_referral_stats(user_data, user_id, config.BOT_USERNAME)
+        if stats:
+            referral_stats_cache.set(user_id, stats)
+    return stats
+
+# Pre-rendered message templates (built once at import, BOT_USERNAME substituted up front)
+# so hot handlers only fill in the per-user pieces instead of re-building ~500-char strings
+SHARE_TEXT_TEMPLATE = f"""
+🎯 <b>Join CG Spins with my referral!</b>
+
+🎰 <b>What you get:</b>
+• 30+ spins to start playing
+• Chance to win rare NFTs
+• Level up system with rewards
+• Daily bonuses and more!
+
+🔗 <b>My referral link:</b>
+<code>{{referral_link}}</code>
+
+💎 <b>Special bonus:</b> You'll get 2 extra spin points when you join!
+
+🎮 <b>Start spinning now:</b> @{config.BOT_USERNAME}
+        """
+
+ADMIN_PANEL_TEXT = """⚙️ <b>Admin Panel</b>
+
+Welcome to the CG Spins Admin Panel. Choose a category to manage:
+
+👥 <b>User Management:</b> View users, manage accounts, ban/unban
+🎮 <b>Game Management:</b> Package stats, hit rates, game settings
+💰 <b>Financial Management:</b> Payment tracking, revenue analytics
+⚙️ <b>System Management:</b> Database, logs, maintenance mode
+📊 <b>Analytics & Reports:</b> User retention, popular packages
+📝 <b>Content Management:</b> FAQ, translations, pricing"""
+
+ADMIN_HELP_TEXT = """⚙️ <b>Admin Commands Help</b>
+
+<b>Basic Commands:</b>
+/start - Start the bot
+/status - Show bot status
+/admin - Open admin panel
+/help_admin - Show this help
+
+<b>User Management:</b>
+/users - Show user statistics
+/stats - Show detailed statistics
+/user_info &lt;user_id&gt; - Get detailed user information
+/ban_user &lt;user_id&gt; [reason] - Ban a user
+/unban_user &lt;user_id&gt; - Unban a user
+/give_package &lt;user_id&gt; &lt;package&gt; - Give package to user
+
+<b>Communication:</b>
+/broadcast - Start broadcast mode
+/cancel - Cancel current operation
+
+<b>System Management:</b>
+/maintenance - Toggle maintenance mode
+/reset_db - Reset database (DANGEROUS!)
+/fix_database - Fix database schema issues
+
+<b>Game Commands:</b>
+/reset - Reset your own data (for testing)
+/referral - Show referral info
+/check_referral - Check referral status
+
+<b>Admin Panel:</b>
+Use /admin to access the full admin panel with all management options.
+
+<b>Available Packages:</b> bronze, silver, gold, black"""
+
 # Initialize database and load persistent data
 def init_database():
     """Initialize SQLite database with unified, consistent schema"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     # Create pending TON payments table (unified schema)
@@ -414,7 +764,13 @@ def init_database():
             banned_by INTEGER
         )
     ''')
-    
+
+    # The payment-tracking views fetch the newest transactions with
+    # ORDER BY ... DESC LIMIT, so keep those orderings indexed from startup
+    # (the database-fix flow also creates these, but only when it is run)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_processed_transactions_processed_at ON processed_transactions(processed_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_stars_transactions_timestamp ON stars_transactions(timestamp)")
+
     conn.commit()
     conn.close()
     print("✅ [Backend] Database initialized with unified schema")
@@ -425,7 +781,7 @@ init_database()
 def load_existing_users():
     """Load existing users from database into user_data (optimized for speed)"""
     try:
-        conn = sqlite3.connect('cgspins.db')
+        conn = db_connect()
         cursor = conn.cursor()
         
         cursor.execute('SELECT user_id FROM users')
@@ -445,6 +801,12 @@ def load_existing_users():
                     if package_key in config.PACKAGES:
                         user['spins_available'] = config.PACKAGES[package_key]['spins']
                         save_user_data_to_db(user_id, user)
+
+                # Seed the active-users indexes on startup
+                if user.get('spins_available', 0) > 0:
+                    active_user_ids.add(user_id)
+                if user.get('total_spins', 0) > 0:
+                    spun_user_ids.add(user_id)
         
         print(f"👥 [Backend] Loaded {loaded_count} existing users from database")
     except Exception as e:
@@ -594,6 +956,7 @@ async def check_new_ton_payments():
                             try:
                                 # Save to database
                                 save_processed_transaction(tx_hash, user_id, payment_info["package"], amount, expected_id, source_wallet)
+                                _mark_stats_dirty()
                                 
                                 # Create user if not exists (for payments without /start)
                                 if user_id not in user_data:
@@ -668,7 +1031,6 @@ async def check_new_ton_payments():
                                 # Send notification to user about successful payment
                                 try:
                                     pkg = config.PACKAGES[payment_info["package"]]
-                                    import translations
                                     success_message = f"""{translations.get_text(user_id, "ton_payment_successful")}
 
 {translations.get_text(user_id, "package_activated", package=pkg['name'])}
@@ -811,7 +1173,7 @@ Thank you for your patience! We'll be back online shortly."""
     
     # Initialize user data if not exists
     if user_id not in user_data:
-        user_data[user_id] = {
+        user = user_data[user_id] = {
             "balance": 0.0,
             "package": "None",
             "level": "Spinner",
@@ -845,31 +1207,33 @@ Thank you for your patience! We'll be back online shortly."""
             print(f"🔍 [Referral] Referrer {referrer_id} - In user_data: {referrer_in_user_data}, Is influencer: {referrer_is_influencer}")
             
             if referrer_in_user_data or referrer_is_influencer:
-                user_data[user_id]["referred_by"] = referrer_id
+                user["referred_by"] = referrer_id
                 print(f"✅ [Referral] Set referred_by for user {user_id} to {referrer_id}")
-                
+
                 # If referrer is a regular user, increment their referral count
                 if referrer_in_user_data:
-                    user_data[referrer_id]["referrals"] = user_data[referrer_id].get("referrals", 0) + 1
-                    save_user_data_to_db(referrer_id, user_data[referrer_id])
-                    print(f"🎯 [Backend] New user {user_id} joined via referral from {referrer_id}. Referrer now has {user_data[referrer_id]['referrals']} referrals.")
+                    referrer = user_data[referrer_id]
+                    referrer["referrals"] = referrer.get("referrals", 0) + 1
+                    save_user_data_to_db(referrer_id, referrer)
+                    referral_stats_cache.delete(referrer_id)  # Counter changed, drop cached stats
+                    print(f"🎯 [Backend] New user {user_id} joined via referral from {referrer_id}. Referrer now has {referrer['referrals']} referrals.")
                 elif referrer_is_influencer:
                     print(f"🌟 [Influencer] New user {user_id} joined via influencer link from {referrer_id} ({config.INFLUENCERS[referrer_id]['name']})")
             else:
                 print(f"❌ [Referral] Referrer {referrer_id} not found in user_data or influencers list")
         
         # Save user data to database
-        save_user_data_to_db(user_id, user_data[user_id])
+        save_user_data_to_db(user_id, user)
         print(f"👤 [Backend] New user {user_id} initialized")
     else:
-        # Update existing user's last activity
-        user_data[user_id]["updated_at"] = datetime.now().isoformat()
-        print(f"🌐 [Backend] User {user_id} language before save: {user_data[user_id].get('language', 'NOT_SET')}")
-        save_user_data_to_db(user_id, user_data[user_id])
+        # Update existing user's last activity (single lookup reused below)
+        user = user_data[user_id]
+        user["updated_at"] = datetime.now().isoformat()
+        print(f"🌐 [Backend] User {user_id} language before save: {user.get('language', 'NOT_SET')}")
+        save_user_data_to_db(user_id, user)
         print(f"👤 [Backend] Existing user {user_id} activity updated")
     
     # Create welcome message
-    import translations
     welcome_text = translations.get_text(user_id, "welcome_message")
     
     # Add referral welcome message if applicable
@@ -883,7 +1247,6 @@ Thank you for your patience! We'll be back online shortly."""
     
     # Create main menu keyboard with translations
     from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-    import translations
     
     # Create keyboard rows
     keyboard_rows = [
@@ -976,24 +1339,21 @@ async def reset_command(message: types.Message):
             del pending_ton_payments[user_id]
             remove_pending_payment(user_id)
         
-        import translations
         await message.reply(translations.get_text(user_id, "user_data_reset_success"), parse_mode="HTML")
         print(f"🔄 [Backend] User {user_id} data reset for testing")
     else:
-        import translations
         await message.reply(translations.get_text(user_id, "user_data_not_found_reply"))
 
 @router.message(filters.Command("reset_db"))
 async def reset_database_command(message: types.Message):
     user_id = message.from_user.id
-    import translations
     
     if user_id not in config.ADMIN_USER_IDS: # Admin ID
         await message.reply(translations.get_text(user_id, "access_denied", action="reset database"), parse_mode="HTML")
         return
     try:
         user_data.clear(); pending_ton_payments.clear(); processed_transactions.clear()
-        conn = sqlite3.connect('cgspins.db'); cursor = conn.cursor()
+        conn = db_connect(); cursor = conn.cursor()
         cursor.execute('DELETE FROM users'); cursor.execute('DELETE FROM pending_ton_payments')
         cursor.execute('DELETE FROM processed_transactions'); cursor.execute('DELETE FROM stars_transactions')
         conn.commit(); conn.close()
@@ -1006,7 +1366,6 @@ async def show_packages(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
     
     # SECURITY: Validate user exists in data
     if user_id not in user_data:
@@ -1061,9 +1420,7 @@ async def show_packages(callback: types.CallbackQuery):
             user_messages[user_id]["type"] = "text"
         else:
             # Coming from text message, edit it - but check if it's editable first
-            try:
-                await callback.message.edit_text(packages_text, reply_markup=keyboard, parse_mode="HTML")
-            except Exception as e:
+            if not await safe_edit_message(callback, packages_text, reply_markup=keyboard):
                 # If editing fails, send new message instead
                 await callback.message.answer(packages_text, reply_markup=keyboard, parse_mode="HTML")
                 user_messages[user_id]["type"] = "text"
@@ -1076,7 +1433,6 @@ async def show_spin_info(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
     
     # SECURITY: Validate user exists in data
     if user_id not in user_data:
@@ -1130,9 +1486,7 @@ async def show_spin_info(callback: types.CallbackQuery):
         user_messages[user_id]["type"] = "text"
     else:
         # Coming from text message, edit it - but check if it's editable first
-        try:
-            await callback.message.edit_text(info_text, reply_markup=keyboard, parse_mode="HTML")
-        except Exception as e:
+        if not await safe_edit_message(callback, info_text, reply_markup=keyboard):
             # If editing fails, send new message instead
             await callback.message.answer(info_text, reply_markup=keyboard, parse_mode="HTML")
             user_messages[user_id]["type"] = "text"
@@ -1142,7 +1496,6 @@ async def start_spinning(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
     
     # SECURITY: Validate user exists in data
     if user_id not in user_data:
@@ -1197,9 +1550,7 @@ async def start_spinning(callback: types.CallbackQuery):
         user_messages[user_id]["type"] = "text"
     else:
         # Coming from text message, edit it - but check if it's editable first
-        try:
-            await callback.message.edit_text(spin_text, reply_markup=keyboard, parse_mode="HTML")
-        except Exception as e:
+        if not await safe_edit_message(callback, spin_text, reply_markup=keyboard):
             # If editing fails, send new message instead
             await callback.message.answer(spin_text, reply_markup=keyboard, parse_mode="HTML")
             user_messages[user_id]["type"] = "text"
@@ -1213,7 +1564,6 @@ async def handle_package(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
     
     # SECURITY: Validate user exists in data
     if user_id not in user_data:
@@ -1293,11 +1643,8 @@ async def handle_package(callback: types.CallbackQuery):
             user_messages[callback.from_user.id]["type"] = "text"
         else:
             # Coming from text message, edit it
-            try:
-                await callback.message.edit_text(package_text, reply_markup=keyboard, parse_mode="HTML")
-            except Exception as e:
+            if not await safe_edit_message(callback, package_text, reply_markup=keyboard):
                 # If editing fails (e.g., trying to edit photo as text), send new message
-                print(f"Error editing message in handle_package: {e}")
                 await callback.message.answer(package_text, reply_markup=keyboard, parse_mode="HTML")
                 user_messages[callback.from_user.id]["type"] = "text"
         
@@ -1332,7 +1679,6 @@ Thank you for your patience! We'll be back online shortly."""
     
     # PROFESSIONAL SOLUTION: Ensure user data is loaded
     if not ensure_user_data_loaded(user_id):
-        import translations
         keyboard = create_keyboard(
             (translations.get_text(user_id, "back_to_menu"), "back_to_main")
         )
@@ -1343,7 +1689,6 @@ Thank you for your patience! We'll be back online shortly."""
     
     # Check if user has spins available
     if user.get('spins_available', 0) <= 0:
-        import translations
         keyboard = create_keyboard(
             (translations.get_text(user_id, "back_to_menu"), "back_to_main"),
             (translations.get_text(user_id, "my_profile"), "profile")
@@ -1406,7 +1751,6 @@ Thank you for your patience! We'll be back online shortly."""
         response = create_spin_response(is_winning, win_message, user, nft_earned)
         
         # Create keyboard with navigation buttons
-        import translations
         keyboard = create_keyboard(
             (translations.get_text(user_id, "back_to_menu"), "back_to_main"),
             (translations.get_text(user_id, "my_profile"), "profile")
@@ -1459,7 +1803,6 @@ Thank you for your patience! We'll be back online shortly."""
     response = create_spin_response(is_winning, win_message, user, nft_earned)
     
     # Create keyboard with navigation buttons
-    import translations
     keyboard = create_keyboard(
         (translations.get_text(user_id, "back_to_menu"), "back_to_main"),
         (translations.get_text(user_id, "my_profile"), "profile")
@@ -1503,7 +1846,6 @@ async def process_successful_payment(message: types.Message):
             # SECURITY: Validate payment amount before activation
             if payment_info.total_amount != pkg['price_stars']:
                 print(f"❌ [Backend] Invalid Stars amount for user {user_id}: got {payment_info.total_amount}, expected {pkg['price_stars']}")
-                import translations
                 await message.answer(translations.get_text(user_id, "payment_error_invalid_amount"), parse_mode="HTML")
                 return
             
@@ -1547,7 +1889,6 @@ async def process_successful_payment(message: types.Message):
             print(f"🔍 Using success message: {config.SUCCESS_MESSAGES['stars_payment']}")
             print(f"🔍 Config SUCCESS_MESSAGES: {config.SUCCESS_MESSAGES}")
             
-            import translations
             success_text = f"""<b>{translations.get_text(user_id, "stars_payment_successful")}</b>
 
 {emoji} <b>{pkg['name']} {translations.get_text(user_id, "package_activated_label")}</b>
@@ -1580,8 +1921,10 @@ async def process_successful_payment(message: types.Message):
                 print(f"❌ [Backend] Error sending admin package notification: {e}")
             user_messages[user_id]["type"] = "text"
             
-            # CRITICAL: Save updated user data to database
-            save_user_data(user_id, user_data[user_id])
+            # CRITICAL: Save updated user data to database. Goes through
+            # save_user_data_to_db so the active/spun index sets and the
+            # admin caches stay in sync with the buyer's new spins.
+            save_user_data_to_db(user_id, user_data[user_id])
             
             # Track this transaction to prevent TON payment checker from processing it
             transaction_id = f"stars_{user_id}_{package_type}_{int(time.time())}"
@@ -1589,6 +1932,7 @@ async def process_successful_payment(message: types.Message):
             
             # Save Stars transaction to database for persistence
             save_stars_transaction(transaction_id, user_id, package_type, pkg['price_stars'])
+            _mark_stats_dirty()
             
             print(f"🔒 Stars payment processed, transaction ID: {transaction_id}")
             
@@ -1606,7 +1950,7 @@ async def handle_broadcast_message(message: types.Message):
     user_id = message.from_user.id
     
     # Check if user is admin and in broadcast mode
-    if is_admin(user_id) and user_data.get(user_id, {}).get('broadcast_mode', False):
+    if is_admin(user_id) and user_id in broadcast_mode_admins:
         broadcast_text = message.text
         
         if not broadcast_text:
@@ -1628,7 +1972,7 @@ async def handle_broadcast_message(message: types.Message):
         
         # Store the broadcast message temporarily
         user_data[user_id]['broadcast_message'] = broadcast_text
-        user_data[user_id]['broadcast_mode'] = False
+        broadcast_mode_admins.discard(user_id)
         
         await message.reply(confirm_text, reply_markup=keyboard, parse_mode="HTML")
         return
@@ -1639,7 +1983,6 @@ async def show_profile(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
     
     # PROFESSIONAL SOLUTION: Ensure user data is loaded
     if not ensure_user_data_loaded(user_id):
@@ -1705,11 +2048,8 @@ async def show_profile(callback: types.CallbackQuery):
         user_messages[user_id]["type"] = "text"
     else:
         # Coming from text message, edit it
-        try:
-            await callback.message.edit_text(profile_text, reply_markup=keyboard, parse_mode="HTML")
-        except Exception as e:
+        if not await safe_edit_message(callback, profile_text, reply_markup=keyboard):
             # If editing fails (e.g., trying to edit photo as text), send new message
-            print(f"Error editing message in show_profile: {e}")
             await callback.message.answer(profile_text, reply_markup=keyboard, parse_mode="HTML")
             user_messages[user_id]["type"] = "text"
     
@@ -1722,7 +2062,6 @@ async def back_to_main(callback: types.CallbackQuery):
     callback_id = f"{user_id}_{callback.id}"
     
     # Import translations
-    import translations
     
     print(f"🔄 [Backend] BACK_TO_MAIN callback triggered for user {user_id}, callback_id: {callback.id}")
     
@@ -1754,7 +2093,6 @@ async def back_to_main(callback: types.CallbackQuery):
         # Create custom keyboard with URL button for Support
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
         # Import translations
-        import translations
         
         # Create keyboard rows
         keyboard_rows = [
@@ -1828,27 +2166,26 @@ async def referral_menu_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
-    
-    print(f"🎯 [Backend] Referral menu requested by user {user_id}")
     
+    logger.debug("[Backend] Referral menu requested by user %s", user_id)
+
     # SECURITY: Validate user exists in data
     if user_id not in user_data:
-        print(f"❌ [Backend] User {user_id} not found in user_data")
+        logger.debug("[Backend] User %s not found in user_data", user_id)
         await callback.answer(translations.get_text(user_id, "user_data_not_found_error"))
         return
     
-    print(f"✅ [Backend] User {user_id} found in user_data")
-    
+    logger.debug("[Backend] User %s found in user_data", user_id)
+
     # Get referral statistics
-    stats = get_referral_stats(user_data, user_id, config.BOT_USERNAME)
-    
+    stats = get_referral_stats_cached(user_id)
+
     if not stats:
-        print(f"❌ [Backend] Failed to get referral stats for user {user_id}")
+        logger.debug("[Backend] Failed to get referral stats for user %s", user_id)
         await callback.answer(translations.get_text(user_id, "error_loading_referral_data"))
         return
-    
-    print(f"✅ [Backend] Got referral stats for user {user_id}: {stats}")
+
+    logger.debug("[Backend] Got referral stats for user %s: %s", user_id, stats)
     
     # Create referral message
     referral_text = f"""
@@ -1877,18 +2214,15 @@ async def referral_menu_callback(callback: types.CallbackQuery):
         (translations.get_text(user_id, "back_to_main"), "back_to_main")
     )
     
-    print(f"🎯 [Backend] Sending referral menu to user {user_id}")
+    logger.debug("[Backend] Sending referral menu to user %s", user_id)
     
     # Always send new message to avoid video editing issues
     await callback.message.answer(referral_text, reply_markup=keyboard, parse_mode="HTML")
     
-    # Update message tracking
-    if user_id not in user_messages:
-        user_messages[user_id] = {"type": "text"}
-    else:
-        user_messages[user_id]["type"] = "text"
+    # Update message tracking (single lookup; avoids the membership-check branch)
+    user_messages.setdefault(user_id, {})["type"] = "text"
     
-    print(f"✅ [Backend] Referral menu sent successfully to user {user_id}")
+    logger.debug("[Backend] Referral menu sent successfully to user %s", user_id)
     
     # Always answer the callback to prevent loading spinner
     await callback.answer()
@@ -1899,23 +2233,22 @@ async def influencer_menu_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
-    
-    print(f"🌟 [Influencer] Influencer menu requested by user {user_id}")
     
+    logger.debug("[Influencer] Influencer menu requested by user %s", user_id)
+
     # Check if user is a registered influencer
     if user_id not in config.INFLUENCERS:
-        print(f"❌ [Influencer] User {user_id} is not a registered influencer")
+        logger.debug("[Influencer] User %s is not a registered influencer", user_id)
         await callback.answer("❌ You are not a registered influencer!")
         return
-    
+
     # SECURITY: Validate user exists in data
     if user_id not in user_data:
-        print(f"❌ [Influencer] User {user_id} not found in user_data")
+        logger.debug("[Influencer] User %s not found in user_data", user_id)
         await callback.answer(translations.get_text(user_id, "user_data_not_found_error"))
         return
-    
-    print(f"✅ [Influencer] User {user_id} is a registered influencer")
+
+    logger.debug("[Influencer] User %s is a registered influencer", user_id)
     
     # Get influencer info and stats
     influencer_info = config.INFLUENCERS[user_id]
@@ -1923,7 +2256,6 @@ async def influencer_menu_callback(callback: types.CallbackQuery):
     stats = get_influencer_stats(user_id)
     
     # Get translations
-    import translations
     dashboard_title = translations.get_text(user_id, "influencer_dashboard")
     total_earnings = translations.get_text(user_id, "influencer_total_earnings").format(earnings=stats['total_earnings'])
     total_commissions = translations.get_text(user_id, "influencer_total_commissions").format(count=stats['commission_count'])
@@ -1975,18 +2307,15 @@ async def influencer_menu_callback(callback: types.CallbackQuery):
         (back_to_main, "back_to_main")
     )
     
-    print(f"🌟 [Influencer] Sending influencer menu to user {user_id}")
+    logger.debug("[Influencer] Sending influencer menu to user %s", user_id)
     
     # Always send new message to avoid video editing issues
     await callback.message.answer(influencer_text, reply_markup=keyboard, parse_mode="HTML")
     
-    # Update message tracking
-    if user_id not in user_messages:
-        user_messages[user_id] = {"type": "text"}
-    else:
-        user_messages[user_id]["type"] = "text"
+    # Update message tracking (single lookup; avoids the membership-check branch)
+    user_messages.setdefault(user_id, {})["type"] = "text"
     
-    print(f"✅ [Influencer] Influencer menu sent successfully to user {user_id}")
+    logger.debug("[Influencer] Influencer menu sent successfully to user %s", user_id)
     
     # Always answer the callback to prevent loading spinner
     await callback.answer()
@@ -2001,7 +2330,6 @@ async def copy_influencer_link_callback(callback: types.CallbackQuery):
         return
     
     influencer_link = f"https://t.me/{config.BOT_USERNAME}?start=ref_{user_id}"
-    import translations
     link_copied = translations.get_text(user_id, "influencer_link_copied").format(link=influencer_link)
     await callback.answer(link_copied, show_alert=True)
 
@@ -2018,7 +2346,6 @@ async def view_influencer_commissions_callback(callback: types.CallbackQuery):
     commissions = load_influencer_commissions(user_id)
     
     if not commissions:
-        import translations
         no_commissions = translations.get_text(user_id, "influencer_no_commissions")
         await callback.answer(no_commissions, show_alert=True)
         return
@@ -2040,19 +2367,20 @@ async def show_commissions_page(callback: types.CallbackQuery, commissions: list
     page_commissions = commissions[start_idx:end_idx]
     
     # Get translations
-    import translations
     your_commissions = translations.get_text(user_id, "influencer_your_commissions")
     page_text = translations.get_text(user_id, "influencer_page").format(current=page + 1, total=total_pages)
     back_to_dashboard = translations.get_text(user_id, "influencer_back_to_dashboard")
     
-    # Create commissions message
-    commissions_text = f"{your_commissions}\n"
-    commissions_text += f"{page_text}\n\n"
-    
+    # Create commissions message (collect parts and join once instead of
+    # quadratic += string concatenation)
+    commission_parts = [f"{your_commissions}\n{page_text}\n\n"]
     for i, commission in enumerate(page_commissions, start_idx + 1):
-        commissions_text += f"{i}. <b>{commission['package'].title()}</b>\n"
-        commissions_text += f"   💰 ${commission['commission_amount']:.2f} ({commission['commission_rate']*100:.0f}%)\n"
-        commissions_text += f"   📅 {commission['created_at']}\n\n"
+        commission_parts.append(
+            f"{i}. <b>{commission['package'].title()}</b>\n"
+            f"   💰 ${commission['commission_amount']:.2f} ({commission['commission_rate']*100:.0f}%)\n"
+            f"   📅 {commission['created_at']}\n\n"
+        )
+    commissions_text = "".join(commission_parts)
     
     # Create pagination buttons using create_keyboard
     buttons = []
@@ -2072,11 +2400,14 @@ async def show_commissions_page(callback: types.CallbackQuery, commissions: list
     buttons.append((back_to_dashboard, "influencer_menu"))
     
     keyboard = create_keyboard(*buttons)
-    
-    await callback.message.edit_text(commissions_text, reply_markup=keyboard, parse_mode="HTML")
-    await callback.answer()
 
-@router.callback_query(F.data.startswith("commissions_page_"))
+    # Overlap the edit and the callback ack so the spinner clears without
+    # waiting for a second sequential round-trip
+    await asyncio.gather(
+        safe_edit_message(callback, commissions_text, reply_markup=keyboard),
+        callback.answer()
+    )
+
 async def commissions_page_callback(callback: types.CallbackQuery):
     """Handle commission pagination"""
     user_id = callback.from_user.id
@@ -2086,7 +2417,7 @@ async def commissions_page_callback(callback: types.CallbackQuery):
         return
     
     # Extract page number from callback data
-    page_str = callback.data.split("_")[-1]
+    page_str = callback.data.rsplit("_", 1)[-1]
     try:
         page = int(page_str)
     except ValueError:
@@ -2106,40 +2437,35 @@ async def faq_callback(callback: types.CallbackQuery):
     """Show FAQ information"""
     user_id = callback.from_user.id
     
-    print(f"❓ [Backend] FAQ requested by user {user_id}")
+    logger.debug("[Backend] FAQ requested by user %s", user_id)
     
     # Import translations
-    import translations
     
     # Create keyboard with back button
     keyboard = create_keyboard(
         (translations.get_text(user_id, "back_to_main"), "back_to_main")
     )
     
-    print(f"❓ [Backend] Sending FAQ to user {user_id}")
-    
-    # Always send new message to avoid editing issues
-    await callback.message.answer(translations.get_text(user_id, "faq_message"), reply_markup=keyboard, parse_mode="HTML")
-    
-    # Update message tracking
-    if user_id not in user_messages:
-        user_messages[user_id] = {"type": "text"}
-    else:
-        user_messages[user_id]["type"] = "text"
-    
-    print(f"✅ [Backend] FAQ sent successfully to user {user_id}")
-    
-    # Always answer the callback to prevent loading spinner
-    await callback.answer()
+    logger.debug("[Backend] Sending FAQ to user %s", user_id)
+
+    # Send the FAQ and ack the callback concurrently (one round-trip instead of two)
+    await asyncio.gather(
+        callback.message.answer(translations.get_text(user_id, "faq_message"), reply_markup=keyboard, parse_mode="HTML"),
+        callback.answer()
+    )
+
+    # Update message tracking (single lookup; avoids the membership-check branch)
+    user_messages.setdefault(user_id, {})["type"] = "text"
+
+    logger.debug("[Backend] FAQ sent successfully to user %s", user_id)
 
 @router.callback_query(F.data == "language_menu")
 async def language_menu_callback(callback: types.CallbackQuery):
     """Show language selection menu"""
     user_id = callback.from_user.id
-    print(f"🌐 [Backend] Language menu requested by user {user_id}")
+    logger.debug("[Backend] Language menu requested by user %s", user_id)
     
     from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-    import translations
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text=translations.get_text(user_id, "english"), callback_data="set_language_en"),
@@ -2150,25 +2476,29 @@ async def language_menu_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.answer(translations.get_text(user_id, "select_language"), reply_markup=keyboard, parse_mode="HTML")
-    await callback.answer()
+    await asyncio.gather(
+        callback.message.answer(translations.get_text(user_id, "select_language"), reply_markup=keyboard, parse_mode="HTML"),
+        callback.answer()
+    )
 
-@router.callback_query(F.data.startswith("set_language_"))
 async def set_language_callback(callback: types.CallbackQuery):
     """Set user language"""
     user_id = callback.from_user.id
-    language = callback.data.split("_")[-1]  # Extract 'en' or 'ru'
+    language = callback.data.rsplit("_", 1)[-1]  # Extract 'en' or 'ru'
     
     # Import translations
-    import translations
-    
-    # Update user language
-    user_data[user_id]["language"] = language
     
+    # Update user language (single user_data lookup reused for the save)
+    user = user_data[user_id]
+    user["language"] = language
+
     # Save to database
-    save_user_data_to_db(user_id, user_data[user_id])
+    save_user_data_to_db(user_id, user)
+
+    # Drop the cached language so the confirmation below renders in the new one
+    translations.invalidate_user_language(user_id)
     
-    print(f"🌐 [Backend] Language set to {language} for user {user_id}")
+    logger.debug("[Backend] Language set to %s for user %s", language, user_id)
     
     # Send confirmation message
     language_names = {"en": "English", "ru": "Русский"}
@@ -2182,13 +2512,12 @@ async def copy_referral_link_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
     
     if user_id not in user_data:
         await callback.answer(translations.get_text(user_id, "user_data_not_found_error"))
         return
     
-    stats = get_referral_stats(user_data, user_id, config.BOT_USERNAME)
+    stats = get_referral_stats_cached(user_id)
     if not stats:
         await callback.answer(translations.get_text(user_id, "error_loading_referral_data"))
         return
@@ -2202,34 +2531,18 @@ async def share_referral_stats_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
     
     if user_id not in user_data:
         await callback.answer(translations.get_text(user_id, "user_data_not_found_error"))
         return
     
-    stats = get_referral_stats(user_data, user_id, config.BOT_USERNAME)
+    stats = get_referral_stats_cached(user_id)
     if not stats:
         await callback.answer(translations.get_text(user_id, "error_loading_referral_data"))
         return
     
-    # Create shareable message
-    share_text = f"""
-🎯 <b>Join CG Spins with my referral!</b>
-
-🎰 <b>What you get:</b>
-• 30+ spins to start playing
-• Chance to win rare NFTs
-• Level up system with rewards
-• Daily bonuses and more!
-
-🔗 <b>My referral link:</b>
-<code>{stats['referral_link']}</code>
-
-💎 <b>Special bonus:</b> You'll get 2 extra spin points when you join!
-
-🎮 <b>Start spinning now:</b> @{config.BOT_USERNAME}
-        """
+    # Create shareable message from the pre-rendered template
+    share_text = SHARE_TEXT_TEMPLATE.format_map({'referral_link': stats['referral_link']})
     
     # Create share keyboard with 2 buttons per row
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -2245,22 +2558,17 @@ async def share_referral_stats_callback(callback: types.CallbackQuery):
     # Always send new message to avoid video editing issues
     await callback.message.answer(share_text, reply_markup=keyboard, parse_mode="HTML")
     
-    # Update message tracking
-    if user_id not in user_messages:
-        user_messages[user_id] = {"type": "text"}
-    else:
-        user_messages[user_id]["type"] = "text"
+    # Update message tracking (single lookup; avoids the membership-check branch)
+    user_messages.setdefault(user_id, {})["type"] = "text"
 
 
 
 # Handle Stars purchase with Telegram Payments
-@router.callback_query(F.data.startswith("buy_stars_"))
 async def handle_stars_purchase(callback: types.CallbackQuery):
     package = callback.data.replace("buy_stars_", "")
     user_id = callback.from_user.id
     
     # Import translations
-    import translations
     
     # SECURITY: Validate user exists in data
     if user_id not in user_data:
@@ -2298,7 +2606,7 @@ async def handle_stars_purchase(callback: types.CallbackQuery):
             await callback.answer(translations.get_text(user_id, "invoice_sent"))
             
         except Exception as e:
-            print(f"❌ Error creating Stars invoice for user {user_id}: {e}")
+            logger.error("Error creating Stars invoice for user %s: %s", user_id, e)
             await callback.answer(translations.get_text(user_id, "payment_error"))
             
             # Send error message to user
@@ -2313,15 +2621,29 @@ Please try again or contact support if the problem persists."""
                 ("← Back to Main", "back_to_main")
             )
             
-            await callback.message.edit_text(error_text, reply_markup=keyboard, parse_mode="HTML")
+            await safe_edit_message(callback, error_text, reply_markup=keyboard)
+
+# Pre-compiled dispatch table for prefix-parameterized callbacks, keyed by the
+# first underscore-separated token. One registered handler + one dict lookup
+# replaces a startswith() filter evaluation per registered handler per update.
+CALLBACK_PREFIX_DISPATCH = {
+    "commissions": commissions_page_callback,  # commissions_page_<n>
+    "set": set_language_callback,              # set_language_<lang>
+    "buy": handle_stars_purchase,              # buy_stars_<package>
+}
+
+@router.callback_query(lambda c: c.data is not None and "_" in c.data and c.data.partition("_")[0] in CALLBACK_PREFIX_DISPATCH)
+async def dispatch_prefix_callback(callback: types.CallbackQuery):
+    """Dispatch prefix-parameterized callbacks via O(1) table lookup"""
+    await CALLBACK_PREFIX_DISPATCH[callback.data.partition("_")[0]](callback)
 
 # Handle pre-checkout query (validate payment)
 @router.pre_checkout_query()
 async def process_pre_checkout_query(pre_checkout_query: types.PreCheckoutQuery):
-    print(f"🔍 [DEBUG] Pre-checkout query received: {pre_checkout_query.id}")
-    print(f"🔍 [DEBUG] Pre-checkout query payload: {pre_checkout_query.invoice_payload}")
+    logger.debug("[DEBUG] Pre-checkout query received: %s", pre_checkout_query.id)
+    logger.debug("[DEBUG] Pre-checkout query payload: %s", pre_checkout_query.invoice_payload)
     await bot.answer_pre_checkout_query(pre_checkout_query.id, ok=True)
-    print(f"🔍 [DEBUG] Pre-checkout query answered: {pre_checkout_query.id}")
+    logger.debug("[DEBUG] Pre-checkout query answered: %s", pre_checkout_query.id)
 
 
 @router.message(filters.Command("referral"))
@@ -2331,7 +2653,6 @@ async def referral_command(message: types.Message):
     
     # SECURITY: Validate user exists in data
     if user_id not in user_data:
-        import translations
         keyboard = create_keyboard(
             (translations.get_text(user_id, "back_to_menu"), "back_to_main")
         )
@@ -2339,7 +2660,7 @@ async def referral_command(message: types.Message):
         return
     
     # Get referral statistics
-    stats = get_referral_stats(user_data, user_id, config.BOT_USERNAME)
+    stats = get_referral_stats_cached(user_id)
     
     if not stats:
         await message.reply("❌ <b>Error loading referral data!</b>", parse_mode="HTML")
@@ -2371,7 +2692,6 @@ async def referral_command(message: types.Message):
         """
     
     # Create keyboard with copy link button
-    import translations
     keyboard = create_keyboard(
         (translations.get_text(user_id, "copy_link"), "copy_referral_link"),
         (translations.get_text(user_id, "share_stats"), "share_referral_stats"),
@@ -2401,7 +2721,7 @@ async def check_referral_command(message: types.Message):
 """
         
         # Check database directly
-        conn = sqlite3.connect('cgspins.db')
+        conn = db_connect()
         cursor = conn.cursor()
         cursor.execute('SELECT referred_by, referrals FROM users WHERE user_id = ?', (user_id,))
         row = cursor.fetchone()
@@ -2415,18 +2735,14 @@ async def check_referral_command(message: types.Message):
         
         await message.reply(status_text, parse_mode="HTML")
     else:
-        import translations
         await message.reply(translations.get_text(user_id, "user_data_not_found_reply"))
 
 @router.message(filters.Command("status"))
+@admin_only
 async def status_command(message: types.Message):
     """Show bot status and health information (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can view bot status.", parse_mode="HTML")
-        return
-    
     try:
         # Get metrics and health status
         from src.utils import metrics, health_checker, alert_system
@@ -2465,14 +2781,11 @@ async def status_command(message: types.Message):
 
 
 @router.message(filters.Command("admin"))
+@admin_only
 async def admin_command(message: types.Message):
     """Open admin panel (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can access admin panel.", parse_mode="HTML")
-        return
-    
     # Create admin panel keyboard
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
@@ -2488,32 +2801,18 @@ async def admin_command(message: types.Message):
         ]
     ])
     
-    admin_text = """⚙️ <b>Admin Panel</b>
-
-Welcome to the CG Spins Admin Panel. Choose a category to manage:
-
-👥 <b>User Management:</b> View users, manage accounts, ban/unban
-🎮 <b>Game Management:</b> Package stats, hit rates, game settings
-💰 <b>Financial Management:</b> Payment tracking, revenue analytics
-⚙️ <b>System Management:</b> Database, logs, maintenance mode
-📊 <b>Analytics & Reports:</b> User retention, popular packages
-📝 <b>Content Management:</b> FAQ, translations, pricing"""
-    
-    await message.reply(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await message.reply(ADMIN_PANEL_TEXT, reply_markup=keyboard, parse_mode="HTML")
 
 
 @router.message(filters.Command("users"))
+@admin_only
 async def users_command(message: types.Message):
     """Show user statistics (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can view user statistics.", parse_mode="HTML")
-        return
-    
     try:
         total_users = len(user_data)
-        active_users = len([uid for uid, data in user_data.items() if data.get('spins_available', 0) > 0])
+        active_users = len(active_user_ids)
         
         # Package distribution
         package_stats = {}
@@ -2550,48 +2849,37 @@ async def users_command(message: types.Message):
 
 
 @router.message(filters.Command("broadcast"))
+@admin_only
 async def broadcast_command(message: types.Message):
     """Start broadcast mode (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can send broadcasts.", parse_mode="HTML")
-        return
-    
     # Enable broadcast mode for this user
-    if user_id not in user_data:
-        user_data[user_id] = {}
-    user_data[user_id]['broadcast_mode'] = True
+    broadcast_mode_admins.add(user_id)
     
     await message.reply("📢 <b>Broadcast Mode Enabled</b>\n\nSend your message now. It will be sent to all users.\n\nType /cancel to exit broadcast mode.", parse_mode="HTML")
 
 
 @router.message(filters.Command("cancel"))
+@admin_only
 async def cancel_command(message: types.Message):
     """Cancel current operation (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can use this command.", parse_mode="HTML")
-        return
-    
     # Disable broadcast mode
-    if user_id in user_data and user_data[user_id].get('broadcast_mode', False):
-        user_data[user_id]['broadcast_mode'] = False
+    if user_id in broadcast_mode_admins:
+        broadcast_mode_admins.discard(user_id)
         await message.reply("✅ <b>Broadcast Mode Disabled</b>\n\nYou are no longer in broadcast mode.", parse_mode="HTML")
     else:
         await message.reply("ℹ️ <b>No active operation to cancel</b>\n\nYou are not currently in any special mode.", parse_mode="HTML")
 
 
 @router.message(filters.Command("maintenance"))
+@admin_only
 async def maintenance_command(message: types.Message):
     """Toggle maintenance mode (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can toggle maintenance mode.", parse_mode="HTML")
-        return
-    
     # Toggle maintenance mode
     global maintenance_mode
     maintenance_mode = not maintenance_mode
@@ -2603,31 +2891,31 @@ async def maintenance_command(message: types.Message):
 
 
 @router.message(filters.Command("stats"))
+@admin_only
 async def stats_command(message: types.Message):
     """Show detailed bot statistics (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can view detailed statistics.", parse_mode="HTML")
-        return
-    
     try:
-        # Calculate comprehensive statistics
+        # Calculate comprehensive statistics in a single pass over user_data
         total_users = len(user_data)
-        total_spins = sum(data.get('total_spins', 0) for data in user_data.values())
-        total_hits = sum(data.get('hits', 0) for data in user_data.values())
-        total_referrals = sum(data.get('referrals', 0) for data in user_data.values())
-        total_nfts = sum(len(data.get('nfts', [])) for data in user_data.values())
-        
-        # Package statistics
+        total_spins = total_hits = total_referrals = total_nfts = 0
         package_stats = {}
         for data in user_data.values():
+            spins = data.get('total_spins', 0)
+            hits = data.get('hits', 0)
+            total_spins += spins
+            total_hits += hits
+            total_referrals += data.get('referrals', 0)
+            total_nfts += len(data.get('nfts', ()))
+
             pkg = data.get('package', 'None')
-            if pkg not in package_stats:
-                package_stats[pkg] = {'users': 0, 'spins': 0, 'hits': 0}
-            package_stats[pkg]['users'] += 1
-            package_stats[pkg]['spins'] += data.get('total_spins', 0)
-            package_stats[pkg]['hits'] += data.get('hits', 0)
+            pkg_stats = package_stats.get(pkg)
+            if pkg_stats is None:
+                pkg_stats = package_stats[pkg] = {'users': 0, 'spins': 0, 'hits': 0}
+            pkg_stats['users'] += 1
+            pkg_stats['spins'] += spins
+            pkg_stats['hits'] += hits
         
         # Revenue calculation (approximate)
         revenue_ton = 0
@@ -2658,7 +2946,7 @@ async def stats_command(message: types.Message):
             if pkg_name != 'None':
                 stats_text += f"• {pkg_name.title()}: {stats['users']} users, {stats['spins']} spins, {stats['hits']} hits\n"
         
-        stats_text += f"\n⏰ <b>Last Updated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        stats_text += f"\n⏰ <b>Last Updated:</b> {format_now()}"
         
         await message.reply(stats_text, parse_mode="HTML")
         
@@ -2667,70 +2955,45 @@ async def stats_command(message: types.Message):
 
 
 @router.message(filters.Command("help_admin"))
+@admin_only
 async def help_admin_command(message: types.Message):
     """Show admin command help (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can view admin help.", parse_mode="HTML")
-        return
-    
-    help_text = """⚙️ <b>Admin Commands Help</b>
+    await message.reply(ADMIN_HELP_TEXT, parse_mode="HTML")
 
-<b>Basic Commands:</b>
-/start - Start the bot
-/status - Show bot status
-/admin - Open admin panel
-/help_admin - Show this help
 
-<b>User Management:</b>
-/users - Show user statistics
-/stats - Show detailed statistics
-/user_info &lt;user_id&gt; - Get detailed user information
-/ban_user &lt;user_id&gt; [reason] - Ban a user
-/unban_user &lt;user_id&gt; - Unban a user
-/give_package &lt;user_id&gt; &lt;package&gt; - Give package to user
+# Rows per backfill transaction in fix_database: large enough to amortize the
+# per-commit fsync, small enough to keep the WAL frame and write lock bounded
+_BACKFILL_BATCH_ROWS = 50_000
 
-<b>Communication:</b>
-/broadcast - Start broadcast mode
-/cancel - Cancel current operation
+# Shared layout for the admin commands' error replies, and the give_package
+# success text as a module-level template (f-string literals re-evaluate
+# their format machinery per call; these are built once)
+GIVE_PACKAGE_SUCCESS_TEMPLATE = "✅ <b>Package Given Successfully!</b>\n\nUser {user_id} now has {package} package with {spins} spins."
 
-<b>System Management:</b>
-/maintenance - Toggle maintenance mode
-/reset_db - Reset database (DANGEROUS!)
-/fix_database - Fix database schema issues
-
-<b>Game Commands:</b>
-/reset - Reset your own data (for testing)
-/referral - Show referral info
-/check_referral - Check referral status
+def _admin_error_text(title: str, detail) -> str:
+    """Render an admin error reply in the shared ❌ layout"""
+    return f"❌ <b>{title}</b>\n\n{detail}"
 
-<b>Admin Panel:</b>
-Use /admin to access the full admin panel with all management options.
-
-<b>Available Packages:</b> bronze, silver, gold, black"""
-    
-    await message.reply(help_text, parse_mode="HTML")
 
-
-@router.message(filters.Command("fix_database"))
-async def fix_database_command(message: types.Message):
-    """Fix database schema issues and unify all schemas (admin only)"""
-    user_id = message.from_user.id
-    
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can fix database issues.", parse_mode="HTML")
-        return
-    
+def _run_fix_database() -> str:
+    """Synchronous body of /fix_database; returns the report text"""
+    conn = None
     try:
-        conn = sqlite3.connect('cgspins.db')
+        conn = db_connect()
         cursor = conn.cursor()
-        
+
+        # Run the whole ALTER/UPDATE sequence in one write transaction so the
+        # migration costs a single fsync instead of one per statement
+        # (sqlite3 autocommits DDL unless a transaction is opened explicitly)
+        cursor.execute("BEGIN IMMEDIATE")
+
         fix_text = "🔧 <b>Database Schema Unification</b>\n\n"
         
         # 1. Fix pending_ton_payments table
         cursor.execute("PRAGMA table_info(pending_ton_payments)")
-        columns = [column[1] for column in cursor.fetchall()]
+        columns = frozenset(column[1] for column in cursor.fetchall())
         
         fix_text += "📋 <b>Pending TON Payments Table:</b>\n"
         
@@ -2739,7 +3002,7 @@ async def fix_database_command(message: types.Message):
             if 'expected_amount' in columns:
                 # Migrate data from expected_amount to amount_nano
                 cursor.execute("ALTER TABLE pending_ton_payments ADD COLUMN amount_nano INTEGER")
-                cursor.execute("UPDATE pending_ton_payments SET amount_nano = expected_amount WHERE amount_nano IS NULL")
+                cursor.execute("UPDATE pending_ton_payments SET amount_nano = expected_amount")
                 fix_text += "✅ Migrated expected_amount → amount_nano\n"
             else:
                 cursor.execute("ALTER TABLE pending_ton_payments ADD COLUMN amount_nano INTEGER")
@@ -2751,7 +3014,7 @@ async def fix_database_command(message: types.Message):
             if 'timestamp' in columns:
                 # Migrate data from timestamp to created_at
                 cursor.execute("ALTER TABLE pending_ton_payments ADD COLUMN created_at TIMESTAMP")
-                cursor.execute("UPDATE pending_ton_payments SET created_at = datetime(timestamp, 'unixepoch') WHERE created_at IS NULL")
+                cursor.execute("UPDATE pending_ton_payments SET created_at = datetime(timestamp, 'unixepoch')")
                 fix_text += "✅ Migrated timestamp → created_at\n"
             else:
                 cursor.execute("ALTER TABLE pending_ton_payments ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
@@ -2761,15 +3024,34 @@ async def fix_database_command(message: types.Message):
         
         # 2. Fix processed_transactions table
         cursor.execute("PRAGMA table_info(processed_transactions)")
-        columns = [column[1] for column in cursor.fetchall()]
+        columns = frozenset(column[1] for column in cursor.fetchall())
         
         fix_text += "\n📋 <b>Processed Transactions Table:</b>\n"
         
         if 'amount_nano' not in columns:
             if 'amount' in columns:
-                # Migrate data from amount to amount_nano
+                # Migrate data from amount to amount_nano. This table grows
+                # with every sale, so commit the DDL and then backfill in
+                # bounded rowid batches: each batch is its own short WAL
+                # transaction, keeping the write lock and WAL frame small so
+                # readers slip in between, and the IS NULL guard lets an
+                # interrupted run resume where it stopped.
                 cursor.execute("ALTER TABLE processed_transactions ADD COLUMN amount_nano INTEGER")
-                cursor.execute("UPDATE processed_transactions SET amount_nano = amount WHERE amount_nano IS NULL")
+                conn.commit()
+                cursor.execute("SELECT min(rowid), max(rowid) FROM processed_transactions")
+                lo, hi = cursor.fetchone()
+                if lo is not None:
+                    for batch_no, start in enumerate(range(lo, hi + 1, _BACKFILL_BATCH_ROWS), 1):
+                        cursor.execute(
+                            "UPDATE processed_transactions SET amount_nano = amount "
+                            "WHERE amount_nano IS NULL AND rowid BETWEEN ? AND ?",
+                            (start, start + _BACKFILL_BATCH_ROWS - 1)
+                        )
+                        conn.commit()
+                        if batch_no % 20 == 0:
+                            logger.info("fix_database: backfilled %d batches of amount_nano", batch_no)
+                # Re-open the migration transaction for the remaining steps
+                cursor.execute("BEGIN IMMEDIATE")
                 fix_text += "✅ Migrated amount → amount_nano\n"
             else:
                 cursor.execute("ALTER TABLE processed_transactions ADD COLUMN amount_nano INTEGER")
@@ -2781,7 +3063,7 @@ async def fix_database_command(message: types.Message):
             if 'timestamp' in columns:
                 # Migrate data from timestamp to processed_at
                 cursor.execute("ALTER TABLE processed_transactions ADD COLUMN processed_at TIMESTAMP")
-                cursor.execute("UPDATE processed_transactions SET processed_at = datetime(timestamp, 'unixepoch') WHERE processed_at IS NULL")
+                cursor.execute("UPDATE processed_transactions SET processed_at = datetime(timestamp, 'unixepoch')")
                 fix_text += "✅ Migrated timestamp → processed_at\n"
             else:
                 cursor.execute("ALTER TABLE processed_transactions ADD COLUMN processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
@@ -2791,14 +3073,14 @@ async def fix_database_command(message: types.Message):
         
         # 3. Fix stars_transactions table (keep existing schema as it's working)
         cursor.execute("PRAGMA table_info(stars_transactions)")
-        columns = [column[1] for column in cursor.fetchall()]
+        stars_columns = frozenset(column[1] for column in cursor.fetchall())
         
         fix_text += "\n📋 <b>Stars Transactions Table:</b>\n"
         fix_text += "✅ Stars transactions schema is compatible\n"
         
         # 4. Fix users table
         cursor.execute("PRAGMA table_info(users)")
-        columns = [column[1] for column in cursor.fetchall()]
+        columns = frozenset(column[1] for column in cursor.fetchall())
         
         fix_text += "\n📋 <b>Users Table:</b>\n"
         
@@ -2810,588 +3092,428 @@ async def fix_database_command(message: types.Message):
             'banned_by': 'INTEGER'
         }
         
-        for col_name, col_def in required_columns.items():
-            if col_name not in columns:
-                cursor.execute(f"ALTER TABLE users ADD COLUMN {col_name} {col_def}")
+        # Set-difference against the discovered schema so only truly missing
+        # columns generate ALTERs. required_columns doubles as the allowlist:
+        # the interpolated identifiers can only come from that literal, never
+        # from user input. All ALTERs run on the one cursor inside the shared
+        # BEGIN IMMEDIATE transaction opened above.
+        missing_columns = required_columns.keys() - columns
+        alters = [
+            (col_name, col_def)
+            for col_name, col_def in required_columns.items()
+            if col_name in missing_columns
+        ]
+        for col_name, col_def in alters:
+            cursor.execute(f"ALTER TABLE users ADD COLUMN {col_name} {col_def}")
+
+        for col_name in required_columns:
+            if col_name in missing_columns:
                 fix_text += f"✅ Added {col_name} column\n"
             else:
                 fix_text += f"✅ {col_name} column exists\n"
-        
+
+        # 5. Indexes for the columns the transaction views sort on
+        # (users.user_id is the INTEGER PRIMARY KEY, so it needs no index;
+        # processed_at is guaranteed present by step 2 above)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_processed_transactions_processed_at ON processed_transactions(processed_at)")
+        if 'timestamp' in stars_columns:
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_stars_transactions_timestamp ON stars_transactions(timestamp)")
+
+        # Refresh query-planner statistics so post-migration SELECTs keep
+        # picking the right indexes; PRAGMA optimize re-analyzes only the
+        # tables whose stats have gone stale on later runs
+        cursor.execute("ANALYZE")
+        cursor.execute("PRAGMA optimize")
+
         conn.commit()
         conn.close()
-        
+
         fix_text += "\n🎉 <b>Database schema unification completed!</b>\n"
         fix_text += "All functions should now work with a consistent schema."
-        
+
+        return fix_text
+
+    except Exception:
+        # Roll back so a failed migration never leaves a half-applied schema
+        if conn is not None:
+            try:
+                conn.rollback()
+                conn.close()
+            except Exception:
+                pass
+        raise
+
+
+@router.message(filters.Command("fix_database"))
+@admin_only
+async def fix_database_command(message: types.Message):
+    """Fix database schema issues and unify all schemas (admin only)"""
+    try:
+        # Run the blocking sqlite3 work on a worker thread so the event loop
+        # keeps answering other users while a long migration/backfill runs
+        fix_text = await asyncio.to_thread(_run_fix_database)
         await message.reply(fix_text, parse_mode="HTML")
-        
     except Exception as e:
-        await message.reply(f"❌ <b>Error fixing database:</b>\n\n{str(e)}", parse_mode="HTML")
+        await message.reply(_admin_error_text("Error fixing database:", e), parse_mode="HTML")
+
+
+# Precompiled argument patterns for the admin commands: one C-level regex
+# scan replaces split() + length checks + int() ValueError handling, and a
+# non-numeric user id falls out as a usage error instead of an exception
+_GIVE_PACKAGE_RE = re.compile(r"^/give_package(?:@\w+)?\s+(\d+)\s+(\w+)\s*$")
+_BAN_USER_RE = re.compile(r"^/ban_user(?:@\w+)?\s+(\d+)(?:\s+(\S.*?))?\s*$", re.DOTALL)
+_UNBAN_USER_RE = re.compile(r"^/unban_user(?:@\w+)?\s+(\d+)\s*$")
+_USER_INFO_RE = re.compile(r"^/user_info(?:@\w+)?\s+(\d+)\s*$")
+
+
+def _default_user(now_iso: str = None) -> dict:
+    """Fresh user_data entry for users an admin touches before their first /start"""
+    if now_iso is None:
+        now_iso = datetime.now().isoformat()
+    return {
+        "balance": 0.0,
+        "package": "None",
+        "level": "Spinner",
+        "spin_points": 0,
+        "hits": 0,
+        "total_spins": 0,
+        "spins_available": 0,
+        "referrals": 0,
+        "referred_by": None,
+        "payment_method": None,
+        "nfts": [],
+        "created_at": now_iso,
+        "updated_at": now_iso
+    }
 
 
 @router.message(filters.Command("give_package"))
+@admin_only
 async def give_package_command(message: types.Message):
     """Give a package to a user (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can give packages.", parse_mode="HTML")
-        return
-    
     # Parse command arguments: /give_package <user_id> <package_name>
-    args = message.text.split()
-    if len(args) != 3:
+    match = _GIVE_PACKAGE_RE.match(message.text)
+    if not match:
         await message.reply("❌ <b>Usage:</b> /give_package &lt;user_id&gt; &lt;package_name&gt;\n\n<b>Available packages:</b> bronze, silver, gold, black", parse_mode="HTML")
         return
-    
+
     try:
-        target_user_id = int(args[1])
-        package_name = args[2].lower()
-        
+        target_user_id = int(match.group(1))
+        package_name = match.group(2).lower()
+
         if package_name not in config.PACKAGES:
             await message.reply(f"❌ <b>Invalid package!</b>\n\nAvailable packages: {', '.join(config.PACKAGES.keys())}", parse_mode="HTML")
             return
         
-        # Initialize target user if not exists
-        if target_user_id not in user_data:
-            user_data[target_user_id] = {
-                "balance": 0.0,
-                "package": "None",
-                "level": "Spinner",
-                "spin_points": 0,
-                "hits": 0,
-                "total_spins": 0,
-                "spins_available": 0,
-                "referrals": 0,
-                "referred_by": None,
-                "payment_method": None,
-                "nfts": [],
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
-            }
-        
+        # One timestamp per command, reused for init and update
+        now_iso = datetime.now().isoformat()
+
+        # Initialize target user if not exists (setdefault: one hash lookup)
+        user = user_data.setdefault(target_user_id, _default_user(now_iso))
+
         # Give the package
         pkg = config.PACKAGES[package_name]
-        user_data[target_user_id].update({
+        user.update({
             "package": package_name,
             "spins_available": pkg["spins"],
-            "updated_at": datetime.now().isoformat()
+            "updated_at": now_iso
         })
         
-        # Save to database
-        save_user_data(target_user_id, user_data[target_user_id])
+        # Stage for the write-behind flush
+        queue_user_save(target_user_id)
         
-        await message.reply(f"✅ <b>Package Given Successfully!</b>\n\nUser {target_user_id} now has {pkg['name']} package with {pkg['spins']} spins.", parse_mode="HTML")
+        await message.reply(GIVE_PACKAGE_SUCCESS_TEMPLATE.format(user_id=target_user_id, package=pkg['name'], spins=pkg['spins']), parse_mode="HTML")
         
-    except ValueError:
-        await message.reply("❌ <b>Invalid user ID!</b>\n\nUser ID must be a number.", parse_mode="HTML")
     except Exception as e:
-        await message.reply(f"❌ <b>Error giving package:</b>\n\n{str(e)}", parse_mode="HTML")
+        await message.reply(_admin_error_text("Error giving package:", e), parse_mode="HTML")
 
 
 @router.message(filters.Command("ban_user"))
+@admin_only
 async def ban_user_command(message: types.Message):
     """Ban a user (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can ban users.", parse_mode="HTML")
-        return
-    
     # Parse command arguments: /ban_user <user_id> [reason]
-    args = message.text.split()
-    if len(args) < 2:
+    match = _BAN_USER_RE.match(message.text)
+    if not match:
         await message.reply("❌ <b>Usage:</b> /ban_user &lt;user_id&gt; [reason]", parse_mode="HTML")
         return
-    
+
     try:
-        target_user_id = int(args[1])
-        reason = " ".join(args[2:]) if len(args) > 2 else "No reason provided"
-        
-        # Initialize target user if not exists
-        if target_user_id not in user_data:
-            user_data[target_user_id] = {
-                "balance": 0.0,
-                "package": "None",
-                "level": "Spinner",
-                "spin_points": 0,
-                "hits": 0,
-                "total_spins": 0,
-                "spins_available": 0,
-                "referrals": 0,
-                "referred_by": None,
-                "payment_method": None,
-                "nfts": [],
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
-            }
-        
+        target_user_id = int(match.group(1))
+        reason = match.group(2) or "No reason provided"
+
+        # One timestamp per command, reused for init and ban fields
+        now_iso = datetime.now().isoformat()
+
+        # Initialize target user if not exists (setdefault: one hash lookup)
+        user = user_data.setdefault(target_user_id, _default_user(now_iso))
+
         # Ban the user
-        user_data[target_user_id]["banned"] = True
-        user_data[target_user_id]["ban_reason"] = reason
-        user_data[target_user_id]["ban_date"] = datetime.now().isoformat()
-        user_data[target_user_id]["updated_at"] = datetime.now().isoformat()
+        user["banned"] = True
+        user["ban_reason"] = reason
+        user["ban_date"] = now_iso
+        user["updated_at"] = now_iso
         
-        # Save to database
-        save_user_data(target_user_id, user_data[target_user_id])
+        # Stage for the write-behind flush
+        queue_user_save(target_user_id)
         
         await message.reply(f"🚫 <b>User Banned Successfully!</b>\n\nUser {target_user_id} has been banned.\n<b>Reason:</b> {reason}", parse_mode="HTML")
         
-    except ValueError:
-        await message.reply("❌ <b>Invalid user ID!</b>\n\nUser ID must be a number.", parse_mode="HTML")
     except Exception as e:
-        await message.reply(f"❌ <b>Error banning user:</b>\n\n{str(e)}", parse_mode="HTML")
+        await message.reply(_admin_error_text("Error banning user:", e), parse_mode="HTML")
 
 
 @router.message(filters.Command("unban_user"))
+@admin_only
 async def unban_user_command(message: types.Message):
     """Unban a user (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can unban users.", parse_mode="HTML")
-        return
-    
     # Parse command arguments: /unban_user <user_id>
-    args = message.text.split()
-    if len(args) != 2:
+    match = _UNBAN_USER_RE.match(message.text)
+    if not match:
         await message.reply("❌ <b>Usage:</b> /unban_user &lt;user_id&gt;", parse_mode="HTML")
         return
-    
+
     try:
-        target_user_id = int(args[1])
-        
+        target_user_id = int(match.group(1))
+
         if target_user_id not in user_data:
             await message.reply("❌ <b>User not found!</b>\n\nUser ID does not exist in the database.", parse_mode="HTML")
             return
         
         # Unban the user
-        if user_data[target_user_id].get("banned", False):
-            user_data[target_user_id]["banned"] = False
-            user_data[target_user_id]["unban_date"] = datetime.now().isoformat()
-            user_data[target_user_id]["updated_at"] = datetime.now().isoformat()
+        user = user_data[target_user_id]
+        if user.get("banned", False):
+            now_iso = datetime.now().isoformat()
+            user["banned"] = False
+            user["unban_date"] = now_iso
+            user["updated_at"] = now_iso
             
-            # Save to database
-            save_user_data(target_user_id, user_data[target_user_id])
+            # Stage for the write-behind flush
+            queue_user_save(target_user_id)
             
             await message.reply(f"✅ <b>User Unbanned Successfully!</b>\n\nUser {target_user_id} has been unbanned and can now use the bot again.", parse_mode="HTML")
         else:
             await message.reply(f"ℹ️ <b>User Not Banned</b>\n\nUser {target_user_id} is not currently banned.", parse_mode="HTML")
         
-    except ValueError:
-        await message.reply("❌ <b>Invalid user ID!</b>\n\nUser ID must be a number.", parse_mode="HTML")
     except Exception as e:
-        await message.reply(f"❌ <b>Error unbanning user:</b>\n\n{str(e)}", parse_mode="HTML")
+        await message.reply(_admin_error_text("Error unbanning user:", e), parse_mode="HTML")
+
+
+# Header template for /user_info, compiled once at module load
+USER_INFO_TEMPLATE = """👤 <b>User Information</b>
+
+🆔 <b>User ID:</b> {user_id}
+📦 <b>Package:</b> {package}
+🏆 <b>Level:</b> {level}
+🎯 <b>Spin Points:</b> {spin_points}
+🎰 <b>Total Spins:</b> {total_spins}
+💎 <b>Total Hits:</b> {hits}
+🔄 <b>Spins Available:</b> {spins_available}
+👥 <b>Referrals:</b> {referrals}
+🖼️ <b>NFTs:</b> {nft_count}
+📅 <b>Created:</b> {created_at}
+📅 <b>Updated:</b> {updated_at}"""
 
 
 @router.message(filters.Command("user_info"))
+@admin_only
 async def user_info_command(message: types.Message):
     """Get detailed information about a user (admin only)"""
     user_id = message.from_user.id
     
-    if user_id not in config.ADMIN_USER_IDS:
-        await message.reply("❌ <b>Access Denied</b>\n\nOnly admin can view user information.", parse_mode="HTML")
-        return
-    
     # Parse command arguments: /user_info <user_id>
-    args = message.text.split()
-    if len(args) != 2:
+    match = _USER_INFO_RE.match(message.text)
+    if not match:
         await message.reply("❌ <b>Usage:</b> /user_info &lt;user_id&gt;", parse_mode="HTML")
         return
-    
+
     try:
-        target_user_id = int(args[1])
-        
-        if target_user_id not in user_data:
+        target_user_id = int(match.group(1))
+
+        # Serve from memory when resident, otherwise fall back to the indexed
+        # SELECT through the read pool (user_id is the users table's INTEGER
+        # PRIMARY KEY, i.e. the B-tree key), so the cold path works without
+        # the whole table living in RAM
+        user = user_data.get(target_user_id) or get_user_data_from_db(target_user_id)
+        if not user:
             await message.reply("❌ <b>User not found!</b>\n\nUser ID does not exist in the database.", parse_mode="HTML")
             return
-        
-        user = user_data[target_user_id]
-        
-        # Format user information
-        info_text = f"""👤 <b>User Information</b>
-
-🆔 <b>User ID:</b> {target_user_id}
-📦 <b>Package:</b> {user.get('package', 'None')}
-🏆 <b>Level:</b> {user.get('level', 'Spinner')}
-🎯 <b>Spin Points:</b> {user.get('spin_points', 0)}
-🎰 <b>Total Spins:</b> {user.get('total_spins', 0)}
-💎 <b>Total Hits:</b> {user.get('hits', 0)}
-🔄 <b>Spins Available:</b> {user.get('spins_available', 0)}
-👥 <b>Referrals:</b> {user.get('referrals', 0)}
-🖼️ <b>NFTs:</b> {len(user.get('nfts', []))}
-📅 <b>Created:</b> {user.get('created_at', 'Unknown')}
-📅 <b>Updated:</b> {user.get('updated_at', 'Unknown')}"""
-        
+
+        # Format user information (list + join: linear even for NFT whales).
+        # The shared () default avoids allocating an empty list per call.
+        nfts = user.get('nfts') or ()
+        parts = [USER_INFO_TEMPLATE.format(
+            user_id=target_user_id,
+            package=user.get('package', 'None'),
+            level=user.get('level', 'Spinner'),
+            spin_points=user.get('spin_points', 0),
+            total_spins=user.get('total_spins', 0),
+            hits=user.get('hits', 0),
+            spins_available=user.get('spins_available', 0),
+            referrals=user.get('referrals', 0),
+            nft_count=len(nfts),
+            created_at=user.get('created_at', 'Unknown'),
+            updated_at=user.get('updated_at', 'Unknown')
+        )]
+
         # Add ban status if applicable
         if user.get('banned', False):
-            info_text += f"\n🚫 <b>Status:</b> BANNED"
-            info_text += f"\n📝 <b>Ban Reason:</b> {user.get('ban_reason', 'No reason provided')}"
-            info_text += f"\n📅 <b>Ban Date:</b> {user.get('ban_date', 'Unknown')}"
+            parts.append("🚫 <b>Status:</b> BANNED")
+            parts.append(f"📝 <b>Ban Reason:</b> {user.get('ban_reason', 'No reason provided')}")
+            parts.append(f"📅 <b>Ban Date:</b> {user.get('ban_date', 'Unknown')}")
         else:
-            info_text += f"\n✅ <b>Status:</b> Active"
-        
+            parts.append("✅ <b>Status:</b> Active")
+
         # Add NFT list if user has any
-        if user.get('nfts'):
-            info_text += f"\n\n🎁 <b>NFT Collection:</b>\n"
-            for nft in user.get('nfts', []):
-                info_text += f"• {nft}\n"
-        
-        await message.reply(info_text, parse_mode="HTML")
+        if nfts:
+            parts.append("\n🎁 <b>NFT Collection:</b>")
+            parts.extend(f"• {nft}" for nft in nfts)
+
+        await message.reply("\n".join(parts), parse_mode="HTML")
         
-    except ValueError:
-        await message.reply("❌ <b>Invalid user ID!</b>\n\nUser ID must be a number.", parse_mode="HTML")
     except Exception as e:
-        await message.reply(f"❌ <b>Error getting user information:</b>\n\n{str(e)}", parse_mode="HTML")
+        await message.reply(_admin_error_text("Error getting user information:", e), parse_mode="HTML")
 
 
 # Universal Admin Callback Debug Handler
 @router.callback_query(lambda c: c.data.startswith("admin_"))
 async def admin_debug_callback(callback: types.CallbackQuery):
-    """Debug handler for all admin callbacks"""
+    """Route admin callbacks through the pre-built dispatch tables"""
     user_id = callback.from_user.id
     callback_data = callback.data
-    
-    print(f"🔍 [Admin Debug] Callback received: '{callback_data}' from user {user_id}")
-    print(f"🔍 [Admin Debug] Callback data length: {len(callback_data)}")
-    print(f"🔍 [Admin Debug] Callback data repr: {repr(callback_data)}")
-    
-    # Check if this is a known admin callback
-    if callback_data.startswith("admin_reset_user_"):
-        print(f"🔍 [Admin Debug] Routing to reset user data handler")
-        return await admin_reset_user_data_callback(callback)
-    elif callback_data.startswith("admin_ban_user_"):
-        print(f"🔍 [Admin Debug] Routing to ban user handler")
-        return await admin_ban_user_callback(callback)
-    elif callback_data.startswith("admin_user_stats_"):
-        print(f"🔍 [Admin Debug] Routing to user stats handler")
-        return await admin_user_stats_callback(callback)
-    elif callback_data.startswith("admin_user_detail_"):
-        print(f"🔍 [Admin Debug] Routing to individual user detail handler")
-        return await admin_individual_user_detail_callback(callback)
-    elif callback_data.startswith("admin_confirm_reset_"):
-        print(f"🔍 [Admin Debug] Routing to confirm reset handler")
-        return await admin_confirm_reset_user_data_callback(callback)
-    elif callback_data.startswith("admin_confirm_ban_"):
-        print(f"🔍 [Admin Debug] Routing to confirm ban handler")
-        return await admin_confirm_ban_user_callback(callback)
-    elif callback_data.startswith("admin_unban_user_"):
-        print(f"🔍 [Admin Debug] Routing to unban user handler")
-        return await admin_unban_user_callback(callback)
-    elif callback_data == "admin_panel":
-        print(f"🔍 [Admin Debug] Routing to admin panel handler")
-        return await admin_panel_callback(callback)
-    elif callback_data == "admin_user_management":
-        print(f"🔍 [Admin Debug] Routing to user management handler")
-        return await admin_user_management_callback(callback)
-    elif callback_data == "admin_user_details":
-        print(f"🔍 [Admin Debug] Routing to user details handler")
-        return await admin_user_details_callback(callback)
-    elif callback_data == "admin_financial_management":
-        print(f"🔍 [Admin Debug] Routing to financial management handler")
-        return await admin_financial_management_callback(callback)
-    elif callback_data == "admin_system_management":
-        print(f"🔍 [Admin Debug] Routing to system management handler")
-        return await admin_system_management_callback(callback)
-    elif callback_data == "admin_content_management":
-        print(f"🔍 [Admin Debug] Routing to content management handler")
-        return await admin_content_management_callback(callback)
-    elif callback_data == "admin_analytics_reports":
-        print(f"🔍 [Admin Debug] Routing to analytics reports handler")
-        return await admin_analytics_reports_callback(callback)
-    elif callback_data == "admin_view_users":
-        print(f"🔍 [Admin Debug] Routing to view users handler")
-        return await admin_view_users_callback(callback)
-    elif callback_data == "admin_reset_user":
-        print(f"🔍 [Admin Debug] Routing to reset user handler")
-        return await admin_reset_user_callback(callback)
-    elif callback_data == "admin_ban_user":
-        print(f"🔍 [Admin Debug] Routing to ban user handler")
-        return await admin_ban_user_callback(callback)
-    elif callback_data == "admin_give_package":
-        print(f"🔍 [Admin Debug] Routing to give package handler")
-        return await admin_give_package_callback(callback)
-    elif callback_data.startswith("admin_select_package_"):
-        print(f"🔍 [Admin Debug] Routing to select package handler")
-        return await admin_select_package_callback(callback)
-    elif callback_data.startswith("admin_give_package_"):
-        print(f"🔍 [Admin Debug] Routing to give specific package handler")
-        return await admin_give_specific_package_callback(callback)
-    elif callback_data == "admin_package_stats":
-        print(f"🔍 [Admin Debug] Routing to package stats handler")
-        return await admin_package_stats_callback(callback)
-    elif callback_data == "admin_hit_stats":
-        print(f"🔍 [Admin Debug] Routing to hit stats handler")
-        return await admin_hit_stats_callback(callback)
-    elif callback_data == "admin_payment_tracking":
-        print(f"🔍 [Admin Debug] Routing to payment tracking handler")
-        return await admin_payment_tracking_callback(callback)
-    elif callback_data == "admin_revenue_analytics":
-        print(f"🔍 [Admin Debug] Routing to revenue analytics handler")
-        return await admin_revenue_analytics_callback(callback)
-    elif callback_data == "admin_bot_stats":
-        print(f"🔍 [Admin Debug] Routing to bot stats handler")
-        return await admin_bot_stats_callback(callback)
-    elif callback_data == "admin_broadcast":
-        print(f"🔍 [Admin Debug] Routing to broadcast handler")
-        return await admin_broadcast_callback(callback)
-    elif callback_data.startswith("admin_broadcast_confirm:"):
-        print(f"🔍 [Admin Debug] Routing to broadcast confirm handler")
-        return await admin_broadcast_confirm_callback(callback)
-    elif callback_data == "admin_database_management":
-        print(f"🔍 [Admin Debug] Routing to database management handler")
-        try:
-            return await admin_database_management_callback(callback)
-        except Exception as e:
-            print(f"❌ [Admin Debug] Error in database management handler: {e}")
-            await callback.answer(f"Error: {str(e)}", show_alert=True)
-    elif callback_data == "admin_logs_monitoring":
-        print(f"🔍 [Admin Debug] Routing to logs monitoring handler")
-        try:
-            return await admin_logs_monitoring_callback(callback)
-        except Exception as e:
-            print(f"❌ [Admin Debug] Error in logs monitoring handler: {e}")
-            await callback.answer(f"Error: {str(e)}", show_alert=True)
-    elif callback_data == "admin_maintenance_mode":
-        print(f"🔍 [Admin Debug] Routing to maintenance mode handler")
+
+    # Gate before dispatch: non-admin traffic costs one frozenset lookup
+    # instead of a table walk plus a per-handler check
+    if user_id not in config.ADMIN_USER_IDS:
+        await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
+        return
+
+    logger.debug("[Admin Debug] Callback received: %r from user %s", callback_data, user_id)
+
+    # O(1) exact match first; parameterized callbacks are indexed by their
+    # second underscore token ("admin_reset_user_5" -> "reset"), so only the
+    # one or two matchers sharing that token are tried
+    handler = ADMIN_EXACT_DISPATCH.get(callback_data)
+    if handler is None:
+        token = callback_data.split("_", 2)[1] if "_" in callback_data else ""
+        for matches, prefix_handler in ADMIN_PREFIX_DISPATCH.get(token, ()):
+            if matches(callback_data):
+                handler = prefix_handler
+                break
+
+    if handler is None:
+        logger.warning("[Admin Debug] Unknown admin callback: %s", callback_data)
+        await callback.answer("Unknown admin command", show_alert=True)
+        return
+
+    # Hand off to a task so the poll loop advances immediately: one admin's
+    # slow handler no longer head-of-line blocks other admins. The per-admin
+    # lock keeps each admin's own callbacks in click order.
+    asyncio.create_task(_run_admin_handler(handler, callback))
+
+
+# admin user_id -> asyncio.Lock; entries are few (one per admin) and live for
+# the process, so no eviction is needed
+_admin_dispatch_locks = {}
+
+
+async def _run_admin_handler(handler, callback: types.CallbackQuery):
+    """Run one dispatched admin handler under its admin's ordering lock"""
+    lock = _admin_dispatch_locks.setdefault(callback.from_user.id, asyncio.Lock())
+    async with lock:
         try:
-            return await admin_maintenance_mode_callback(callback)
+            await handler(callback)
         except Exception as e:
-            print(f"❌ [Admin Debug] Error in maintenance mode handler: {e}")
-            await callback.answer(f"Error: {str(e)}", show_alert=True)
-    elif callback_data == "admin_toggle_maintenance":
-        print(f"🔍 [Admin Debug] Routing to toggle maintenance handler")
-        return await admin_toggle_maintenance_callback(callback)
-    elif callback_data == "admin_db_backup":
-        print(f"🔍 [Admin Debug] Routing to database backup handler")
-        return await admin_db_backup_callback(callback)
-    elif callback_data == "admin_db_optimize":
-        print(f"🔍 [Admin Debug] Routing to database optimize handler")
-        return await admin_db_optimize_callback(callback)
-    elif callback_data == "admin_db_cleanup":
-        print(f"🔍 [Admin Debug] Routing to database cleanup handler")
-        return await admin_db_cleanup_callback(callback)
-    elif callback_data == "admin_daily_reports":
-        print(f"🔍 [Admin Debug] Routing to daily reports handler")
-        return await admin_daily_reports_callback(callback)
-    elif callback_data == "admin_weekly_reports":
-        print(f"🔍 [Admin Debug] Routing to weekly reports handler")
-        return await admin_weekly_reports_callback(callback)
-    elif callback_data == "admin_monthly_reports":
-        print(f"🔍 [Admin Debug] Routing to monthly reports handler")
-        return await admin_weekly_reports_callback(callback)  # Use weekly reports for now
-    elif callback_data == "admin_popular_packages":
-        print(f"🔍 [Admin Debug] Routing to popular packages handler")
-        return await admin_popular_packages_callback(callback)
-    elif callback_data == "admin_user_retention":
-        print(f"🔍 [Admin Debug] Routing to user retention handler")
-        return await admin_user_retention_callback(callback)
-    elif callback_data == "admin_export_data":
-        print(f"🔍 [Admin Debug] Routing to export data handler")
-        return await admin_export_data_callback(callback)
-    elif callback_data == "admin_nft_distribution":
-        print(f"🔍 [Admin Debug] Routing to NFT distribution handler")
-        return await admin_nft_distribution_callback(callback)
-    elif callback_data == "admin_hit_rate_analytics":
-        print(f"🔍 [Admin Debug] Routing to hit rate analytics handler")
-        return await admin_hit_rate_analytics_callback(callback)
-    elif callback_data == "admin_nft_analytics":
-        print(f"🔍 [Admin Debug] Routing to NFT analytics handler")
-        return await admin_nft_analytics_callback(callback)
-    elif callback_data == "admin_package_pricing":
-        print(f"🔍 [Admin Debug] Routing to package pricing handler")
-        return await admin_package_pricing_callback(callback)
-    elif callback_data == "admin_pricing_analytics":
-        print(f"🔍 [Admin Debug] Routing to pricing analytics handler")
-        return await admin_pricing_analytics_callback(callback)
-    elif callback_data == "admin_pending_payments":
-        print(f"🔍 [Admin Debug] Routing to pending payments handler")
-        return await admin_pending_payments_callback(callback)
-    elif callback_data == "admin_transaction_history":
-        print(f"🔍 [Admin Debug] Routing to transaction history handler")
-        return await admin_transaction_history_callback(callback)
-    elif callback_data == "admin_advanced_revenue_analytics":
-        print(f"🔍 [Admin Debug] Routing to advanced revenue analytics handler")
-        return await admin_advanced_revenue_analytics_callback(callback)
-    elif callback_data == "admin_clean_expired_payments":
-        print(f"🔍 [Admin Debug] Routing to clean expired payments handler")
-        return await admin_clean_expired_payments_callback(callback)
-    elif callback_data == "admin_db_stats":
-        print(f"🔍 [Admin Debug] Routing to database stats handler")
-        return await admin_db_stats_callback(callback)
-    elif callback_data == "admin_db_integrity":
-        print(f"🔍 [Admin Debug] Routing to database integrity handler")
-        return await admin_db_integrity_callback(callback)
-    elif callback_data == "admin_db_export":
-        print(f"🔍 [Admin Debug] Routing to database export handler")
-        return await admin_export_data_callback(callback)
-    elif callback_data == "admin_view_logs":
-        print(f"🔍 [Admin Debug] Routing to view logs handler")
-        return await admin_view_logs_callback(callback)
-    elif callback_data == "admin_influencer_management":
-        print(f"🔍 [Admin Debug] Routing to influencer management handler")
-        return await admin_influencer_management_callback(callback)
-    elif callback_data == "admin_view_all_commissions":
-        print(f"🔍 [Admin Debug] Routing to view all commissions handler")
-        return await admin_view_all_commissions_callback(callback)
-    elif callback_data == "admin_top_earners":
-        print(f"🔍 [Admin Debug] Routing to top earners handler")
-        return await admin_top_earners_callback(callback)
-    elif callback_data == "admin_commission_analytics":
-        print(f"🔍 [Admin Debug] Routing to commission analytics handler")
-        return await admin_commission_analytics_callback(callback)
-    elif callback_data == "admin_export_influencer_data":
-        print(f"🔍 [Admin Debug] Routing to export influencer data handler")
-        return await admin_export_influencer_data_callback(callback)
-    elif callback_data == "admin_system_metrics":
-        print(f"🔍 [Admin Debug] Routing to system metrics handler")
-        return await admin_system_metrics_callback(callback)
-    elif callback_data == "admin_health_check":
-        print(f"🔍 [Admin Debug] Routing to health check handler")
-        return await admin_health_check_callback(callback)
-    elif callback_data == "admin_view_alerts":
-        print(f"🔍 [Admin Debug] Routing to view alerts handler")
-        return await admin_view_alerts_callback(callback)
-    elif callback_data == "admin_alert_settings":
-        print(f"🔍 [Admin Debug] Routing to alert settings handler")
-        return await admin_alert_settings_callback(callback)
-    elif callback_data == "admin_reset_metrics":
-        print(f"🔍 [Admin Debug] Routing to reset metrics handler")
-        return await admin_reset_metrics_callback(callback)
-    elif callback_data == "admin_set_maintenance_message":
-        print(f"🔍 [Admin Debug] Routing to set maintenance message handler")
-        return await admin_set_maintenance_message_callback(callback)
-    elif callback_data == "admin_schedule_maintenance":
-        print(f"🔍 [Admin Debug] Routing to schedule maintenance handler")
-        return await admin_schedule_maintenance_callback(callback)
-    elif callback_data in ["admin_schedule_30min", "admin_schedule_1hour", "admin_schedule_2hours", "admin_schedule_custom"]:
-        print(f"🔍 [Admin Debug] Routing to schedule maintenance time handler: {callback_data}")
-        return await admin_schedule_time_callback(callback, callback_data)
-    elif callback_data == "admin_edit_prices":
-        print(f"🔍 [Admin Debug] Routing to edit prices handler")
-        return await admin_edit_prices_callback(callback)
-    elif callback_data in ["admin_edit_bronze_price", "admin_edit_silver_price", "admin_edit_gold_price", "admin_edit_black_price"]:
-        print(f"🔍 [Admin Debug] Routing to individual package price handler: {callback_data}")
-        return await admin_edit_individual_price_callback(callback, callback_data)
-    elif callback_data == "admin_bulk_edit_prices":
-        print(f"🔍 [Admin Debug] Routing to bulk edit prices handler")
-        return await admin_bulk_edit_prices_callback(callback)
-    elif callback_data == "admin_price_history":
-        print(f"🔍 [Admin Debug] Routing to price history handler")
-        return await admin_price_history_callback(callback)
-    elif callback_data == "admin_revenue_projections":
-        print(f"🔍 [Admin Debug] Routing to revenue projections handler")
-        return await admin_revenue_projections_callback(callback)
-    elif callback_data == "admin_price_optimization":
-        print(f"🔍 [Admin Debug] Routing to price optimization handler")
-        return await admin_price_optimization_callback(callback)
-    elif callback_data == "admin_pricing_analytics":
-        print(f"🔍 [Admin Debug] Routing to pricing analytics handler")
-        return await admin_pricing_analytics_callback(callback)
-    elif callback_data.startswith("admin_price_") and any(x in callback_data for x in ["_+10", "_-10", "_+25", "_-25", "_+50", "_-50"]):
-        print(f"🔍 [Admin Debug] Routing to price adjustment handler: {callback_data}")
-        return await admin_price_adjustment_callback(callback, callback_data)
-    elif callback_data.startswith("admin_custom_ton_") or callback_data.startswith("admin_custom_stars_"):
-        print(f"🔍 [Admin Debug] Routing to custom price handler: {callback_data}")
-        return await admin_custom_price_callback(callback, callback_data)
-    elif callback_data.startswith("admin_market_price_") or callback_data == "admin_market_adjust":
-        print(f"🔍 [Admin Debug] Routing to market price handler: {callback_data}")
-        return await admin_market_price_callback(callback, callback_data)
-    elif callback_data.startswith("admin_reset_price_"):
-        print(f"🔍 [Admin Debug] Routing to reset price handler: {callback_data}")
-        return await admin_reset_price_callback(callback, callback_data)
-    elif callback_data.startswith("admin_bulk_") and any(x in callback_data for x in ["_+10", "_-10", "_+25", "_-25", "_+50", "_-50"]):
-        print(f"🔍 [Admin Debug] Routing to bulk price adjustment handler: {callback_data}")
-        return await admin_bulk_price_adjustment_callback(callback, callback_data)
-    elif callback_data == "admin_competitive_pricing":
-        print(f"🔍 [Admin Debug] Routing to competitive pricing handler")
-        return await admin_competitive_pricing_callback(callback)
-    elif callback_data == "admin_ab_testing":
-        print(f"🔍 [Admin Debug] Routing to A/B testing handler")
-        return await admin_ab_testing_callback(callback)
-    elif callback_data in ["admin_export_price_history", "admin_export_revenue_report", "admin_export_analytics"]:
-        print(f"🔍 [Admin Debug] Routing to export handler: {callback_data}")
-        return await admin_export_pricing_data_callback(callback, callback_data)
-    elif callback_data == "admin_optimization_report":
-        print(f"🔍 [Admin Debug] Routing to optimization report handler")
-        return await admin_optimization_report_callback(callback)
-    elif callback_data == "admin_daily_reports":
-        print(f"🔍 [Admin Debug] Routing to daily reports handler")
-        return await admin_daily_reports_callback(callback)
-    elif callback_data == "admin_weekly_reports":
-        print(f"🔍 [Admin Debug] Routing to weekly reports handler")
-        return await admin_weekly_reports_callback(callback)
-    elif callback_data == "admin_monthly_reports":
-        print(f"🔍 [Admin Debug] Routing to monthly reports handler")
-        return await admin_monthly_reports_callback(callback)
-    elif callback_data == "admin_popular_packages":
-        print(f"🔍 [Admin Debug] Routing to popular packages handler")
-        return await admin_popular_packages_callback(callback)
-    elif callback_data == "admin_user_retention":
-        print(f"🔍 [Admin Debug] Routing to user retention handler")
-        return await admin_user_retention_callback(callback)
-    elif callback_data == "admin_export_data":
-        print(f"🔍 [Admin Debug] Routing to export data handler")
-        return await admin_export_data_callback(callback)
-    elif callback_data == "admin_export_monthly_data":
-        print(f"🔍 [Admin Debug] Routing to export monthly data handler")
-        return await admin_export_monthly_data_callback(callback)
-    elif callback_data == "admin_monthly_trends":
-        print(f"🔍 [Admin Debug] Routing to monthly trends handler")
-        return await admin_monthly_trends_callback(callback)
-    elif callback_data in ["admin_export_monthly_csv", "admin_export_monthly_json", "admin_export_monthly_pdf", "admin_export_monthly_excel"]:
-        print(f"🔍 [Admin Debug] Routing to export format handler: {callback_data}")
-        return await admin_export_format_callback(callback, callback_data)
-    elif callback_data in ["admin_detailed_trends", "admin_trends_forecast"]:
-        print(f"🔍 [Admin Debug] Routing to trend analysis handler: {callback_data}")
-        return await admin_trend_analysis_callback(callback, callback_data)
-    else:
-        print(f"⚠️ [Admin Debug] Unknown admin callback: {callback_data}")
-        await callback.answer("Unknown admin command", show_alert=True)
+            logger.error("[Admin Debug] Error in admin handler for %s: %s", callback.data, e)
+            try:
+                await callback.answer(f"Error: {str(e)}", show_alert=True)
+            except Exception:
+                pass  # answer can itself fail once the query expires
 
 
-# Admin Panel Callback Handler
-async def admin_panel_callback(callback: types.CallbackQuery):
-    """Handle admin panel access"""
-    user_id = callback.from_user.id
-    
-    print(f"🔧 [Admin] Admin panel callback triggered for user {user_id}")
-    
-    # Check if user is admin
-    if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
-        await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
-        return
-    
-    print(f"✅ [Admin] Admin access granted for user {user_id}")
-    
-    # Import admin translations
-    from translations import get_admin_text
-    
-    # Create admin panel menu
-    admin_text = f"{get_admin_text(user_id, 'admin_panel_title')}\n\n{get_admin_text(user_id, 'admin_welcome')}"
-    
+def _admin_label(lang: str, key: str) -> str:
+    """ADMIN_TRANSLATIONS lookup by resolved language (get_admin_text without
+    the per-user language resolution)"""
+    return translations.ADMIN_TRANSLATIONS.get(lang, {}).get(key, translations.ADMIN_TRANSLATIONS["en"].get(key, key))
+
+
+# The admin panel and user-management menus depend only on the viewer's
+# language, so build each (text, keyboard) pair once per language and reuse
+# it. Call .cache_clear() on these if translations are ever hot-reloaded.
+@functools.lru_cache(maxsize=32)
+def _build_admin_panel_view(lang: str):
+    """Prebuilt (text, keyboard) for the admin panel menu"""
+    admin_text = f"{_admin_label(lang, 'admin_panel_title')}\n\n{_admin_label(lang, 'admin_welcome')}"
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text=get_admin_text(user_id, "user_management"), callback_data="admin_user_management"),
+            InlineKeyboardButton(text=_admin_label(lang, "user_management"), callback_data="admin_user_management"),
         ],
         [
-            InlineKeyboardButton(text=get_admin_text(user_id, "financial_management"), callback_data="admin_financial_management"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "system_management"), callback_data="admin_system_management")
+            InlineKeyboardButton(text=_admin_label(lang, "financial_management"), callback_data="admin_financial_management"),
+            InlineKeyboardButton(text=_admin_label(lang, "system_management"), callback_data="admin_system_management")
         ],
         [
             InlineKeyboardButton(text="🌟 Influencer Management", callback_data="admin_influencer_management"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "content_management"), callback_data="admin_content_management")
+            InlineKeyboardButton(text=_admin_label(lang, "content_management"), callback_data="admin_content_management")
         ],
         [
-            InlineKeyboardButton(text=get_admin_text(user_id, "analytics_reports"), callback_data="admin_analytics_reports")
+            InlineKeyboardButton(text=_admin_label(lang, "analytics_reports"), callback_data="admin_analytics_reports")
         ],
         [
-            InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="back_to_main")
+            InlineKeyboardButton(text=_admin_label(lang, "back_to_main"), callback_data="back_to_main")
         ]
     ])
-    
+    return admin_text, keyboard
+
+
+@functools.lru_cache(maxsize=32)
+def _build_user_management_view(lang: str):
+    """Prebuilt (text, keyboard) for the user-management menu"""
+    admin_text = f"{_admin_label(lang, 'user_management_title')}\n\n{_admin_label(lang, 'admin_welcome')}"
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=_admin_label(lang, "view_all_users"), callback_data="admin_view_users"),
+            InlineKeyboardButton(text=_admin_label(lang, "user_details"), callback_data="admin_user_details")
+        ],
+        [
+            InlineKeyboardButton(text=_admin_label(lang, "reset_user_data"), callback_data="admin_reset_user"),
+            InlineKeyboardButton(text=_admin_label(lang, "ban_unban_users"), callback_data="admin_ban_user")
+        ],
+        [
+            InlineKeyboardButton(text="📦 Give Package", callback_data="admin_give_package")
+        ],
+        [
+            InlineKeyboardButton(text=_admin_label(lang, "back_to_main"), callback_data="admin_panel")
+        ]
+    ])
+    return admin_text, keyboard
+
+
+# Admin Panel Callback Handler
+async def admin_panel_callback(callback: types.CallbackQuery):
+    """Handle admin panel access"""
+    user_id = callback.from_user.id
+
+    logger.debug("[Admin] Admin panel callback triggered for user %s", user_id)
+
+    # Check if user is admin
+    if not is_admin(user_id):
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
+        await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
+        return
+
+    logger.debug("[Admin] Admin access granted for user %s", user_id)
+
+
+    # Reuse the per-language prebuilt menu
+    admin_text, keyboard = _build_admin_panel_view(translations.get_user_language(user_id))
+
     # Send new message instead of editing (since original was a video)
     await callback.message.answer(admin_text, reply_markup=keyboard, parse_mode="HTML")
     await callback.answer()
@@ -3402,46 +3524,20 @@ async def admin_user_management_callback(callback: types.CallbackQuery):
     """Handle admin user management menu"""
     user_id = callback.from_user.id
     
-    print(f"🔧 [Admin] User management callback triggered for user {user_id}")
+    logger.debug("[Admin] User management callback triggered for user %s", user_id)
     
     if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    print(f"✅ [Admin] User management access granted for user {user_id}")
-    
-    from translations import get_admin_text
-    
-    admin_text = f"{get_admin_text(user_id, 'user_management_title')}\n\n{get_admin_text(user_id, 'admin_welcome')}"
-    
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "view_all_users"), callback_data="admin_view_users"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "user_details"), callback_data="admin_user_details")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "reset_user_data"), callback_data="admin_reset_user"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "ban_unban_users"), callback_data="admin_ban_user")
-        ],
-        [
-            InlineKeyboardButton(text="📦 Give Package", callback_data="admin_give_package")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_panel")
-        ]
-    ])
-    
-    try:
-        await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
-    except Exception as e:
-        # If message is not modified, just answer the callback
-        if "message is not modified" in str(e):
-            await callback.answer()
-            return
-        else:
-            print(f"Error editing message: {e}")
+    logger.debug("[Admin] User management access granted for user %s", user_id)
+
+
+    # Reuse the per-language prebuilt menu
+    admin_text, keyboard = _build_user_management_view(translations.get_user_language(user_id))
+
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -3451,58 +3547,139 @@ async def admin_user_details_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
-    from src.models import get_all_users
-    
-    # Get all users for selection
-    all_users = get_all_users()
-    
-    if not all_users:
+
+    # Page offset comes from admin_user_details_page_<offset>; the plain
+    # admin_user_details entry point starts at the first page.
+    offset = 0
+    if callback.data.startswith("admin_user_details_page_"):
+        offset = int(callback.data.rsplit("_", 1)[-1])
+
+    page_size = 10
+    # Fetch one page instead of materializing the whole users table
+    user_list = await asyncio.to_thread(get_users_page, offset, page_size)
+    total_users = await asyncio.to_thread(count_users)
+
+    if not user_list:
         details_text = "👥 <b>User Details</b>\n\n❌ No users found in the system."
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_management")]
         ])
     else:
-        details_text = f"👥 <b>User Details</b>\n\n📊 <b>Total Users:</b> {len(all_users)}\n\n"
+        details_text = f"👥 <b>User Details</b>\n\n📊 <b>Total Users:</b> {total_users}\n\n"
         details_text += "🔍 <b>Select a user to view details:</b>\n\n"
-        
-        # Create keyboard with user selection (show first 10 users)
+
         keyboard_buttons = []
-        user_list = list(all_users.items())[:10]  # Limit to first 10 users
-        
-        for i, (user_id_key, user_data) in enumerate(user_list):
+        for i, (user_id_key, username, package) in enumerate(user_list):
             if i % 2 == 0:
                 keyboard_buttons.append([])
-            
-            username = user_data.get('username', 'Unknown')
-            package = user_data.get('package', 'None')
-            
+
+            username = username or 'Unknown'
+            package = package or 'None'
+
             button_text = f"👤 {username[:8]} ({package.title()})"
             if len(button_text) > 20:
                 button_text = f"👤 {username[:6]}... ({package.title()})"
-            
+
             keyboard_buttons[-1].append(
                 InlineKeyboardButton(
-                    text=button_text, 
+                    text=button_text,
                     callback_data=f"admin_user_detail_{user_id_key}"
                 )
             )
-        
+
+        # Prev/next page buttons
+        nav_buttons = []
+        if offset > 0:
+            nav_buttons.append(InlineKeyboardButton(
+                text="⬅ Prev", callback_data=f"admin_user_details_page_{max(0, offset - page_size)}"
+            ))
+        if offset + page_size < total_users:
+            nav_buttons.append(InlineKeyboardButton(
+                text="➡ Next", callback_data=f"admin_user_details_page_{offset + page_size}"
+            ))
+        if nav_buttons:
+            keyboard_buttons.append(nav_buttons)
+
         # Add back button
         keyboard_buttons.append([
             InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_management")
         ])
-        
+
         keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_buttons)
     
-    await callback.message.edit_text(details_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, details_text, reply_markup=keyboard)
     await callback.answer()
 
 
+# Static layouts for the admin user views, compiled once at module load and
+# rendered with a single format_map per message
+USER_DETAIL_TEMPLATE = """👤 <b>User Details</b>
+
+🆔 <b>User ID:</b> {user_id}
+👤 <b>Username:</b> @{username}
+📦 <b>Package:</b> {package}
+🎰 <b>Total Spins:</b> {total_spins:,}
+💎 <b>Total Hits:</b> {hits:,}
+🎁 <b>NFTs Won:</b> {nft_count}
+🔄 <b>Spins Available:</b> {spins_available}
+⭐ <b>Points:</b> {points}
+🏆 <b>Level:</b> {level}
+💰 <b>Total Spent:</b> {total_spent:.4f} TON
+📅 <b>Joined:</b> {created_at}
+🕒 <b>Last Active:</b> {updated_at}
+"""
+
+USER_STATS_TEMPLATE = """📊 <b>User Statistics</b>
+
+👤 <b>User:</b> @{username} (ID: {user_id})
+📦 <b>Package:</b> {package}
+🎰 <b>Total Spins:</b> {total_spins:,}
+💎 <b>Total Hits:</b> {total_hits:,}
+🎁 <b>NFTs Won:</b> {nft_count}
+⭐ <b>Points:</b> {points}
+🔄 <b>Spins Available:</b> {spins_available}
+👥 <b>Referrals:</b> {referrals}
+🚫 <b>Status:</b> {status}
+🎯 <b>Hit Rate:</b> {hit_rate:.1f}%
+"""
+
+RESET_CONFIRM_TEMPLATE = """🔄 <b>Reset User Data</b>
+
+👤 <b>User:</b> @{username} (ID: {user_id})
+
+⚠️ <b>This will reset:</b>
+   🎰 Total Spins: {total_spins:,} → 0
+   💎 Total Hits: {hits:,} → 0
+   🎁 NFTs Won: {nft_count} → 0
+   ⭐ Points: {points} → 0
+   🏆 Level: {level} → Spinner
+   💰 Total Spent: {total_spent:.4f} TON → 0
+
+✅ <b>This will keep:</b>
+   📦 Current Package: {package}
+   🔄 Spins Available: {spins_available}
+   🎯 Referral Info: {referrals} referrals
+
+⚠️ <b>Are you sure you want to reset this user's data?</b>"""
+
+BAN_CONFIRM_TEMPLATE = """🚫 <b>Ban User</b>
+
+👤 <b>User:</b> @{username} (ID: {user_id})
+📦 <b>Package:</b> {package}
+🎰 <b>Total Spins:</b> {total_spins:,}
+🔄 <b>Spins Available:</b> {spins_available}
+
+⚠️ <b>Banning this user will:</b>
+   🚫 Prevent them from using the bot
+   🚫 Block all bot interactions
+   🚫 Preserve their data (can be unbanned later)
+
+⚠️ <b>Are you sure you want to ban this user?</b>"""
+
+
 # Admin Individual User Detail Callback
 # Removed duplicate decorator - handled by universal admin debug handler
 async def admin_individual_user_detail_callback(callback: types.CallbackQuery):
@@ -3510,56 +3687,65 @@ async def admin_individual_user_detail_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
     
     # Extract user ID from callback data
-    target_user_id = int(callback.data.split("_")[-1])
-    
+    target_user_id = int(callback.data.rsplit("_", 1)[-1])
+
+    # This view doubles as the Cancel target of the confirm dialogs, so drop
+    # any stale snapshot stashed for this admin
+    _admin_pending_actions.pop(user_id, None)
+
     # Get user data
     user_data = get_user_data_from_db(target_user_id)
-    
+
     if not user_data:
         detail_text = f"❌ <b>User Not Found</b>\n\nUser ID: {target_user_id}\n\nThis user does not exist in the system."
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_details")]
         ])
     else:
-        # Create detailed user information
-        detail_text = f"👤 <b>User Details</b>\n\n"
-        detail_text += f"🆔 <b>User ID:</b> {target_user_id}\n"
-        detail_text += f"👤 <b>Username:</b> @{user_data.get('username', 'Unknown')}\n"
-        detail_text += f"📦 <b>Package:</b> {user_data.get('package', 'None').title()}\n"
-        detail_text += f"🎰 <b>Total Spins:</b> {user_data.get('total_spins', 0):,}\n"
-        detail_text += f"💎 <b>Total Hits:</b> {user_data.get('hits', 0):,}\n"
-        detail_text += f"🎁 <b>NFTs Won:</b> {len(user_data.get('nfts', []))}\n"
-        detail_text += f"🔄 <b>Spins Available:</b> {user_data.get('spins_available', 0)}\n"
-        detail_text += f"⭐ <b>Points:</b> {user_data.get('points', 0)}\n"
-        detail_text += f"🏆 <b>Level:</b> {user_data.get('level', 'Spinner')}\n"
-        detail_text += f"💰 <b>Total Spent:</b> {user_data.get('total_spent', 0):.4f} TON\n"
-        detail_text += f"📅 <b>Joined:</b> {user_data.get('created_at', 'Unknown')}\n"
-        detail_text += f"🕒 <b>Last Active:</b> {user_data.get('updated_at', 'Unknown')}\n"
-        
+        # One lookup for the count and the listing below
+        nfts = user_data.get('nfts') or []
+        nft_count = len(nfts)
+
+        # Create detailed user information (single format_map render for the
+        # static layout; conditional tails appended below and joined once)
+        parts = [USER_DETAIL_TEMPLATE.format_map({
+            'user_id': target_user_id,
+            'username': user_data.get('username', 'Unknown'),
+            'package': user_data.get('package', 'None').title(),
+            'total_spins': user_data.get('total_spins', 0),
+            'hits': user_data.get('hits', 0),
+            'nft_count': nft_count,
+            'spins_available': user_data.get('spins_available', 0),
+            'points': user_data.get('points', 0),
+            'level': user_data.get('level', 'Spinner'),
+            'total_spent': user_data.get('total_spent', 0),
+            'created_at': user_data.get('created_at', 'Unknown'),
+            'updated_at': user_data.get('updated_at', 'Unknown'),
+        })]
+
         # Show NFTs if any
-        nfts = user_data.get('nfts', [])
         if nfts:
-            detail_text += f"\n🎁 <b>NFTs Won:</b>\n"
+            parts.append(f"\n🎁 <b>NFTs Won:</b>\n")
             for nft in nfts[:5]:  # Show first 5 NFTs
-                detail_text += f"   • {nft}\n"
-            if len(nfts) > 5:
-                detail_text += f"   ... and {len(nfts) - 5} more\n"
-        
+                parts.append(f"   • {nft}\n")
+            if nft_count > 5:
+                parts.append(f"   ... and {nft_count - 5} more\n")
+
         # Show referral info
         referrer_id = user_data.get('referrer_id')
         if referrer_id:
-            detail_text += f"\n🎯 <b>Referred by:</b> User {referrer_id}\n"
-        
+            parts.append(f"\n🎯 <b>Referred by:</b> User {referrer_id}\n")
+
         referrals = user_data.get('referrals', 0)
         if referrals > 0:
-            detail_text += f"🎯 <b>Referrals made:</b> {referrals}\n"
+            parts.append(f"🎯 <b>Referrals made:</b> {referrals}\n")
+
+        detail_text = "".join(parts)
         
         # Create action buttons
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -3575,29 +3761,54 @@ async def admin_individual_user_detail_callback(callback: types.CallbackQuery):
             ]
         ])
     
-    await callback.message.edit_text(detail_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, detail_text, reply_markup=keyboard)
     await callback.answer()
 
 
 # Admin User Stats Callback
+
+# Short-lived per-admin snapshot of the user row shown in a confirm dialog.
+# The selection handler already fetched the row to render the dialog, so the
+# confirm handler can reuse it instead of issuing the same query again. The
+# TTL covers how long an admin realistically leaves a confirm dialog open.
+_ADMIN_ACTION_TTL = 120  # seconds
+_admin_pending_actions = {}
+
+
+def _stash_admin_action(admin_id: int, target_user_id: int, snapshot: dict) -> None:
+    """Remember the user row backing the confirm dialog just shown"""
+    _admin_pending_actions[admin_id] = {
+        "target": target_user_id,
+        "snapshot": snapshot,
+        "ts": time.monotonic(),
+    }
+
+
+def _take_admin_action(admin_id: int, target_user_id: int):
+    """Pop the stashed row if it matches the target and hasn't expired"""
+    entry = _admin_pending_actions.pop(admin_id, None)
+    if (entry and entry["target"] == target_user_id
+            and time.monotonic() - entry["ts"] < _ADMIN_ACTION_TTL):
+        return entry["snapshot"]
+    return None
+
+
 async def admin_user_stats_callback(callback: types.CallbackQuery):
     """Handle user stats view"""
     user_id = callback.from_user.id
     
-    print(f"🔧 [Admin] User stats callback triggered for user {user_id}, data: {callback.data}")
+    logger.debug("[Admin] User stats callback triggered for user %s, data: %s", user_id, callback.data)
     
     if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    print(f"✅ [Admin] User stats access granted for user {user_id}")
+    logger.debug("[Admin] User stats access granted for user %s", user_id)
     
-    from translations import get_admin_text
     
     # Extract user ID from callback data
-    target_user_id = int(callback.data.split("_")[-1])
+    target_user_id = int(callback.data.rsplit("_", 1)[-1])
     
     # Get user data
     user_data = get_user_data_from_db(target_user_id)
@@ -3608,50 +3819,75 @@ async def admin_user_stats_callback(callback: types.CallbackQuery):
             [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_details")]
         ])
     else:
-        # Create detailed stats
-        stats_text = f"📊 <b>User Statistics</b>\n\n"
-        stats_text += f"👤 <b>User:</b> @{user_data.get('username', 'Unknown')} (ID: {target_user_id})\n"
-        stats_text += f"📦 <b>Package:</b> {user_data.get('package', 'None').title()}\n"
-        stats_text += f"🎰 <b>Total Spins:</b> {user_data.get('total_spins', 0):,}\n"
-        stats_text += f"💎 <b>Total Hits:</b> {user_data.get('hits', 0):,}\n"
-        stats_text += f"🎁 <b>NFTs Won:</b> {len(user_data.get('nfts', []))}\n"
-        stats_text += f"⭐ <b>Points:</b> {user_data.get('points', 0)}\n"
-        stats_text += f"🔄 <b>Spins Available:</b> {user_data.get('spins_available', 0)}\n"
-        stats_text += f"👥 <b>Referrals:</b> {user_data.get('referrals', 0)}\n"
-        stats_text += f"🚫 <b>Status:</b> {'Banned' if user_data.get('banned', False) else 'Active'}\n"
-        
         # Calculate hit rate
         total_spins = user_data.get('total_spins', 0)
         total_hits = user_data.get('hits', 0)
-        hit_rate = (total_hits / total_spins * 100) if total_spins > 0 else 0
-        
-        stats_text += f"🎯 <b>Hit Rate:</b> {hit_rate:.1f}%\n"
+        hit_rate = 100.0 * total_hits / total_spins if total_spins else 0.0
+
+        # Create detailed stats (single format_map render of the static layout)
+        stats_text = USER_STATS_TEMPLATE.format_map({
+            'username': user_data.get('username', 'Unknown'),
+            'user_id': target_user_id,
+            'package': user_data.get('package', 'None').title(),
+            'total_spins': total_spins,
+            'total_hits': total_hits,
+            'nft_count': len(user_data.get('nfts') or ()),
+            'points': user_data.get('points', 0),
+            'spins_available': user_data.get('spins_available', 0),
+            'referrals': user_data.get('referrals', 0),
+            'status': 'Banned' if user_data.get('banned', False) else 'Active',
+            'hit_rate': hit_rate,
+        })
         
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_details")]
         ])
     
-    await callback.message.edit_text(stats_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, stats_text, reply_markup=keyboard)
     await callback.answer()
 
 
+def _load_recent_users(limit: int = 20, with_package: bool = False):
+    """Fetch the newest users for the admin selection menus
+
+    Synchronous on purpose: callers run it via asyncio.to_thread so the
+    sqlite read never blocks the event loop. The two fixed SQL literals
+    keep the pooled connection's statement cache effective.
+    """
+    key = (limit, with_package)
+    cached = _recent_users_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _RECENT_USERS_TTL:
+        return cached[1]
+    if with_package:
+        sql = "SELECT user_id, username, package, spins_available FROM users ORDER BY user_id DESC LIMIT ?"
+    else:
+        sql = "SELECT user_id, username, spins_available FROM users ORDER BY user_id DESC LIMIT ?"
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, (limit,))
+        rows = cursor.fetchall()
+    _recent_users_cache[key] = (time.monotonic(), rows)
+    return rows
+
+
 # Admin Reset User Data Callback
 async def admin_reset_user_data_callback(callback: types.CallbackQuery):
     """Handle reset user data functionality"""
     user_id = callback.from_user.id
     
-    print(f"🔧 [Admin] Reset user data callback triggered for user {user_id}, data: {callback.data}")
+    logger.debug("[Admin] Reset user data callback triggered for user %s, data: %s", user_id, callback.data)
     
     if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    print(f"✅ [Admin] Reset user data access granted for user {user_id}")
-    
-    from translations import get_admin_text
-    
+    logger.debug("[Admin] Reset user data access granted for user %s", user_id)
+
+    # Ack first: stop Telegram's spinner before the DB work below runs
+    await callback.answer()
+
+
     # Handle case where callback data is just "admin_reset_user" (menu button)
     if callback.data == "admin_reset_user":
         # Show user selection menu
@@ -3661,12 +3897,8 @@ async def admin_reset_user_data_callback(callback: types.CallbackQuery):
         
         # Get all users from database
         try:
-            conn = sqlite3.connect('cgspins.db')
-            cursor = conn.cursor()
-            cursor.execute("SELECT user_id, username, spins_available FROM users ORDER BY user_id DESC LIMIT 20")
-            users = cursor.fetchall()
-            conn.close()
-            
+            users = await asyncio.to_thread(_load_recent_users)
+
             if not users:
                 keyboard = InlineKeyboardMarkup(inline_keyboard=[
                     [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_management")]
@@ -3696,43 +3928,38 @@ async def admin_reset_user_data_callback(callback: types.CallbackQuery):
             ])
             admin_text = f"❌ <b>Error loading users:</b>\n\n{str(e)}"
         
-        try:
-            await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
-        except Exception as e:
-            if "message is not modified" in str(e):
-                pass
-            else:
-                print(f"Error editing message: {e}")
-        await callback.answer()
+        await safe_edit_message(callback, admin_text, reply_markup=keyboard)
         return
-    
+
     # Extract user ID from callback data
-    target_user_id = int(callback.data.split("_")[-1])
-    
+    target_user_id = int(callback.data.rsplit("_", 1)[-1])
+
     # Get user data to show what will be reset
     user_data = get_user_data_from_db(target_user_id)
-    
+    if user_data:
+        # Let the confirm handler reuse this row instead of re-fetching it
+        _stash_admin_action(user_id, target_user_id, user_data)
+
     if not user_data:
         reset_text = f"❌ <b>User Not Found</b>\n\nUser ID: {target_user_id}\n\nThis user does not exist in the system."
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_details")]
         ])
     else:
-        # Show what will be reset
-        reset_text = f"🔄 <b>Reset User Data</b>\n\n"
-        reset_text += f"👤 <b>User:</b> @{user_data.get('username', 'Unknown')} (ID: {target_user_id})\n\n"
-        reset_text += f"⚠️ <b>This will reset:</b>\n"
-        reset_text += f"   🎰 Total Spins: {user_data.get('total_spins', 0):,} → 0\n"
-        reset_text += f"   💎 Total Hits: {user_data.get('hits', 0):,} → 0\n"
-        reset_text += f"   🎁 NFTs Won: {len(user_data.get('nfts', []))} → 0\n"
-        reset_text += f"   ⭐ Points: {user_data.get('points', 0)} → 0\n"
-        reset_text += f"   🏆 Level: {user_data.get('level', 'Spinner')} → Spinner\n"
-        reset_text += f"   💰 Total Spent: {user_data.get('total_spent', 0):.4f} TON → 0\n\n"
-        reset_text += f"✅ <b>This will keep:</b>\n"
-        reset_text += f"   📦 Current Package: {user_data.get('package', 'None').title()}\n"
-        reset_text += f"   🔄 Spins Available: {user_data.get('spins_available', 0)}\n"
-        reset_text += f"   🎯 Referral Info: {user_data.get('referrals', 0)} referrals\n\n"
-        reset_text += f"⚠️ <b>Are you sure you want to reset this user's data?</b>"
+        # Show what will be reset (single format_map render of the static layout)
+        reset_text = RESET_CONFIRM_TEMPLATE.format_map({
+            'username': user_data.get('username', 'Unknown'),
+            'user_id': target_user_id,
+            'total_spins': user_data.get('total_spins', 0),
+            'hits': user_data.get('hits', 0),
+            'nft_count': len(user_data.get('nfts') or ()),
+            'points': user_data.get('points', 0),
+            'level': user_data.get('level', 'Spinner'),
+            'total_spent': user_data.get('total_spent', 0),
+            'package': user_data.get('package', 'None').title(),
+            'spins_available': user_data.get('spins_available', 0),
+            'referrals': user_data.get('referrals', 0),
+        })
         
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [
@@ -3744,28 +3971,56 @@ async def admin_reset_user_data_callback(callback: types.CallbackQuery):
             ]
         ])
     
-    await callback.message.edit_text(reset_text, reply_markup=keyboard, parse_mode="HTML")
-    await callback.answer()
+    await safe_edit_message(callback, reset_text, reply_markup=keyboard)
 
 
 # Admin Confirm Reset User Data Callback
 # Removed duplicate decorator - handled by universal admin debug handler
+# Single parameterized statement for the reset; fields not listed (username,
+# referrals, referred_by, language, ban status, created_at) keep their values,
+# unlike the old full-row INSERT OR REPLACE rewrite
+_RESET_USER_SQL = (
+    "UPDATE users SET balance = 0, package = 'None', level = 'Spinner', "
+    "spin_points = 0, hits = 0, total_spins = 0, spins_available = 0, "
+    "nfts = '[]', payment_method = '', updated_at = ? WHERE user_id = ?"
+)
+
+
+def _run_reset_user(target_user_id: int, now_iso: str) -> bool:
+    """Apply the reset UPDATE; sync side caches on success"""
+    try:
+        with write_conn() as conn:
+            conn.execute(_RESET_USER_SQL, (now_iso, target_user_id))
+            conn.commit()
+        active_user_ids.discard(target_user_id)
+        spun_user_ids.discard(target_user_id)
+        _recent_users_cache.clear()
+        _invalidate_package_distribution()
+        _mark_stats_dirty()
+        return True
+    except Exception as e:
+        logger.error("[Admin] Error resetting user %s: %s", target_user_id, e)
+        return False
+
+
 async def admin_confirm_reset_user_data_callback(callback: types.CallbackQuery):
     """Handle confirmation of reset user data"""
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
-    
-    from translations import get_admin_text
-    
+
+    # Ack first: stop Telegram's spinner before the DB work below runs
+    await callback.answer()
+
+
     # Extract user ID from callback data
-    target_user_id = int(callback.data.split("_")[-1])
-    
-    # Get user data before reset
-    user_data = get_user_data_from_db(target_user_id)
+    target_user_id = int(callback.data.rsplit("_", 1)[-1])
+
+    # Reuse the row stashed when the confirm dialog was shown; fall back to
+    # the DB if the snapshot expired or belongs to a different target
+    user_data = _take_admin_action(user_id, target_user_id) or get_user_data_from_db(target_user_id)
     
     if not user_data:
         result_text = f"❌ <b>User Not Found</b>\n\nUser ID: {target_user_id}\n\nThis user does not exist in the system."
@@ -3773,41 +4028,31 @@ async def admin_confirm_reset_user_data_callback(callback: types.CallbackQuery):
             [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_details")]
         ])
     else:
-        # Reset user data - keep some important fields
+        # Kept for the result text below
         username = user_data.get('username', '')
         package = user_data.get('package', 'None')
         referrals = user_data.get('referrals', 0)
-        referred_by = user_data.get('referred_by', 0)
-        language = user_data.get('language', 'en')
-        created_at = user_data.get('created_at', '')
         spins_available = user_data.get('spins_available', 0)
-        
-        # Create new user data with reset values
-        reset_user_data = {
-            'balance': 0,
-            'package': 'None',
-            'level': 'Spinner',
-            'spin_points': 0,
-            'hits': 0,
-            'total_spins': 0,
-            'spins_available': 0,
-            'referrals': referrals,
-            'payment_method': '',
-            'updated_at': datetime.now().isoformat(),
-            'referred_by': referred_by,
-            'nfts': '',
-            'language': language,
-            'lang': language,
-            'username': username
-        }
-        
-        # Save reset user data to database
-        success = save_user_data_to_db(target_user_id, reset_user_data)
-        
+
+        # Reset via one precompiled UPDATE touching only the reset columns;
+        # username, referrals, language, ban status etc. stay untouched
+        now_iso = datetime.now().isoformat()
+        success = await asyncio.to_thread(_run_reset_user, target_user_id, now_iso)
+
         if success:
             # Also update in-memory data if it exists
-            if target_user_id in globals()['user_data']:
-                globals()['user_data'][target_user_id].update(reset_user_data)
+            update_user_cache(target_user_id, {
+                'balance': 0,
+                'package': 'None',
+                'level': 'Spinner',
+                'spin_points': 0,
+                'hits': 0,
+                'total_spins': 0,
+                'spins_available': 0,
+                'payment_method': '',
+                'nfts': [],
+                'updated_at': now_iso
+            })
         
         result_text = f"✅ <b>User Data Reset Successfully!</b>\n\n"
         result_text += f"👤 <b>User:</b> @{username} (ID: {target_user_id})\n\n"
@@ -3833,8 +4078,7 @@ async def admin_confirm_reset_user_data_callback(callback: types.CallbackQuery):
             ]
         ])
     
-    await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
-    await callback.answer()
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
 
 
 # Admin Ban User Callback
@@ -3842,18 +4086,19 @@ async def admin_ban_user_callback(callback: types.CallbackQuery):
     """Handle ban user functionality"""
     user_id = callback.from_user.id
     
-    print(f"🔧 [Admin] Ban user callback triggered for user {user_id}, data: {callback.data}")
+    logger.debug("[Admin] Ban user callback triggered for user %s, data: %s", user_id, callback.data)
     
     if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
-        return
-    
-    print(f"✅ [Admin] Ban user access granted for user {user_id}")
-    
-    from translations import get_admin_text
+        return
     
+    logger.debug("[Admin] Ban user access granted for user %s", user_id)
+
+    # Ack first: stop Telegram's spinner before the DB work below runs
+    await callback.answer()
+
+
     # Handle case where callback data is just "admin_ban_user" (menu button)
     if callback.data == "admin_ban_user":
         # Show user selection menu
@@ -3863,12 +4108,8 @@ async def admin_ban_user_callback(callback: types.CallbackQuery):
         
         # Get all users from database
         try:
-            conn = sqlite3.connect('cgspins.db')
-            cursor = conn.cursor()
-            cursor.execute("SELECT user_id, username, spins_available FROM users ORDER BY user_id DESC LIMIT 20")
-            users = cursor.fetchall()
-            conn.close()
-            
+            users = await asyncio.to_thread(_load_recent_users)
+
             if not users:
                 keyboard = InlineKeyboardMarkup(inline_keyboard=[
                     [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_management")]
@@ -3898,22 +4139,18 @@ async def admin_ban_user_callback(callback: types.CallbackQuery):
             ])
             admin_text = f"❌ <b>Error loading users:</b>\n\n{str(e)}"
         
-        try:
-            await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
-        except Exception as e:
-            if "message is not modified" in str(e):
-                pass
-            else:
-                print(f"Error editing message: {e}")
-        await callback.answer()
+        await safe_edit_message(callback, admin_text, reply_markup=keyboard)
         return
-    
+
     # Extract user ID from callback data
-    target_user_id = int(callback.data.split("_")[-1])
-    
+    target_user_id = int(callback.data.rsplit("_", 1)[-1])
+
     # Get user data
     user_data = get_user_data_from_db(target_user_id)
-    
+    if user_data:
+        # Let the confirm handler reuse this row instead of re-fetching it
+        _stash_admin_action(user_id, target_user_id, user_data)
+
     if not user_data:
         ban_text = f"❌ <b>User Not Found</b>\n\nUser ID: {target_user_id}\n\nThis user does not exist in the system."
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -3925,11 +4162,13 @@ async def admin_ban_user_callback(callback: types.CallbackQuery):
         username = user_data.get('username', 'Unknown')
         
         if is_banned:
-            ban_text = f"🚫 <b>User Already Banned</b>\n\n"
-            ban_text += f"👤 <b>User:</b> @{username} (ID: {target_user_id})\n"
-            ban_text += f"🚫 <b>Status:</b> Banned\n\n"
-            ban_text += f"⚠️ <b>This user is already banned from using the bot.</b>\n\n"
-            ban_text += f"Would you like to unban this user?"
+            ban_text = (
+                f"🚫 <b>User Already Banned</b>\n\n"
+                f"👤 <b>User:</b> @{username} (ID: {target_user_id})\n"
+                f"🚫 <b>Status:</b> Banned\n\n"
+                f"⚠️ <b>This user is already banned from using the bot.</b>\n\n"
+                f"Would you like to unban this user?"
+            )
             
             keyboard = InlineKeyboardMarkup(inline_keyboard=[
                 [
@@ -3941,16 +4180,13 @@ async def admin_ban_user_callback(callback: types.CallbackQuery):
                 ]
             ])
         else:
-            ban_text = f"🚫 <b>Ban User</b>\n\n"
-            ban_text += f"👤 <b>User:</b> @{username} (ID: {target_user_id})\n"
-            ban_text += f"📦 <b>Package:</b> {user_data.get('package', 'None').title()}\n"
-            ban_text += f"🎰 <b>Total Spins:</b> {user_data.get('total_spins', 0):,}\n"
-            ban_text += f"🔄 <b>Spins Available:</b> {user_data.get('spins_available', 0)}\n\n"
-            ban_text += f"⚠️ <b>Banning this user will:</b>\n"
-            ban_text += f"   🚫 Prevent them from using the bot\n"
-            ban_text += f"   🚫 Block all bot interactions\n"
-            ban_text += f"   🚫 Preserve their data (can be unbanned later)\n\n"
-            ban_text += f"⚠️ <b>Are you sure you want to ban this user?</b>"
+            ban_text = BAN_CONFIRM_TEMPLATE.format_map({
+                'username': username,
+                'user_id': target_user_id,
+                'package': user_data.get('package', 'None').title(),
+                'total_spins': user_data.get('total_spins', 0),
+                'spins_available': user_data.get('spins_available', 0),
+            })
             
             keyboard = InlineKeyboardMarkup(inline_keyboard=[
                 [
@@ -3962,8 +4198,60 @@ async def admin_ban_user_callback(callback: types.CallbackQuery):
                 ]
             ])
     
-    await callback.message.edit_text(ban_text, reply_markup=keyboard, parse_mode="HTML")
-    await callback.answer()
+    await safe_edit_message(callback, ban_text, reply_markup=keyboard)
+
+
+# Success messages for the ban/unban confirms, parsed once at import and
+# filled with a single C-level format pass per send
+BAN_SUCCESS_TEMPLATE = """🚫 <b>User Banned Successfully!</b>
+
+👤 <b>User:</b> {display_name} (ID: {target_user_id})
+🚫 <b>Status:</b> Banned
+👮 <b>Banned by:</b> Admin {admin_id}
+🕒 <b>Banned at:</b> {banned_at}
+
+⚠️ <b>This user can no longer:</b>
+   🚫 Use the bot
+   🚫 Send commands
+   🚫 Access any features
+
+✅ <b>User data preserved for potential unban.</b>"""
+
+UNBAN_SUCCESS_TEMPLATE = """✅ <b>User Unbanned Successfully!</b>
+
+👤 <b>User:</b> {display_name} (ID: {target_user_id})
+✅ <b>Status:</b> Active
+👮 <b>Unbanned by:</b> Admin {admin_id}
+🕒 <b>Unbanned at:</b> {unbanned_at}
+
+🎉 <b>This user can now:</b>
+   ✅ Use the bot normally
+   ✅ Send commands
+   ✅ Access all features
+   ✅ Continue their progress
+
+📦 <b>Package:</b> {package}
+🔄 <b>Spins Available:</b> {spins_available}"""
+
+
+# Ban and unban both flip the same three columns, so they share one
+# parameterized UPDATE instead of the read-modify-write full-row upsert
+_SET_BAN_SQL = (
+    "UPDATE users SET banned = ?, banned_at = ?, banned_by = ?, "
+    "updated_at = ? WHERE user_id = ?"
+)
+
+
+def _run_set_ban_status(target_user_id: int, banned: int, banned_at: str, banned_by: int, now_iso: str) -> bool:
+    """Apply the ban-status UPDATE"""
+    try:
+        with write_conn() as conn:
+            conn.execute(_SET_BAN_SQL, (banned, banned_at, banned_by, now_iso, target_user_id))
+            conn.commit()
+        return True
+    except Exception as e:
+        logger.error("[Admin] Error updating ban status for user %s: %s", target_user_id, e)
+        return False
 
 
 # Admin Confirm Ban User Callback
@@ -3973,17 +4261,19 @@ async def admin_confirm_ban_user_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
-    
-    from translations import get_admin_text
-    
+
+    # Ack first: stop Telegram's spinner before the DB work below runs
+    await callback.answer()
+
+
     # Extract user ID from callback data
-    target_user_id = int(callback.data.split("_")[-1])
-    
-    # Get user data from database
-    user_data = get_user_data_from_db(target_user_id)
+    target_user_id = int(callback.data.rsplit("_", 1)[-1])
+
+    # Reuse the row stashed when the confirm dialog was shown; fall back to
+    # the DB if the snapshot expired or belongs to a different target
+    user_data = _take_admin_action(user_id, target_user_id) or get_user_data_from_db(target_user_id)
     
     if not user_data:
         result_text = f"❌ <b>User Not Found</b>\n\nUser ID: {target_user_id}\n\nThis user does not exist in the system."
@@ -3991,35 +4281,28 @@ async def admin_confirm_ban_user_callback(callback: types.CallbackQuery):
             [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_details")]
         ])
     else:
-        # Ban the user
-        user_data['banned'] = 1
-        user_data['banned_at'] = datetime.now().isoformat()
-        user_data['banned_by'] = user_id
-        user_data['updated_at'] = datetime.now().isoformat()
-        
-        # Save updated user data to database
-        success = save_user_data_to_db(target_user_id, user_data)
-        
+        # Ban the user: one targeted UPDATE, one timestamp, one patch dict
+        # shared between the DB row copy here and the in-memory cache.
+        # user_data came from the DB (or the confirm-dialog snapshot), not
+        # from the in-memory dict, so the cache mirror is still needed.
+        now_iso = datetime.now().isoformat()
+        patch = {'banned': 1, 'banned_at': now_iso, 'banned_by': user_id}
+        user_data.update(patch)
+
+        success = await asyncio.to_thread(_run_set_ban_status, target_user_id, 1, now_iso, user_id, now_iso)
+
         if success:
-            # Also update in-memory data if it exists
-            if target_user_id in globals()['user_data']:
-                globals()['user_data'][target_user_id]['banned'] = 1
-                globals()['user_data'][target_user_id]['banned_at'] = datetime.now().isoformat()
-                globals()['user_data'][target_user_id]['banned_by'] = user_id
+            update_user_cache(target_user_id, patch)
             
             username = user_data.get('username', '')
             display_name = f"@{username}" if username else f"User {target_user_id}"
-        
-            result_text = f"🚫 <b>User Banned Successfully!</b>\n\n"
-            result_text += f"👤 <b>User:</b> {display_name} (ID: {target_user_id})\n"
-            result_text += f"🚫 <b>Status:</b> Banned\n"
-            result_text += f"👮 <b>Banned by:</b> Admin {user_id}\n"
-            result_text += f"🕒 <b>Banned at:</b> {user_data.get('banned_at', 'Now')}\n\n"
-            result_text += f"⚠️ <b>This user can no longer:</b>\n"
-            result_text += f"   🚫 Use the bot\n"
-            result_text += f"   🚫 Send commands\n"
-            result_text += f"   🚫 Access any features\n\n"
-            result_text += f"✅ <b>User data preserved for potential unban.</b>"
+
+            result_text = BAN_SUCCESS_TEMPLATE.format_map({
+                'display_name': display_name,
+                'target_user_id': target_user_id,
+                'admin_id': user_id,
+                'banned_at': now_iso,
+            })
         else:
             result_text = f"❌ <b>Failed to Ban User</b>\n\nUser ID: {target_user_id}\n\nDatabase update failed. Please try again."
         
@@ -4034,8 +4317,7 @@ async def admin_confirm_ban_user_callback(callback: types.CallbackQuery):
             ]
         ])
     
-    await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
-    await callback.answer()
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
 
 
 # Admin Unban User Callback
@@ -4045,15 +4327,16 @@ async def admin_unban_user_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
-    
-    from translations import get_admin_text
-    
+
+    # Ack first: stop Telegram's spinner before the DB work below runs
+    await callback.answer()
+
+
     # Extract user ID from callback data
-    target_user_id = int(callback.data.split("_")[-1])
-    
+    target_user_id = int(callback.data.rsplit("_", 1)[-1])
+
     # Get user data from database
     user_data = get_user_data_from_db(target_user_id)
     
@@ -4063,37 +4346,27 @@ async def admin_unban_user_callback(callback: types.CallbackQuery):
             [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_details")]
         ])
     else:
-        # Unban the user
-        user_data['banned'] = 0
-        user_data['banned_at'] = ''
-        user_data['banned_by'] = 0
-        user_data['updated_at'] = datetime.now().isoformat()
-        
-        # Save updated user data to database
-        success = save_user_data_to_db(target_user_id, user_data)
-        
+        # Unban the user: same shared-patch shape as the ban branch
+        now_iso = datetime.now().isoformat()
+        patch = {'banned': 0, 'banned_at': '', 'banned_by': 0}
+        user_data.update(patch)
+
+        success = await asyncio.to_thread(_run_set_ban_status, target_user_id, 0, '', 0, now_iso)
+
         if success:
-            # Also update in-memory data if it exists
-            if target_user_id in globals()['user_data']:
-                globals()['user_data'][target_user_id]['banned'] = 0
-                globals()['user_data'][target_user_id]['banned_at'] = ''
-                globals()['user_data'][target_user_id]['banned_by'] = 0
+            update_user_cache(target_user_id, patch)
             
             username = user_data.get('username', '')
             display_name = f"@{username}" if username else f"User {target_user_id}"
-        
-            result_text = f"✅ <b>User Unbanned Successfully!</b>\n\n"
-            result_text += f"👤 <b>User:</b> {display_name} (ID: {target_user_id})\n"
-            result_text += f"✅ <b>Status:</b> Active\n"
-            result_text += f"👮 <b>Unbanned by:</b> Admin {user_id}\n"
-            result_text += f"🕒 <b>Unbanned at:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            result_text += f"🎉 <b>This user can now:</b>\n"
-            result_text += f"   ✅ Use the bot normally\n"
-            result_text += f"   ✅ Send commands\n"
-            result_text += f"   ✅ Access all features\n"
-            result_text += f"   ✅ Continue their progress\n\n"
-            result_text += f"📦 <b>Package:</b> {user_data.get('package', 'None').title()}\n"
-            result_text += f"🔄 <b>Spins Available:</b> {user_data.get('spins_available', 0)}"
+
+            result_text = UNBAN_SUCCESS_TEMPLATE.format_map({
+                'display_name': display_name,
+                'target_user_id': target_user_id,
+                'admin_id': user_id,
+                'unbanned_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'package': user_data.get('package', 'None').title(),
+                'spins_available': user_data.get('spins_available', 0),
+            })
         else:
             result_text = f"❌ <b>Failed to Unban User</b>\n\nUser ID: {target_user_id}\n\nDatabase update failed. Please try again."
         
@@ -4108,8 +4381,7 @@ async def admin_unban_user_callback(callback: types.CallbackQuery):
             ]
         ])
     
-    await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
-    await callback.answer()
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
 
 
 
@@ -4120,66 +4392,74 @@ async def admin_package_stats_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
-    
-    from translations import get_admin_text
-    from src.models import load_ton_transactions, load_stars_transactions
-    
-    # Calculate package statistics
-    package_stats = {}
-    total_users = len(user_data)
-    active_packages = 0
-    
-    for user_id_key, user in user_data.items():
-        package = user.get('package', 'None')
-        if package != 'None':
-            active_packages += 1
-            if package not in package_stats:
-                package_stats[package] = {
-                    'count': 0,
-                    'total_spins': 0,
-                    'total_hits': 0,
-                    'total_points': 0
-                }
-            package_stats[package]['count'] += 1
-            package_stats[package]['total_spins'] += user.get('total_spins', 0)
-            package_stats[package]['total_hits'] += user.get('hits', 0)
-            package_stats[package]['total_points'] += user.get('spin_points', 0)
-    
-    # Create statistics text
-    stats_text = f"📦 <b>Package Statistics</b>\n\n"
-    stats_text += f"👥 <b>Total Users:</b> {total_users}\n"
-    stats_text += f"📦 <b>Active Packages:</b> {active_packages}\n"
-    stats_text += f"📊 <b>Package Distribution:</b>\n\n"
-    
+
+    # Serve the cached report when nothing has been written since it rendered
+    cached = _get_cached_report('package')
+    if cached is not None:
+        await safe_edit_message(callback, cached, reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_panel")]
+        ]))
+        await callback.answer()
+        return
+
+
+    # Aggregate in sqlite (GROUP BY over idx_users_package) instead of
+    # scanning every user dict in Python
+    rows = await asyncio.to_thread(get_package_stats)
+    total_users = await asyncio.to_thread(count_users)
+
+    package_stats = {
+        package: {
+            'count': count,
+            'total_spins': spins or 0,
+            'total_hits': hits or 0,
+            'total_points': points or 0
+        }
+        for package, count, spins, hits, points in rows
+    }
+    active_packages = sum(stats['count'] for stats in package_stats.values())
+    
+    # Create statistics text (list + join: no per-line string reallocation)
+    parts = [
+        f"📦 <b>Package Statistics</b>\n\n"
+        f"👥 <b>Total Users:</b> {total_users}\n"
+        f"📦 <b>Active Packages:</b> {active_packages}\n"
+        f"📊 <b>Package Distribution:</b>\n\n"
+    ]
+
     if package_stats:
         for package, stats in package_stats.items():
             percentage = (stats['count'] / active_packages * 100) if active_packages > 0 else 0
-            stats_text += f"🥉 <b>{package.title()}:</b>\n"
-            stats_text += f"   👥 Users: {stats['count']} ({percentage:.1f}%)\n"
-            stats_text += f"   🎰 Total Spins: {stats['total_spins']}\n"
-            stats_text += f"   💎 Total Hits: {stats['total_hits']}\n"
-            stats_text += f"   ⭐ Total Points: {stats['total_points']}\n\n"
+            parts.append(
+                f"🥉 <b>{package.title()}:</b>\n"
+                f"   👥 Users: {stats['count']} ({percentage:.1f}%)\n"
+                f"   🎰 Total Spins: {stats['total_spins']}\n"
+                f"   💎 Total Hits: {stats['total_hits']}\n"
+                f"   ⭐ Total Points: {stats['total_points']}\n\n"
+            )
     else:
-        stats_text += "📭 No active packages found\n\n"
-    
+        parts.append("📭 No active packages found\n\n")
+
     # Add package popularity ranking
     if package_stats:
         sorted_packages = sorted(package_stats.items(), key=lambda x: x[1]['count'], reverse=True)
-        stats_text += f"🏆 <b>Most Popular Packages:</b>\n"
+        parts.append(f"🏆 <b>Most Popular Packages:</b>\n")
         for i, (package, stats) in enumerate(sorted_packages[:3], 1):
             emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉"
-            stats_text += f"{emoji} {package.title()}: {stats['count']} users\n"
-    
+            parts.append(f"{emoji} {package.title()}: {stats['count']} users\n")
+
+    stats_text = "".join(parts)
+    _store_cached_report('package', stats_text)
+
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_panel")
         ]
     ])
     
-    await callback.message.edit_text(stats_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, stats_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -4189,118 +4469,124 @@ async def admin_hit_stats_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
-    
-    # Calculate hit statistics
-    total_spins = 0
-    total_hits = 0
-    total_users = len(user_data)
-    active_users = 0
-    hit_rates_by_package = {}
-    level_distribution = {}
-    
-    for user_id_key, user in user_data.items():
-        user_spins = user.get('total_spins', 0)
-        user_hits = user.get('hits', 0)
-        user_level = user.get('level', 'Spinner')
-        user_package = user.get('package', 'None')
-        
-        total_spins += user_spins
-        total_hits += user_hits
-        
-        if user_spins > 0:
-            active_users += 1
-        
-        # Level distribution
-        if user_level not in level_distribution:
-            level_distribution[user_level] = 0
-        level_distribution[user_level] += 1
-        
-        # Hit rates by package
-        if user_package != 'None':
-            if user_package not in hit_rates_by_package:
-                hit_rates_by_package[user_package] = {
-                    'total_spins': 0,
-                    'total_hits': 0,
-                    'users': 0
-                }
-            hit_rates_by_package[user_package]['total_spins'] += user_spins
-            hit_rates_by_package[user_package]['total_hits'] += user_hits
-            hit_rates_by_package[user_package]['users'] += 1
     
+    # Serve the cached report when nothing has been written since it rendered
+    cached = _get_cached_report('hit')
+    if cached is not None:
+        await safe_edit_message(callback, cached, reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_panel")]
+        ]))
+        await callback.answer()
+        return
+
+
+    # Aggregate in sqlite instead of scanning every user dict in Python
+    total_spins, total_hits, active_users = await asyncio.to_thread(get_spin_totals)
+    level_distribution = dict(await asyncio.to_thread(get_level_stats))
+    total_users = await asyncio.to_thread(count_users)
+
+    hit_rates_by_package = {
+        package: {
+            'total_spins': spins or 0,
+            'total_hits': hits or 0,
+            'users': count
+        }
+        for package, count, spins, hits, _points in await asyncio.to_thread(get_package_stats)
+    }
+
     # Calculate overall hit rate
     overall_hit_rate = (total_hits / total_spins * 100) if total_spins > 0 else 0
     
-    # Create statistics text
-    stats_text = f"🎯 <b>Hit Statistics</b>\n\n"
-    stats_text += f"📊 <b>Overall Statistics:</b>\n"
-    stats_text += f"   🎰 Total Spins: {total_spins:,}\n"
-    stats_text += f"   💎 Total Hits: {total_hits:,}\n"
-    stats_text += f"   📈 Hit Rate: {overall_hit_rate:.2f}%\n"
-    stats_text += f"   👥 Active Users: {active_users}\n\n"
-    
+    # Create statistics text (list + join: no per-line string reallocation)
+    parts = [
+        f"🎯 <b>Hit Statistics</b>\n\n"
+        f"📊 <b>Overall Statistics:</b>\n"
+        f"   🎰 Total Spins: {total_spins:,}\n"
+        f"   💎 Total Hits: {total_hits:,}\n"
+        f"   📈 Hit Rate: {overall_hit_rate:.2f}%\n"
+        f"   👥 Active Users: {active_users}\n\n"
+    ]
+
     # Package hit rates
     if hit_rates_by_package:
-        stats_text += f"📦 <b>Hit Rates by Package:</b>\n"
+        parts.append(f"📦 <b>Hit Rates by Package:</b>\n")
         for package, stats in hit_rates_by_package.items():
             package_hit_rate = (stats['total_hits'] / stats['total_spins'] * 100) if stats['total_spins'] > 0 else 0
-            stats_text += f"   🥉 <b>{package.title()}:</b>\n"
-            stats_text += f"      🎰 Spins: {stats['total_spins']:,}\n"
-            stats_text += f"      💎 Hits: {stats['total_hits']:,}\n"
-            stats_text += f"      📈 Rate: {package_hit_rate:.2f}%\n"
-            stats_text += f"      👥 Users: {stats['users']}\n\n"
-    
+            parts.append(
+                f"   🥉 <b>{package.title()}:</b>\n"
+                f"      🎰 Spins: {stats['total_spins']:,}\n"
+                f"      💎 Hits: {stats['total_hits']:,}\n"
+                f"      📈 Rate: {package_hit_rate:.2f}%\n"
+                f"      👥 Users: {stats['users']}\n\n"
+            )
+
     # Level distribution
     if level_distribution:
-        stats_text += f"🏆 <b>Level Distribution:</b>\n"
+        parts.append(f"🏆 <b>Level Distribution:</b>\n")
         for level, count in sorted(level_distribution.items(), key=lambda x: x[1], reverse=True):
             percentage = (count / total_users * 100) if total_users > 0 else 0
             emoji = config.LEVELS.get(level, {}).get('emoji', '🎯')
-            stats_text += f"   {emoji} <b>{level}:</b> {count} users ({percentage:.1f}%)\n"
-    
+            parts.append(f"   {emoji} <b>{level}:</b> {count} users ({percentage:.1f}%)\n")
+
+    stats_text = "".join(parts)
+    _store_cached_report('hit', stats_text)
+
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_panel")
         ]
     ])
     
-    await callback.message.edit_text(stats_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, stats_text, reply_markup=keyboard)
     await callback.answer()
 
 
+# Static admin sub-menus: the text and keyboard are pure functions of the
+# viewer's language (handlers never mutate the markup, so the objects can be
+# shared), so each is rendered once per (menu, language) and reused.
+_menu_cache = {}
+
+
+def _admin_menu_for(menu_name: str, user_id: int, title_key: str, button_rows) -> tuple:
+    """(text, keyboard) for a static admin menu, memoized per language
+
+    button_rows is a tuple of rows, each row a tuple of
+    (admin_text_key, callback_data) pairs.
+    """
+    lang = translations.get_user_language(user_id)
+    cached = _menu_cache.get((menu_name, lang))
+    if cached is None:
+        text = f"{get_admin_text(user_id, title_key)}\n\n{get_admin_text(user_id, 'admin_welcome')}"
+        keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=get_admin_text(user_id, text_key), callback_data=data)
+             for text_key, data in row]
+            for row in button_rows
+        ])
+        cached = (text, keyboard)
+        _menu_cache[(menu_name, lang)] = cached
+    return cached
+
+
 # Admin Financial Management Callback
 async def admin_financial_management_callback(callback: types.CallbackQuery):
     """Handle admin financial management menu"""
     user_id = callback.from_user.id
-    
+
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
-    
-    from translations import get_admin_text
-    
-    admin_text = f"{get_admin_text(user_id, 'financial_management_title')}\n\n{get_admin_text(user_id, 'admin_welcome')}"
-    
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "payment_tracking"), callback_data="admin_payment_tracking"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "revenue_analytics"), callback_data="admin_revenue_analytics")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "pending_payments"), callback_data="admin_pending_payments"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "transaction_history"), callback_data="admin_transaction_history")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_panel")
-        ]
-    ])
-    
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+
+
+    admin_text, keyboard = _admin_menu_for('financial', user_id, 'financial_management_title', (
+        (("payment_tracking", "admin_payment_tracking"), ("revenue_analytics", "admin_revenue_analytics")),
+        (("pending_payments", "admin_pending_payments"), ("transaction_history", "admin_transaction_history")),
+        (("back_to_main", "admin_panel"),),
+    ))
+
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -4310,84 +4596,80 @@ async def admin_payment_tracking_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
-    from src.models import load_ton_transactions, load_stars_transactions
-    
-    # Load transaction data
-    ton_transactions = load_ton_transactions()
-    stars_transactions = load_stars_transactions()
-    
-    # Calculate payment statistics
-    ton_payments = len(ton_transactions)
-    stars_payments = len(stars_transactions)
+
+    # Counts and revenue sums aggregated in SQL instead of loading every row
+    ton_payments, total_ton_revenue = await asyncio.to_thread(get_ton_totals)
+    stars_payments, total_stars_revenue = await asyncio.to_thread(get_stars_totals)
     pending_ton = len(pending_ton_payments)
     
-    # Calculate total revenue
-    total_ton_revenue = sum(tx['amount'] for tx in ton_transactions)
-    total_stars_revenue = sum(tx['amount_stars'] for tx in stars_transactions)  # Fixed: use 'amount_stars' for Stars transactions
-    
-    # Create payment tracking text
-    tracking_text = f"💳 <b>Payment Tracking</b>\n\n"
-    tracking_text += f"📊 <b>Payment Summary:</b>\n"
-    tracking_text += f"   💎 TON Payments: {ton_payments}\n"
-    tracking_text += f"   ⭐ Stars Payments: {stars_payments}\n"
-    tracking_text += f"   ⏳ Pending TON: {pending_ton}\n\n"
-    
-    tracking_text += f"💰 <b>Revenue Summary:</b>\n"
-    tracking_text += f"   💎 TON Revenue: {total_ton_revenue:.4f} TON\n"
-    tracking_text += f"   ⭐ Stars Revenue: {total_stars_revenue:,} Stars\n"
-    tracking_text += f"   📈 Total Payments: {ton_payments + stars_payments}\n\n"
-    
-    # Recent transactions
-    recent_ton = ton_transactions[:5]  # Already sorted by processed_at DESC
-    recent_stars = stars_transactions[:5]  # Already sorted by processed_at DESC
-    
+    # Create payment tracking text (list + join: no per-line reallocation)
+    parts = [
+        f"💳 <b>Payment Tracking</b>\n\n"
+        f"📊 <b>Payment Summary:</b>\n"
+        f"   💎 TON Payments: {ton_payments}\n"
+        f"   ⭐ Stars Payments: {stars_payments}\n"
+        f"   ⏳ Pending TON: {pending_ton}\n\n"
+        f"💰 <b>Revenue Summary:</b>\n"
+        f"   💎 TON Revenue: {total_ton_revenue:.4f} TON\n"
+        f"   ⭐ Stars Revenue: {total_stars_revenue:,} Stars\n"
+        f"   📈 Total Payments: {ton_payments + stars_payments}\n\n"
+    ]
+
+    # Recent transactions: only the rows actually shown, LIMIT in SQL
+    recent_ton = await asyncio.to_thread(get_recent_ton_transactions, 3)
+    recent_stars = await asyncio.to_thread(get_recent_stars_transactions, 3)
+
     if recent_ton or recent_stars:
-        tracking_text += f"📋 <b>Recent Transactions:</b>\n"
-        
-        for transaction in recent_ton[:3]:  # Show most recent 3
+        parts.append(f"📋 <b>Recent Transactions:</b>\n")
+
+        for transaction in recent_ton:
             user_id_tx = transaction['user_id']
             amount = transaction['amount']
             package = transaction['package']
             processed_at = transaction.get('processed_at', 'Unknown')
             tx_hash = transaction.get('tx_hash', '')
-            
+
             formatted_time = format_timestamp(processed_at)
             formatted_hash = format_transaction_hash(tx_hash)
-            
-            tracking_text += f"   💎 <b>TON</b>: {amount:.4f} TON ({package})\n"
-            tracking_text += f"      👤 User: {user_id_tx} | 🕒 {formatted_time}\n"
+
+            parts.append(
+                f"   💎 <b>TON</b>: {amount:.4f} TON ({package})\n"
+                f"      👤 User: {user_id_tx} | 🕒 {formatted_time}\n"
+            )
             if tx_hash:
-                tracking_text += f"      🔗 Hash: {formatted_hash}\n"
-            tracking_text += "\n"
-        
-        for transaction in recent_stars[:3]:  # Show most recent 3
+                parts.append(f"      🔗 Hash: {formatted_hash}\n")
+            parts.append("\n")
+
+        for transaction in recent_stars:
             user_id_tx = transaction['user_id']
             amount = transaction['amount_stars']  # Fixed: use 'amount_stars' for Stars transactions
             package = transaction['package']
             processed_at = transaction.get('processed_at', 'Unknown')
             tx_id = transaction.get('id', '')  # Fixed: use 'id' field for Stars transactions
-            
+
             formatted_time = format_timestamp(processed_at)
             formatted_id = format_transaction_id(tx_id)
-            
-            tracking_text += f"   ⭐ <b>Stars</b>: {amount:,} Stars ({package})\n"
-            tracking_text += f"      👤 User: {user_id_tx} | 🕒 {formatted_time}\n"
+
+            parts.append(
+                f"   ⭐ <b>Stars</b>: {amount:,} Stars ({package})\n"
+                f"      👤 User: {user_id_tx} | 🕒 {formatted_time}\n"
+            )
             if tx_id:
-                tracking_text += f"      🆔 ID: {formatted_id}\n"
-            tracking_text += "\n"
-    
+                parts.append(f"      🆔 ID: {formatted_id}\n")
+            parts.append("\n")
+
+    tracking_text = "".join(parts)
+
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_financial_management")
         ]
     ])
     
-    await callback.message.edit_text(tracking_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, tracking_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -4397,83 +4679,90 @@ async def admin_revenue_analytics_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
-    from src.models import load_ton_transactions, load_stars_transactions
-    
-    # Calculate revenue analytics
+    # Serve the cached report when nothing has been written since it rendered
+    cached = _get_cached_report('revenue')
+    if cached is not None:
+        await safe_edit_message(callback, cached, reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_financial_management")]
+        ]))
+        await callback.answer()
+        return
+
+
+    # Calculate revenue analytics from per-package aggregates (GROUP BY in
+    # sqlite) instead of iterating every transaction row in Python
     ton_revenue = 0
     stars_revenue = 0
+    ton_count = 0
+    stars_count = 0
     package_revenue = {}
-    daily_revenue = {}
-    
-    # Load transaction data
-    ton_transactions = load_ton_transactions()
-    stars_transactions = load_stars_transactions()
-    
-    # Process TON transactions
-    for transaction in ton_transactions:
-        amount = transaction['amount']
+
+    for package, count, amount in await asyncio.to_thread(get_ton_revenue_by_package):
         ton_revenue += amount
-        
-        package = transaction['package']
+        ton_count += count
         if package not in package_revenue:
             package_revenue[package] = {'ton': 0, 'stars': 0, 'count': 0}
         package_revenue[package]['ton'] += amount
-        package_revenue[package]['count'] += 1
-    
-    # Process Stars transactions
-    for transaction in stars_transactions:
-        amount = transaction['amount_stars']  # Fixed: use 'amount_stars' for Stars transactions
+        package_revenue[package]['count'] += count
+
+    for package, count, amount in await asyncio.to_thread(get_stars_revenue_by_package):
         stars_revenue += amount
-        
-        package = transaction['package']
+        stars_count += count
         if package not in package_revenue:
             package_revenue[package] = {'ton': 0, 'stars': 0, 'count': 0}
         package_revenue[package]['stars'] += amount
-        package_revenue[package]['count'] += 1
-    
+        package_revenue[package]['count'] += count
+
     # Calculate total revenue in TON using correct conversion rate
     total_revenue_ton = ton_revenue + stars_to_ton(stars_revenue)
     
-    # Create revenue analytics text
-    analytics_text = f"📈 <b>Revenue Analytics</b>\n\n"
-    analytics_text += f"💰 <b>Total Revenue:</b>\n"
-    analytics_text += f"   💎 TON: {ton_revenue:.4f} TON\n"
-    analytics_text += f"   ⭐ Stars: {stars_revenue:,} Stars\n"
-    analytics_text += f"   📊 Total (TON equiv): {total_revenue_ton:.4f} TON\n\n"
-    
+    # Create revenue analytics text (list + join: no per-line reallocation)
+    parts = [
+        f"📈 <b>Revenue Analytics</b>\n\n"
+        f"💰 <b>Total Revenue:</b>\n"
+        f"   💎 TON: {ton_revenue:.4f} TON\n"
+        f"   ⭐ Stars: {stars_revenue:,} Stars\n"
+        f"   📊 Total (TON equiv): {total_revenue_ton:.4f} TON\n\n"
+    ]
+
     # Package revenue breakdown
     if package_revenue:
-        analytics_text += f"📦 <b>Revenue by Package:</b>\n"
+        parts.append(f"📦 <b>Revenue by Package:</b>\n")
         for package, revenue in package_revenue.items():
             package_total_ton = revenue['ton'] + stars_to_ton(revenue['stars'])
-            analytics_text += f"   🥉 <b>{package.title()}:</b>\n"
-            analytics_text += f"      💎 TON: {revenue['ton']:.4f}\n"
-            analytics_text += f"      ⭐ Stars: {revenue['stars']:,}\n"
-            analytics_text += f"      📊 Total: {package_total_ton:.4f} TON\n"
-            analytics_text += f"      🛒 Sales: {revenue['count']}\n\n"
-    
+            parts.append(
+                f"   🥉 <b>{package.title()}:</b>\n"
+                f"      💎 TON: {revenue['ton']:.4f}\n"
+                f"      ⭐ Stars: {revenue['stars']:,}\n"
+                f"      📊 Total: {package_total_ton:.4f} TON\n"
+                f"      🛒 Sales: {revenue['count']}\n\n"
+            )
+
     # Calculate average transaction value
-    total_transactions = len(ton_transactions) + len(stars_transactions)
+    total_transactions = ton_count + stars_count
     avg_transaction = total_revenue_ton / total_transactions if total_transactions > 0 else 0
-    
-    analytics_text += f"📊 <b>Transaction Analytics:</b>\n"
-    analytics_text += f"   🛒 Total Transactions: {total_transactions}\n"
-    analytics_text += f"   💰 Average Transaction: {avg_transaction:.4f} TON\n"
-    analytics_text += f"   👥 Total Users: {len(user_data)}\n"
-    analytics_text += f"   📈 Revenue per User: {total_revenue_ton/len(user_data):.4f} TON\n"
-    
+
+    parts.append(
+        f"📊 <b>Transaction Analytics:</b>\n"
+        f"   🛒 Total Transactions: {total_transactions}\n"
+        f"   💰 Average Transaction: {avg_transaction:.4f} TON\n"
+        f"   👥 Total Users: {len(user_data)}\n"
+        f"   📈 Revenue per User: {total_revenue_ton/len(user_data):.4f} TON\n"
+    )
+
+    analytics_text = "".join(parts)
+    _store_cached_report('revenue', analytics_text)
+
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_financial_management")
         ]
     ])
     
-    await callback.message.edit_text(analytics_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, analytics_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -4483,118 +4772,142 @@ async def admin_system_management_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
-    
-    admin_text = f"{get_admin_text(user_id, 'system_management_title')}\n\n{get_admin_text(user_id, 'admin_welcome')}"
-    
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "bot_statistics"), callback_data="admin_bot_stats"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "database_management"), callback_data="admin_database_management")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "logs_monitoring"), callback_data="admin_logs_monitoring"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "maintenance_mode"), callback_data="admin_maintenance_mode")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_panel")
-        ]
-    ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    admin_text, keyboard = _admin_menu_for('system', user_id, 'system_management_title', (
+        (("bot_statistics", "admin_bot_stats"), ("database_management", "admin_database_management")),
+        (("logs_monitoring", "admin_logs_monitoring"), ("maintenance_mode", "admin_maintenance_mode")),
+        (("back_to_main", "admin_panel"),),
+    ))
+
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
+# Bot-stats system probes. The psutil.Process handle is reused across
+# clicks; its first cpu_percent(None) call only primes the sampler (it
+# would report 0.0 with no prior sample), so later calls measure the
+# interval since the previous click. The db file stat is cached for 30s.
+_proc_handle = None
+_db_size_cache = (0.0, 0.0)  # (monotonic timestamp, size in KB)
+
+
+def _get_proc_handle():
+    global _proc_handle
+    if _proc_handle is None:
+        import psutil
+        _proc_handle = psutil.Process(os.getpid())
+        _proc_handle.cpu_percent(None)
+    return _proc_handle
+
+
+def _get_db_size_kb() -> float:
+    global _db_size_cache
+    cached_at, size = _db_size_cache
+    now = time.monotonic()
+    if now - cached_at >= 30:
+        try:
+            size = os.path.getsize('cgspins.db') / 1024  # KB
+        except OSError:
+            size = 0.0
+        _db_size_cache = (now, size)
+    return size
+
+
 # Admin Bot Statistics Callback
 async def admin_bot_stats_callback(callback: types.CallbackQuery):
     """Handle admin bot statistics"""
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
-    from src.models import load_ton_transactions, load_stars_transactions
-    import time
-    import psutil
-    import os
-    
-    # Calculate bot statistics
+    # Serve the cached report when nothing has been written since it rendered
+    cached = _get_cached_report('bot')
+    if cached is not None:
+        await safe_edit_message(callback, cached, reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_system_management")]
+        ]))
+        await callback.answer()
+        return
+
+    # Calculate bot statistics in a single pass over the user dicts instead
+    # of one scan per counter; the active count comes off the maintained index
     total_users = len(user_data)
-    active_users = sum(1 for user in user_data.values() if user.get('total_spins', 0) > 0)
-    total_spins = sum(user.get('total_spins', 0) for user in user_data.values())
-    total_hits = sum(user.get('hits', 0) for user in user_data.values())
-    total_nfts = sum(len(user.get('nfts', [])) for user in user_data.values())
+    active_users = len(spun_user_ids)
+    total_spins = total_hits = total_nfts = 0
+    for user in user_data.values():
+        total_spins += user.get('total_spins', 0)
+        total_hits += user.get('hits', 0)
+        total_nfts += len(user.get('nfts') or ())
     
-    # System statistics
-    process = psutil.Process(os.getpid())
+    # System statistics (reused handle: cpu_percent measures the interval
+    # since the previous click instead of always reporting 0.0)
+    process = _get_proc_handle()
     memory_usage = process.memory_info().rss / 1024 / 1024  # MB
-    cpu_percent = process.cpu_percent()
-    
+    cpu_percent = process.cpu_percent(None)
+
     # Database statistics
-    db_size = 0
-    try:
-        if os.path.exists('cgspins.db'):
-            db_size = os.path.getsize('cgspins.db') / 1024  # KB
-    except:
-        pass
-    
-    # Create bot statistics text
-    stats_text = f"📊 <b>Bot Statistics</b>\n\n"
-    stats_text += f"👥 <b>User Statistics:</b>\n"
-    stats_text += f"   📊 Total Users: {total_users}\n"
-    stats_text += f"   🎯 Active Users: {active_users}\n"
-    activity_rate = (active_users/total_users*100) if total_users > 0 else 0.0
-    hit_rate = (total_hits/total_spins*100) if total_spins > 0 else 0.0
-    
-    stats_text += f"   📈 Activity Rate: {activity_rate:.1f}%\n\n"
-    
-    stats_text += f"🎰 <b>Game Statistics:</b>\n"
-    stats_text += f"   🎰 Total Spins: {total_spins:,}\n"
-    stats_text += f"   💎 Total Hits: {total_hits:,}\n"
-    stats_text += f"   🎁 Total NFTs: {total_nfts}\n"
-    stats_text += f"   📈 Hit Rate: {hit_rate:.2f}%\n\n"
-    
-    # Load transaction data for statistics
-    ton_transactions = load_ton_transactions()
-    stars_transactions = load_stars_transactions()
-    
-    stats_text += f"💳 <b>Payment Statistics:</b>\n"
-    stats_text += f"   💎 TON Transactions: {len(ton_transactions)}\n"
-    stats_text += f"   ⭐ Stars Transactions: {len(stars_transactions)}\n"
-    stats_text += f"   ⏳ Pending Payments: {len(pending_ton_payments)}\n\n"
-    
-    stats_text += f"🖥️ <b>System Statistics:</b>\n"
-    stats_text += f"   💾 Memory Usage: {memory_usage:.1f} MB\n"
-    stats_text += f"   🖥️ CPU Usage: {cpu_percent:.1f}%\n"
-    stats_text += f"   🗄️ Database Size: {db_size:.1f} KB\n"
-    stats_text += f"   ⏰ Uptime: {time.time() - process.create_time():.0f}s\n\n"
-    
-    # Recent activity
-    try:
-        recent_users = sorted(user_data.items(), key=lambda x: str(x[1].get('updated_at', '')), reverse=True)[:5]
-    except:
-        recent_users = []
+    db_size = _get_db_size_kb()
+
+    activity_rate, hit_rate = (
+        active_users * 100 / total_users if total_users else 0.0,
+        total_hits * 100 / total_spins if total_spins else 0.0,
+    )
+
+    # Transaction counts aggregated in SQL (only the counts are shown here)
+    ton_tx_count, _ = await asyncio.to_thread(get_ton_totals)
+    stars_tx_count, _ = await asyncio.to_thread(get_stars_totals)
+
+    # Create bot statistics text (list + join: no per-line reallocation)
+    parts = [
+        f"📊 <b>Bot Statistics</b>\n\n"
+        f"👥 <b>User Statistics:</b>\n"
+        f"   📊 Total Users: {total_users}\n"
+        f"   🎯 Active Users: {active_users}\n"
+        f"   📈 Activity Rate: {activity_rate:.1f}%\n\n"
+        f"🎰 <b>Game Statistics:</b>\n"
+        f"   🎰 Total Spins: {total_spins:,}\n"
+        f"   💎 Total Hits: {total_hits:,}\n"
+        f"   🎁 Total NFTs: {total_nfts}\n"
+        f"   📈 Hit Rate: {hit_rate:.2f}%\n\n"
+        f"💳 <b>Payment Statistics:</b>\n"
+        f"   💎 TON Transactions: {ton_tx_count}\n"
+        f"   ⭐ Stars Transactions: {stars_tx_count}\n"
+        f"   ⏳ Pending Payments: {len(pending_ton_payments)}\n\n"
+        f"🖥️ <b>System Statistics:</b>\n"
+        f"   💾 Memory Usage: {memory_usage:.1f} MB\n"
+        f"   🖥️ CPU Usage: {cpu_percent:.1f}%\n"
+        f"   🗄️ Database Size: {db_size:.1f} KB\n"
+        f"   ⏰ Uptime: {time.time() - process.create_time():.0f}s\n\n"
+    ]
+
+    # Recent activity: bounded top-k, O(N log 5) instead of sorting all
+    # users to keep 5. The str() cast stays because updated_at is a float
+    # epoch on some write paths and an ISO string on others; with it the
+    # keys always compare, so no exception guard is needed.
+    recent_users = heapq.nlargest(
+        5, user_data.items(), key=lambda x: str(x[1].get('updated_at', ''))
+    ) if user_data else []
     if recent_users:
-        stats_text += f"🕒 <b>Recent Activity:</b>\n"
+        parts.append(f"🕒 <b>Recent Activity:</b>\n")
         for user_id_key, user in recent_users:
-            last_activity = user.get('updated_at', 'Unknown')
             spins = user.get('total_spins', 0)
-            stats_text += f"   👤 User {user_id_key}: {spins} spins\n"
-    
+            parts.append(f"   👤 User {user_id_key}: {spins} spins\n")
+
+    stats_text = "".join(parts)
+    _store_cached_report('bot', stats_text)
+
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_system_management")
         ]
     ])
     
-    await callback.message.edit_text(stats_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, stats_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -4604,25 +4917,16 @@ async def admin_content_management_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
-    
-    admin_text = f"{get_admin_text(user_id, 'content_management_title')}\n\n{get_admin_text(user_id, 'admin_welcome')}"
-    
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "broadcast_messages"), callback_data="admin_broadcast"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "package_pricing"), callback_data="admin_package_pricing")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_panel")
-        ]
-    ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    admin_text, keyboard = _admin_menu_for('content', user_id, 'content_management_title', (
+        (("broadcast_messages", "admin_broadcast"), ("package_pricing", "admin_package_pricing")),
+        (("back_to_main", "admin_panel"),),
+    ))
+
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -4632,22 +4936,25 @@ async def admin_broadcast_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
     
+    # O(1) read off the maintained index instead of a full user scan
+    active_users = len(spun_user_ids)
+
     # Create broadcast interface
-    broadcast_text = f"📢 <b>Broadcast Messages</b>\n\n"
-    broadcast_text += f"Send a message to all users in the bot.\n\n"
-    broadcast_text += f"📊 <b>Current Users:</b> {len(user_data)}\n"
-    broadcast_text += f"👥 <b>Active Users:</b> {sum(1 for user in user_data.values() if user.get('total_spins', 0) > 0)}\n\n"
-    broadcast_text += f"⚠️ <b>Warning:</b> This will send a message to ALL users. Use carefully!\n\n"
-    broadcast_text += f"💡 <b>How to use:</b>\n"
-    broadcast_text += f"1. Click 'Send Broadcast' below\n"
-    broadcast_text += f"2. Type your message\n"
-    broadcast_text += f"3. Confirm to send to all users"
+    broadcast_text = (
+        f"📢 <b>Broadcast Messages</b>\n\n"
+        f"Send a message to all users in the bot.\n\n"
+        f"📊 <b>Current Users:</b> {len(user_data)}\n"
+        f"👥 <b>Active Users:</b> {active_users}\n\n"
+        f"⚠️ <b>Warning:</b> This will send a message to ALL users. Use carefully!\n\n"
+        f"💡 <b>How to use:</b>\n"
+        f"1. Click 'Send Broadcast' below\n"
+        f"2. Type your message\n"
+        f"3. Confirm to send to all users"
+    )
     
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
@@ -4658,7 +4965,7 @@ async def admin_broadcast_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(broadcast_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, broadcast_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -4668,14 +4975,12 @@ async def admin_broadcast_send_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
     
     # Store that user is in broadcast mode
-    user_data[user_id]['broadcast_mode'] = True
+    broadcast_mode_admins.add(user_id)
     
     broadcast_text = f"📢 <b>Broadcast Message</b>\n\n"
     broadcast_text += f"Please type your broadcast message now.\n\n"
@@ -4691,17 +4996,76 @@ async def admin_broadcast_send_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(broadcast_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, broadcast_text, reply_markup=keyboard)
     await callback.answer()
 
 
+class _TokenBucket:
+    """Minimal asyncio token bucket: `rate` operations per `period` seconds.
+
+    Keeps the broadcast fan-out riding at Telegram's bot-wide send cap
+    instead of bursting past it and collapsing into 429 backoff. One
+    instance is shared module-wide so overlapping broadcasts draw from
+    the same budget.
+    """
+
+    def __init__(self, rate: int, period: float = 1.0):
+        self._rate = rate
+        self._period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self._rate),
+                    self._tokens + (now - self._updated) * self._rate / self._period
+                )
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) * self._period / self._rate)
+
+
+# Telegram allows ~30 messages/second bot-wide
+_broadcast_limiter = _TokenBucket(30)
+
+
+async def _broadcast_send_one(target_user_id: int, text: str, sem: asyncio.Semaphore, progress: dict) -> bool:
+    """Send one broadcast copy under the shared concurrency and rate bounds"""
+    try:
+        async with sem:
+            try:
+                await _broadcast_limiter.acquire()
+                await bot.send_message(chat_id=target_user_id, text=text, parse_mode="HTML")
+                return True
+            except TelegramRetryAfter as e:
+                # Throttled anyway: honor the advertised wait, then retry once
+                await asyncio.sleep(e.retry_after)
+                try:
+                    await bot.send_message(chat_id=target_user_id, text=text, parse_mode="HTML")
+                    return True
+                except Exception as retry_error:
+                    logger.warning("[Broadcast] Retry failed for user %s: %s", target_user_id, retry_error)
+                    return False
+            except Exception as e:
+                logger.warning("[Broadcast] Failed to send to user %s: %s", target_user_id, e)
+                return False
+    finally:
+        # Single-threaded event loop: plain increment needs no lock
+        progress['done'] += 1
+
+
 # Admin Broadcast Confirm Callback
 async def admin_broadcast_confirm_callback(callback: types.CallbackQuery):
     """Handle admin broadcast confirmation"""
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -4712,22 +5076,42 @@ async def admin_broadcast_confirm_callback(callback: types.CallbackQuery):
         await callback.answer("❌ No broadcast message found!", show_alert=True)
         return
     
-    # Send broadcast to all users
-    sent_count = 0
-    failed_count = 0
-    
-    for target_user_id in user_data.keys():
-        try:
-            await bot.send_message(
-                chat_id=target_user_id,
-                text=broadcast_message,
-                parse_mode="HTML"
-            )
-            sent_count += 1
-        except Exception as e:
-            print(f"❌ [Broadcast] Failed to send to user {target_user_id}: {e}")
-            failed_count += 1
-    
+    # Fan out concurrently: the old serial await chain cost one network
+    # round-trip per user; a bounded gather keeps ~25 sends in flight so
+    # wall-clock time tracks Telegram's rate cap instead of N x RTT
+    targets = list(user_data.keys())
+    sem = asyncio.Semaphore(25)
+    progress = {'done': 0}
+
+    async def _report_progress():
+        # Live counter on the admin's message while the fan-out runs; 2s
+        # polling stays clear of the 1 edit/sec per-chat limit
+        while True:
+            await asyncio.sleep(2)
+            try:
+                await callback.message.edit_text(
+                    f"📢 <b>Broadcasting...</b>\n\n✅ Sent: {progress['done']}/{len(targets)}",
+                    parse_mode="HTML"
+                )
+            except TelegramBadRequest:
+                pass  # counter unchanged between polls
+
+    # The progress loop edits the panel message directly, so drop its
+    # safe_edit_message hash — the final summary edit below re-records it
+    _last_edit.pop((callback.message.chat.id, callback.message.message_id), None)
+
+    progress_task = asyncio.create_task(_report_progress())
+    try:
+        results = await asyncio.gather(
+            *(_broadcast_send_one(target_user_id, broadcast_message, sem, progress)
+              for target_user_id in targets)
+        )
+    finally:
+        progress_task.cancel()
+    sent_count = sum(results)
+    failed_count = len(results) - sent_count
+
+
     # Clear broadcast message
     user_data[user_id]['broadcast_message'] = ''
     
@@ -4744,7 +5128,7 @@ async def admin_broadcast_confirm_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
     await callback.answer(f"Broadcast sent to {sent_count} users!")
 
 
@@ -4754,33 +5138,18 @@ async def admin_analytics_reports_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
-    
-    admin_text = f"{get_admin_text(user_id, 'analytics_reports_title')}\n\n{get_admin_text(user_id, 'admin_welcome')}"
-    
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "daily_reports"), callback_data="admin_daily_reports"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "weekly_reports"), callback_data="admin_weekly_reports")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "monthly_reports"), callback_data="admin_monthly_reports"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "popular_packages"), callback_data="admin_popular_packages")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "user_retention"), callback_data="admin_user_retention"),
-            InlineKeyboardButton(text=get_admin_text(user_id, "export_data"), callback_data="admin_export_data")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_panel")
-        ]
-    ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    admin_text, keyboard = _admin_menu_for('analytics', user_id, 'analytics_reports_title', (
+        (("daily_reports", "admin_daily_reports"), ("weekly_reports", "admin_weekly_reports")),
+        (("monthly_reports", "admin_monthly_reports"), ("popular_packages", "admin_popular_packages")),
+        (("user_retention", "admin_user_retention"), ("export_data", "admin_export_data")),
+        (("back_to_main", "admin_panel"),),
+    ))
+
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -4790,7 +5159,6 @@ async def admin_view_users_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -4802,108 +5170,51 @@ async def admin_view_users_callback(callback: types.CallbackQuery):
         except:
             page = 1
     
-    from translations import get_admin_text
     
-    # Get user statistics
+    # Counts come off the O(1) in-memory counters; the distribution and the
+    # visible page are fetched from sqlite instead of copying and scanning
+    # the whole user dict per click
     total_users = len(user_data)
-    active_users = sum(1 for user in user_data.values() if user.get('spins_available', 0) > 0)
-    
-    # Get package distribution
-    package_stats = {}
-    for user in user_data.values():
-        package = user.get('package', 'None')
-        package_stats[package] = package_stats.get(package, 0) + 1
-    
-    stats_text = f"📊 <b>User Statistics</b>\n\n"
-    stats_text += f"👥 Total Users: {total_users}\n"
-    stats_text += f"🎯 Active Users: {active_users}\n\n"
-    stats_text += f"📦 <b>Package Distribution:</b>\n"
-    
-    for package, count in package_stats.items():
-        stats_text += f"• {package}: {count} users\n"
-    
+    active_users = len(active_user_ids)
+    package_rows = await asyncio.to_thread(_load_package_distribution)
+
+    parts = [
+        f"📊 <b>User Statistics</b>\n\n"
+        f"👥 Total Users: {total_users}\n"
+        f"🎯 Active Users: {active_users}\n\n"
+        f"📦 <b>Package Distribution:</b>\n"
+    ]
+
+    for package, count in package_rows:
+        parts.append(f"• {package or 'None'}: {count} users\n")
+
     # Pagination settings
     items_per_page = 10
     offset = (page - 1) * items_per_page
-    
-    # Add paginated user list
-    stats_text += f"\n👥 <b>Users (Page {page}):</b>\n"
-    
-    # Convert user_data to list for pagination
-    user_list = list(user_data.items())
-    total_pages = max(1, (len(user_list) + items_per_page - 1) // items_per_page)
-    
-    # Get paginated users
-    paginated_users = user_list[offset:offset + items_per_page]
-    
-    for user_id_item, user in paginated_users:
-        package = user.get('package', 'None')
-        spins = user.get('spins_available', 0)
-        level = user.get('level', 'Spinner')
-        created_at = format_timestamp(user.get('created_at', 'Unknown'))
-        
-        stats_text += f"• <b>ID:</b> {user_id_item}\n"
-        stats_text += f"  📦 Package: {package} | 🎯 Spins: {spins}\n"
-        stats_text += f"  🏆 Level: {level} | 📅 Created: {created_at}\n\n"
-    
+    total_pages = max(1, (total_users + items_per_page - 1) // items_per_page)
+
+    # Add paginated user list (LIMIT/OFFSET over the user_id primary key)
+    parts.append(f"\n👥 <b>Users (Page {page}):</b>\n")
+
+    rows = await asyncio.to_thread(get_user_overview_page, offset, items_per_page)
+    # created_at arrives pre-formatted by strftime inside the query
+    for user_id_item, package, spins, level, created in rows:
+        parts.append(
+            f"• <b>ID:</b> {user_id_item}\n"
+            f"  📦 Package: {package or 'None'} | 🎯 Spins: {spins}\n"
+            f"  🏆 Level: {level or 'Spinner'} | 📅 Created: {created}\n\n"
+        )
+
+    stats_text = "".join(parts)
+
     # Create pagination keyboard
     keyboard = create_pagination_keyboard(page, total_pages, "admin_view_users")
     keyboard.inline_keyboard.append([InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_user_management")])
     
-    try:
-        await callback.message.edit_text(stats_text, reply_markup=keyboard, parse_mode="HTML")
-    except Exception as e:
-        # If message is not modified, just answer the callback
-        if "message is not modified" in str(e):
-            await callback.answer()
-            return
-        else:
-            print(f"Error editing message: {e}")
+    await safe_edit_message(callback, stats_text, reply_markup=keyboard)
     await callback.answer()
 
 
-# Admin Give Package Callback
-async def admin_give_package_callback(callback: types.CallbackQuery):
-    """Handle giving a package to a user"""
-    user_id = callback.from_user.id
-    
-    if not is_admin(user_id):
-        import translations
-        await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
-        return
-    
-    # Extract target user ID and package from callback data
-    # Format: admin_give_package_{target_user_id}_{package_name}
-    parts = callback.data.split("_")
-    if len(parts) >= 5:
-        target_user_id = int(parts[3])
-        package_name = "_".join(parts[4:])  # In case package name has underscores
-        
-        # Get package details from config
-        package_info = config.PACKAGES.get(package_name)
-        if not package_info:
-            await callback.answer("❌ Package not found!", show_alert=True)
-            return
-        
-        # Update user data
-        if target_user_id in globals()['user_data']:
-            globals()['user_data'][target_user_id]["package"] = package_name
-            globals()['user_data'][target_user_id]["spins_available"] = package_info["spins"]
-            globals()['user_data'][target_user_id]["hits"] = 0  # Reset hits for new package
-            globals()['user_data'][target_user_id]["total_spins"] = 0  # Reset total spins
-            globals()['user_data'][target_user_id]["updated_at"] = datetime.now().isoformat()
-            
-            # Save to database
-            save_user_data_to_db(target_user_id, globals()['user_data'][target_user_id])
-            
-            from translations import get_admin_text
-            await callback.answer(f"✅ {package_name} package given to user {target_user_id}!", show_alert=True)
-        else:
-            await callback.answer("❌ User not found!", show_alert=True)
-    else:
-        await callback.answer("❌ Invalid data format!", show_alert=True)
-
-
 # Message handler for user ID input
 @router.message(lambda message: message.text and message.text.isdigit())
 async def handle_user_id_input(message: types.Message):
@@ -4916,39 +5227,36 @@ async def handle_user_id_input(message: types.Message):
     target_user_id = int(message.text)
     
     if target_user_id not in user_data:
-        from translations import get_admin_text
         await message.reply(f"❌ {get_admin_text(user_id, 'user_not_found')}")
         return
     
     # Get user data
     user = user_data[target_user_id]
     
-    # Format user details
-    user_details = f"👤 <b>User Details</b>\n\n"
-    user_details += f"🆔 <b>User ID:</b> {target_user_id}\n"
-    
     # Format timestamps properly using utility function
     created_at = format_timestamp(user.get('created_at', 'Unknown'))
     updated_at = format_timestamp(user.get('updated_at', 'Unknown'))
-    
-    user_details += f"📅 <b>Created:</b> {created_at}\n"
-    user_details += f"🕒 <b>Last Activity:</b> {updated_at}\n"
-    user_details += f"🌐 <b>Language:</b> {user.get('language', 'en')}\n\n"
-    
-    user_details += f"📦 <b>Current Package:</b> {user.get('package', 'None').title() if user.get('package', 'None') != 'None' else 'None'}\n"
-    user_details += f"🏆 <b>Level:</b> {user.get('level', 'Spinner')}\n"
-    user_details += f"⭐ <b>Spin Points:</b> {user.get('spin_points', 0)}\n\n"
-    
-    user_details += f"🎰 <b>Spins Available:</b> {user.get('spins_available', 0)}\n"
-    user_details += f"🎯 <b>Total Spins:</b> {user.get('total_spins', 0)}\n"
-    user_details += f"🎯 <b>Total Hits:</b> {user.get('hits', 0)}\n"
-    user_details += f"🎁 <b>NFTs Earned:</b> {len(user.get('nfts', []))}\n\n"
-    
-    user_details += f"👥 <b>Referrals:</b> {user.get('referrals', 0)}\n"
-    user_details += f"🔗 <b>Referred By:</b> {user.get('referred_by', 'None')}\n"
+
+    # One f-string instead of a dozen += concatenations: each += copies
+    # every byte written so far, so building this block that way is O(n²)
+    user_details = (
+        f"👤 <b>User Details</b>\n\n"
+        f"🆔 <b>User ID:</b> {target_user_id}\n"
+        f"📅 <b>Created:</b> {created_at}\n"
+        f"🕒 <b>Last Activity:</b> {updated_at}\n"
+        f"🌐 <b>Language:</b> {user.get('language', 'en')}\n\n"
+        f"📦 <b>Current Package:</b> {user.get('package', 'None').title() if user.get('package', 'None') != 'None' else 'None'}\n"
+        f"🏆 <b>Level:</b> {user.get('level', 'Spinner')}\n"
+        f"⭐ <b>Spin Points:</b> {user.get('spin_points', 0)}\n\n"
+        f"🎰 <b>Spins Available:</b> {user.get('spins_available', 0)}\n"
+        f"🎯 <b>Total Spins:</b> {user.get('total_spins', 0)}\n"
+        f"🎯 <b>Total Hits:</b> {user.get('hits', 0)}\n"
+        f"🎁 <b>NFTs Earned:</b> {len(user.get('nfts', []))}\n\n"
+        f"👥 <b>Referrals:</b> {user.get('referrals', 0)}\n"
+        f"🔗 <b>Referred By:</b> {user.get('referred_by', 'None')}\n"
+    )
     
     # Create keyboard with package options (using lowercase package names from config)
-    from translations import get_admin_text
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text="📦 Give Bronze", callback_data=f"admin_give_package_{target_user_id}_bronze"),
@@ -4970,33 +5278,40 @@ async def handle_user_id_input(message: types.Message):
 
 
 # Admin Remove Package Callback
+# Callback-data patterns for the package admin flows, compiled once at
+# import so the hot dispatch path does one C-level match instead of
+# split/join gymnastics per click
+_GIVE_PACKAGE_CB_RE = re.compile(r"^admin_give_package_(\d+)_(.+)$")
+_REMOVE_PACKAGE_CB_RE = re.compile(r"^admin_remove_package_(\d+)$")
+
+
 async def admin_remove_package_callback(callback: types.CallbackQuery):
     """Handle removing package from a user"""
     user_id = callback.from_user.id
-    
+
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
-    
+
     # Extract target user ID from callback data
     # Format: admin_remove_package_{target_user_id}
-    parts = callback.data.split("_")
-    if len(parts) >= 4:
-        target_user_id = int(parts[3])
-        
+    match = _REMOVE_PACKAGE_CB_RE.match(callback.data)
+    if match:
+        target_user_id = int(match.group(1))
+
         # Update user data
-        if target_user_id in globals()['user_data']:
-            globals()['user_data'][target_user_id]["package"] = "None"
-            globals()['user_data'][target_user_id]["spins_available"] = 0
-            globals()['user_data'][target_user_id]["hits"] = 0
-            globals()['user_data'][target_user_id]["total_spins"] = 0
-            globals()['user_data'][target_user_id]["updated_at"] = datetime.now().isoformat()
-            
-            # Save to database
-            save_user_data_to_db(target_user_id, globals()['user_data'][target_user_id])
-            
-            from translations import get_admin_text
+        cached = update_user_cache(target_user_id, {
+            "package": "None",
+            "spins_available": 0,
+            "hits": 0,
+            "total_spins": 0,
+            "updated_at": datetime.now().isoformat()
+        })
+        if cached is not None:
+            # Stage for the write-behind flush: a burst of grants costs one
+            # transaction and one fsync instead of one per click
+            queue_user_save(target_user_id)
+
             await callback.answer(f"✅ Package removed from user {target_user_id}!", show_alert=True)
         else:
             await callback.answer("❌ User not found!", show_alert=True)
@@ -5009,17 +5324,15 @@ async def admin_reset_user_callback(callback: types.CallbackQuery):
     """Handle admin reset user menu"""
     user_id = callback.from_user.id
     
-    print(f"🔧 [Admin] Reset user callback triggered for user {user_id}")
+    logger.debug("[Admin] Reset user callback triggered for user %s", user_id)
     
     if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    print(f"✅ [Admin] Reset user access granted for user {user_id}")
+    logger.debug("[Admin] Reset user access granted for user %s", user_id)
     
-    from translations import get_admin_text
     
     admin_text = f"🔄 <b>Reset User Data</b>\n\n"
     admin_text += f"Select a user to reset their data:\n\n"
@@ -5027,11 +5340,7 @@ async def admin_reset_user_callback(callback: types.CallbackQuery):
     
     # Get all users from database
     try:
-        conn = sqlite3.connect('cgspins.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_id, username, spins_available FROM users ORDER BY user_id DESC LIMIT 20")
-        users = cursor.fetchall()
-        conn.close()
+        users = await asyncio.to_thread(_load_recent_users)
         
         if not users:
             keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -5062,13 +5371,7 @@ async def admin_reset_user_callback(callback: types.CallbackQuery):
         ])
         admin_text = f"❌ <b>Error loading users:</b>\n\n{str(e)}"
     
-    try:
-        await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
-    except Exception as e:
-        if "message is not modified" in str(e):
-            pass
-        else:
-            print(f"Error editing message: {e}")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -5077,17 +5380,15 @@ async def admin_give_package_callback(callback: types.CallbackQuery):
     """Handle admin give package menu"""
     user_id = callback.from_user.id
     
-    print(f"🔧 [Admin] Give package callback triggered for user {user_id}")
+    logger.debug("[Admin] Give package callback triggered for user %s", user_id)
     
     if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    print(f"✅ [Admin] Give package access granted for user {user_id}")
+    logger.debug("[Admin] Give package access granted for user %s", user_id)
     
-    from translations import get_admin_text
     
     admin_text = f"📦 <b>Give Package to User</b>\n\n"
     admin_text += f"Select a user to give a package to:\n\n"
@@ -5095,11 +5396,7 @@ async def admin_give_package_callback(callback: types.CallbackQuery):
     
     # Get all users from database
     try:
-        conn = sqlite3.connect('cgspins.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_id, username, package, spins_available FROM users ORDER BY user_id DESC LIMIT 20")
-        users = cursor.fetchall()
-        conn.close()
+        users = await asyncio.to_thread(_load_recent_users, 20, True)
         
         if not users:
             keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -5131,13 +5428,7 @@ async def admin_give_package_callback(callback: types.CallbackQuery):
         ])
         admin_text = f"❌ <b>Error loading users:</b>\n\n{str(e)}"
     
-    try:
-        await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
-    except Exception as e:
-        if "message is not modified" in str(e):
-            pass
-        else:
-            print(f"Error editing message: {e}")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -5146,20 +5437,18 @@ async def admin_select_package_callback(callback: types.CallbackQuery):
     """Handle admin select package for user"""
     user_id = callback.from_user.id
     
-    print(f"🔧 [Admin] Select package callback triggered for user {user_id}")
+    logger.debug("[Admin] Select package callback triggered for user %s", user_id)
     
     if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    print(f"✅ [Admin] Select package access granted for user {user_id}")
+    logger.debug("[Admin] Select package access granted for user %s", user_id)
     
-    from translations import get_admin_text
     
     # Extract target user ID from callback data
-    target_user_id = int(callback.data.split("_")[-1])
+    target_user_id = int(callback.data.rsplit("_", 1)[-1])
     
     # Get user data
     user_data = get_user_data_from_db(target_user_id)
@@ -5193,13 +5482,7 @@ async def admin_select_package_callback(callback: types.CallbackQuery):
             ]
         ])
     
-    try:
-        await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
-    except Exception as e:
-        if "message is not modified" in str(e):
-            pass
-        else:
-            print(f"Error editing message: {e}")
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -5208,27 +5491,30 @@ async def admin_give_specific_package_callback(callback: types.CallbackQuery):
     """Handle admin give specific package to user"""
     user_id = callback.from_user.id
     
-    print(f"🔧 [Admin] Give specific package callback triggered for user {user_id}")
+    logger.debug("[Admin] Give specific package callback triggered for user %s", user_id)
     
     if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    print(f"✅ [Admin] Give specific package access granted for user {user_id}")
+    logger.debug("[Admin] Give specific package access granted for user %s", user_id)
     
-    from translations import get_admin_text
     
     # Extract user ID and package from callback data
-    parts = callback.data.split("_")
-    target_user_id = int(parts[-2])
-    package_type = parts[-1]
-    
-    # Get user data
-    user_data = get_user_data_from_db(target_user_id)
+    # Format: admin_give_package_{target_user_id}_{package_type}
+    match = _GIVE_PACKAGE_CB_RE.match(callback.data)
+    if not match:
+        await callback.answer("❌ Invalid data format!", show_alert=True)
+        return
+    target_user_id = int(match.group(1))
+    package_type = match.group(2)
     
-    if not user_data:
+    # Get user data (named target_data so it doesn't shadow the module-level
+    # user_data cache, which this handler also has to update)
+    target_data = get_user_data_from_db(target_user_id)
+
+    if not target_data:
         result_text = f"❌ <b>User Not Found</b>\n\nUser ID: {target_user_id}\n\nThis user does not exist in the system."
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_give_package")]
@@ -5243,37 +5529,38 @@ async def admin_give_specific_package_callback(callback: types.CallbackQuery):
         else:
             # Give package to user
             package_info = config.PACKAGES[package_type]
-            username = user_data.get('username', '')
+            username = target_data.get('username', '')
             display_name = f"@{username}" if username else f"User {target_user_id}"
-            
+
             # Update user data with new package
-            user_data['package'] = package_info['name']
-            user_data['spins_available'] = package_info['spins']
-            user_data['total_spins'] = 0
-            user_data['hits'] = 0
-            user_data['updated_at'] = datetime.now().isoformat()
-            
-            # Save updated user data to database
-            success = save_user_data_to_db(target_user_id, user_data)
-            
+            patch = {
+                'package': package_info['name'],
+                'spins_available': package_info['spins'],
+                'total_spins': 0,
+                'hits': 0,
+                'updated_at': datetime.now().isoformat()
+            }
+            target_data.update(patch)
+
+            if update_user_cache(target_user_id, patch) is not None:
+                # User is live in memory: stage the row for the write-behind
+                # flush and answer immediately, same as the remove handler
+                queue_user_save(target_user_id)
+                success = True
+            else:
+                # DB-only user; write the row off the event loop
+                success = await asyncio.to_thread(save_user_data_to_db, target_user_id, target_data)
+
             if success:
-                # Also update in-memory data if it exists
-                if target_user_id in globals()['user_data']:
-                    globals()['user_data'][target_user_id].update({
-                        'package': package_info['name'],
-                        'spins_available': package_info['spins'],
-                        'total_spins': 0,
-                        'hits': 0,
-                        'updated_at': datetime.now().isoformat()
-                    })
-                
-                result_text = f"✅ <b>Package Given Successfully!</b>\n\n"
-                result_text += f"👤 <b>User:</b> {display_name} (ID: {target_user_id})\n"
-                result_text += f"📦 <b>Package:</b> {package_info['name']}\n"
-                result_text += f"🎰 <b>Spins:</b> {package_info['spins']}\n"
-                result_text += f"🎯 <b>Hits Required:</b> {package_info['hits_required']}\n"
-                result_text += f"🎁 <b>NFT Chance:</b> {package_info['nft_chance']*100:.1f}%\n\n"
-                result_text += f"🎉 <b>User can now start spinning with their new package!</b>"
+                result_text = (
+                    f"✅ <b>Package Given Successfully!</b>\n\n"
+                    f"👤 <b>User:</b> {display_name} (ID: {target_user_id})\n"
+                    f"📦 <b>Package:</b> {package_info['name']}\n"
+                    f"🎰 <b>Spins:</b> {package_info['spins']}\n"
+                    f"🎯 <b>Hits Required:</b> {package_info['hits_required']}\n"
+                    f"🎁 <b>NFT Chance:</b> {package_info['nft_chance']*100:.1f}%\n\n"
+                    f"🎉 <b>User can now start spinning with their new package!</b>"
+                )
             else:
                 result_text = f"❌ <b>Failed to Give Package</b>\n\nUser ID: {target_user_id}\n\nDatabase update failed. Please try again."
             
@@ -5288,95 +5575,84 @@ async def admin_give_specific_package_callback(callback: types.CallbackQuery):
                 ]
             ])
     
-    try:
-        await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
-    except Exception as e:
-        if "message is not modified" in str(e):
-            pass
-        else:
-            print(f"Error editing message: {e}")
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
     await callback.answer()
 
 
 # Admin Database Management Callback
+# language -> shared action keyboard for the menu below
+_db_mgmt_keyboards = {}
+
+
 async def admin_database_management_callback(callback: types.CallbackQuery):
     """Handle admin database management"""
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
     
-    # Get database statistics
+    # Get database statistics. The table figures come from the cached and
+    # aggregate helpers instead of four COUNT(*) B-tree walks per click,
+    # and the whole-file PRAGMA integrity_check runs only behind the
+    # dedicated "Integrity Check" button below.
     try:
-        from src.models.database_enhanced import get_db_pool
-        import sqlite3
-        import os
-        
-        db_pool = get_db_pool()
-        db_stats = {}
-        
-        with db_pool.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get table statistics
-            tables = ['users', 'pending_ton_payments', 'processed_transactions', 'stars_transactions']
-            for table in tables:
-                try:
-                    cursor.execute(f'SELECT COUNT(*) FROM {table}')
-                    count = cursor.fetchone()[0]
-                    db_stats[table] = count
-                except:
-                    db_stats[table] = 0
-            
-            # Get database file size
-            db_size = os.path.getsize('cgspins.db') if os.path.exists('cgspins.db') else 0
-            db_stats['file_size_mb'] = round(db_size / (1024 * 1024), 2)
-            
-            # Get database integrity info
-            cursor.execute('PRAGMA integrity_check')
-            integrity = cursor.fetchone()[0]
-            db_stats['integrity'] = integrity
-            
-            # Get database version
-            cursor.execute('PRAGMA user_version')
-            db_stats['version'] = cursor.fetchone()[0]
-        
-        admin_text = f"🗄️ <b>Database Management</b>\n\n"
-        admin_text += f"📊 <b>Database Statistics:</b>\n"
-        admin_text += f"   👥 Users: {db_stats.get('users', 0):,}\n"
-        admin_text += f"   💳 Pending Payments: {db_stats.get('pending_ton_payments', 0)}\n"
-        admin_text += f"   ✅ Processed Transactions: {db_stats.get('processed_transactions', 0)}\n"
-        admin_text += f"   ⭐ Stars Transactions: {db_stats.get('stars_transactions', 0)}\n"
-        admin_text += f"   📁 File Size: {db_stats.get('file_size_mb', 0)} MB\n"
-        admin_text += f"   🔍 Integrity: {db_stats.get('integrity', 'Unknown')}\n"
-        admin_text += f"   📋 Version: {db_stats.get('version', 'Unknown')}\n\n"
-        admin_text += f"🔧 <b>Available Actions:</b>"
-        
+        user_count = await asyncio.to_thread(count_users)
+        ton_tx_count, _ = await asyncio.to_thread(get_ton_totals)
+        stars_tx_count, _ = await asyncio.to_thread(get_stars_totals)
+
+        def _read_user_version() -> int:
+            with read_conn() as conn:
+                return conn.execute('PRAGMA user_version').fetchone()[0]
+
+        db_version = await asyncio.to_thread(_read_user_version)
+
+        # Single stat syscall, cheap
+        db_size = os.path.getsize('cgspins.db') if os.path.exists('cgspins.db') else 0
+        file_size_mb = round(db_size / (1024 * 1024), 2)
+
+        admin_text = (
+            f"🗄️ <b>Database Management</b>\n\n"
+            f"📊 <b>Database Statistics:</b>\n"
+            f"   👥 Users: {user_count:,}\n"
+            f"   💳 Pending Payments: {len(pending_ton_payments)}\n"
+            f"   ✅ Processed Transactions: {ton_tx_count}\n"
+            f"   ⭐ Stars Transactions: {stars_tx_count}\n"
+            f"   📁 File Size: {file_size_mb} MB\n"
+            f"   📋 Version: {db_version}\n\n"
+            f"🔧 <b>Available Actions:</b>"
+        )
+
     except Exception as e:
         admin_text = f"🗄️ <b>Database Management</b>\n\n❌ <b>Error:</b> {str(e)}"
-    
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="💾 Backup Database", callback_data="admin_db_backup"),
-            InlineKeyboardButton(text="🔄 Optimize Database", callback_data="admin_db_optimize")
-        ],
-        [
-            InlineKeyboardButton(text="🧹 Clean Old Data", callback_data="admin_db_cleanup"),
-            InlineKeyboardButton(text="📊 Database Stats", callback_data="admin_db_stats")
-        ],
-        [
-            InlineKeyboardButton(text="🔍 Integrity Check", callback_data="admin_db_integrity"),
-            InlineKeyboardButton(text="📋 Export Data", callback_data="admin_db_export")
-        ],
-        [
-            InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_system_management")
-        ]
-    ])
-    
+
+    # The text above is dynamic but the action keyboard is static apart from
+    # the localized back button, so it's built once per language and shared
+    # (handlers never mutate markup objects)
+    lang = translations.get_user_language(user_id)
+    keyboard = _db_mgmt_keyboards.get(lang)
+    if keyboard is None:
+        keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [
+                InlineKeyboardButton(text="💾 Backup Database", callback_data="admin_db_backup"),
+                InlineKeyboardButton(text="🔄 Optimize Database", callback_data="admin_db_optimize")
+            ],
+            [
+                InlineKeyboardButton(text="🧹 Clean Old Data", callback_data="admin_db_cleanup"),
+                InlineKeyboardButton(text="📊 Database Stats", callback_data="admin_db_stats")
+            ],
+            [
+                InlineKeyboardButton(text="🔍 Integrity Check", callback_data="admin_db_integrity"),
+                InlineKeyboardButton(text="📋 Export Data", callback_data="admin_db_export")
+            ],
+            [
+                InlineKeyboardButton(text=get_admin_text(user_id, "back_to_main"), callback_data="admin_system_management")
+            ]
+        ])
+        _db_mgmt_keyboards[lang] = keyboard
+
+
     await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
@@ -5387,11 +5663,9 @@ async def admin_db_stats_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
     import os
     
     try:
@@ -5400,7 +5674,7 @@ async def admin_db_stats_callback(callback: types.CallbackQuery):
         db_size_mb = db_size / (1024 * 1024)
         
         # Get database statistics
-        conn = sqlite3.connect('cgspins.db')
+        conn = db_connect()
         cursor = conn.cursor()
         
         # Count records in each table
@@ -5489,15 +5763,13 @@ async def admin_db_integrity_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
     
     try:
         # Perform integrity check
-        conn = sqlite3.connect('cgspins.db')
+        conn = db_connect()
         cursor = conn.cursor()
         
         # Run PRAGMA integrity_check
@@ -5573,11 +5845,9 @@ async def admin_logs_monitoring_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
     
     # Get system metrics
     try:
@@ -5629,7 +5899,7 @@ async def admin_logs_monitoring_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -5639,11 +5909,9 @@ async def admin_maintenance_mode_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    from translations import get_admin_text
     
     # Check current maintenance mode status
     global maintenance_mode
@@ -5683,7 +5951,7 @@ async def admin_maintenance_mode_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -5693,7 +5961,6 @@ async def admin_toggle_maintenance_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -5702,7 +5969,7 @@ async def admin_toggle_maintenance_callback(callback: types.CallbackQuery):
     maintenance_mode = not maintenance_mode
     
     # Log the action
-    print(f"🔧 [Admin] User {user_id} {'enabled' if maintenance_mode else 'disabled'} maintenance mode")
+    logger.info("[Admin] User %s %s maintenance mode", user_id, 'enabled' if maintenance_mode else 'disabled')
     
     if maintenance_mode:
         result_text = "🚧 <b>Maintenance Mode ENABLED</b>\n\n"
@@ -5724,7 +5991,7 @@ async def admin_toggle_maintenance_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
     await callback.answer(f"Maintenance mode {'enabled' if maintenance_mode else 'disabled'}!")
 
 
@@ -5734,7 +6001,6 @@ async def admin_db_backup_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -5763,7 +6029,7 @@ async def admin_db_backup_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -5773,14 +6039,13 @@ async def admin_db_optimize_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
     try:
         import sqlite3
         
-        conn = sqlite3.connect('cgspins.db')
+        conn = db_connect()
         cursor = conn.cursor()
         
         # Run VACUUM to optimize database
@@ -5811,7 +6076,7 @@ async def admin_db_optimize_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -5821,7 +6086,6 @@ async def admin_db_cleanup_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -5829,7 +6093,7 @@ async def admin_db_cleanup_callback(callback: types.CallbackQuery):
         import sqlite3
         from datetime import datetime, timedelta
         
-        conn = sqlite3.connect('cgspins.db')
+        conn = db_connect()
         cursor = conn.cursor()
         cleanup_stats = {}
         
@@ -5873,7 +6137,7 @@ async def admin_db_cleanup_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -5883,7 +6147,6 @@ async def admin_daily_reports_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -5961,7 +6224,7 @@ async def admin_daily_reports_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -5971,7 +6234,6 @@ async def admin_weekly_reports_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6056,7 +6318,7 @@ async def admin_weekly_reports_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6066,7 +6328,6 @@ async def admin_popular_packages_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6135,7 +6396,7 @@ async def admin_popular_packages_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6145,7 +6406,6 @@ async def admin_user_retention_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6233,7 +6493,7 @@ async def admin_user_retention_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6243,7 +6503,6 @@ async def admin_export_data_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6311,7 +6570,7 @@ async def admin_export_data_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6321,7 +6580,6 @@ async def admin_nft_distribution_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6397,7 +6655,7 @@ async def admin_nft_distribution_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6410,7 +6668,6 @@ async def admin_hit_rate_analytics_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6504,7 +6761,7 @@ async def admin_hit_rate_analytics_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6514,7 +6771,6 @@ async def admin_nft_analytics_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6607,7 +6863,7 @@ async def admin_nft_analytics_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6617,12 +6873,10 @@ async def admin_update_translations_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
     try:
-        import translations
         
         # Get current translation statistics
         total_translations = len(translations.TRANSLATIONS.get('en', {}))
@@ -6657,7 +6911,7 @@ async def admin_update_translations_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6667,7 +6921,6 @@ async def admin_package_pricing_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6714,7 +6967,7 @@ async def admin_package_pricing_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6727,7 +6980,6 @@ async def admin_pricing_analytics_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6815,7 +7067,7 @@ async def admin_pricing_analytics_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6825,7 +7077,6 @@ async def admin_pending_payments_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -6834,7 +7085,7 @@ async def admin_pending_payments_callback(callback: types.CallbackQuery):
         import sqlite3
         
         # Use direct database connection to avoid schema issues
-        conn = sqlite3.connect('cgspins.db')
+        conn = db_connect()
         cursor = conn.cursor()
         
         # Check table schema first
@@ -6952,7 +7203,7 @@ async def admin_pending_payments_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -6962,7 +7213,6 @@ async def admin_transaction_history_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -7079,15 +7329,7 @@ async def admin_transaction_history_callback(callback: types.CallbackQuery):
             [InlineKeyboardButton(text="🔙 Back to Financial", callback_data="admin_financial_management")]
         ])
     
-    try:
-        await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
-    except Exception as e:
-        # If message is not modified, just answer the callback
-        if "message is not modified" in str(e):
-            await callback.answer()
-            return
-        else:
-            print(f"Error editing message: {e}")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -7097,7 +7339,6 @@ async def admin_advanced_revenue_analytics_callback(callback: types.CallbackQuer
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -7212,7 +7453,7 @@ async def admin_advanced_revenue_analytics_callback(callback: types.CallbackQuer
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -7222,7 +7463,6 @@ async def admin_clean_expired_payments_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -7266,7 +7506,7 @@ async def admin_clean_expired_payments_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(result_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, result_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -7299,14 +7539,18 @@ if __name__ == "__main__":
             print("   - Bot will continue with limited functionality")
         
         asyncio.create_task(ton_payment_checker())
+        asyncio.create_task(pending_writes_flusher())
         # Start the bot
-        await dp.start_polling(bot, skip_updates=False)
+        try:
+            await dp.start_polling(bot, skip_updates=False)
+        finally:
+            # Force-flush staged admin writes so shutdown loses nothing
+            flush_pending_writes()
     
 # Missing Admin Functions
 async def admin_view_logs_callback(callback: types.CallbackQuery):
     """Handle admin view logs"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7342,14 +7586,13 @@ async def admin_view_logs_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_system_metrics_callback(callback: types.CallbackQuery):
     """Handle admin system metrics"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7393,14 +7636,13 @@ async def admin_system_metrics_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_health_check_callback(callback: types.CallbackQuery):
     """Handle admin health check"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7412,7 +7654,7 @@ async def admin_health_check_callback(callback: types.CallbackQuery):
         
         # Check database connection
         try:
-            conn = sqlite3.connect('cgspins.db')
+            conn = db_connect()
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM users")
             conn.close()
@@ -7458,14 +7700,13 @@ async def admin_health_check_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_view_alerts_callback(callback: types.CallbackQuery):
     """Handle admin view alerts"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7519,7 +7760,7 @@ async def admin_view_alerts_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -7527,7 +7768,6 @@ async def admin_view_alerts_callback(callback: types.CallbackQuery):
 async def admin_alert_settings_callback(callback: types.CallbackQuery):
     """Handle admin alert settings"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7564,14 +7804,13 @@ async def admin_alert_settings_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_reset_metrics_callback(callback: types.CallbackQuery):
     """Handle admin reset metrics"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7613,7 +7852,7 @@ async def admin_reset_metrics_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -7621,7 +7860,6 @@ async def admin_reset_metrics_callback(callback: types.CallbackQuery):
 async def admin_set_maintenance_message_callback(callback: types.CallbackQuery):
     """Handle admin set maintenance message"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7657,14 +7895,13 @@ async def admin_set_maintenance_message_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_schedule_maintenance_callback(callback: types.CallbackQuery):
     """Handle admin schedule maintenance"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7718,14 +7955,13 @@ async def admin_schedule_maintenance_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_schedule_time_callback(callback: types.CallbackQuery, schedule_type: str):
     """Handle admin schedule maintenance time selection"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7767,7 +8003,7 @@ async def admin_schedule_time_callback(callback: types.CallbackQuery, schedule_t
                 ]
             ])
             
-            await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+            await safe_edit_message(callback, admin_text, reply_markup=keyboard)
             await callback.answer()
             return
         
@@ -7800,7 +8036,7 @@ async def admin_schedule_time_callback(callback: types.CallbackQuery, schedule_t
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -7811,7 +8047,6 @@ async def admin_schedule_time_callback(callback: types.CallbackQuery, schedule_t
 async def admin_edit_prices_callback(callback: types.CallbackQuery):
     """Handle admin edit package prices"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7873,7 +8108,7 @@ async def admin_edit_prices_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -7881,7 +8116,6 @@ async def admin_edit_prices_callback(callback: types.CallbackQuery):
 async def admin_edit_individual_price_callback(callback: types.CallbackQuery, package_type: str):
     """Handle admin edit individual package price"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -7959,14 +8193,13 @@ async def admin_edit_individual_price_callback(callback: types.CallbackQuery, pa
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_bulk_edit_prices_callback(callback: types.CallbackQuery):
     """Handle admin bulk edit prices"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8029,14 +8262,13 @@ async def admin_bulk_edit_prices_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_price_history_callback(callback: types.CallbackQuery):
     """Handle admin price history"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8080,14 +8312,13 @@ async def admin_price_history_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_revenue_projections_callback(callback: types.CallbackQuery):
     """Handle admin revenue projections"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8144,14 +8375,13 @@ async def admin_revenue_projections_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_price_optimization_callback(callback: types.CallbackQuery):
     """Handle admin price optimization"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8213,14 +8443,13 @@ async def admin_price_optimization_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_pricing_analytics_callback(callback: types.CallbackQuery):
     """Handle admin pricing analytics"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8283,7 +8512,7 @@ async def admin_pricing_analytics_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -8291,7 +8520,6 @@ async def admin_pricing_analytics_callback(callback: types.CallbackQuery):
 async def admin_price_adjustment_callback(callback: types.CallbackQuery, adjustment_data: str):
     """Handle admin price adjustment (percentage changes)"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8336,14 +8564,13 @@ async def admin_price_adjustment_callback(callback: types.CallbackQuery, adjustm
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_custom_price_callback(callback: types.CallbackQuery, custom_data: str):
     """Handle admin custom price input"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8387,14 +8614,13 @@ async def admin_custom_price_callback(callback: types.CallbackQuery, custom_data
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_market_price_callback(callback: types.CallbackQuery, market_data: str):
     """Handle admin market-based pricing"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8435,14 +8661,13 @@ async def admin_market_price_callback(callback: types.CallbackQuery, market_data
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_reset_price_callback(callback: types.CallbackQuery, reset_data: str):
     """Handle admin reset package price"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8486,14 +8711,13 @@ async def admin_reset_price_callback(callback: types.CallbackQuery, reset_data:
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_bulk_price_adjustment_callback(callback: types.CallbackQuery, bulk_data: str):
     """Handle admin bulk price adjustments"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8530,14 +8754,13 @@ async def admin_bulk_price_adjustment_callback(callback: types.CallbackQuery, bu
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_competitive_pricing_callback(callback: types.CallbackQuery):
     """Handle admin competitive pricing analysis"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8578,14 +8801,13 @@ async def admin_competitive_pricing_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_ab_testing_callback(callback: types.CallbackQuery):
     """Handle admin A/B testing for pricing"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8626,14 +8848,13 @@ async def admin_ab_testing_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_export_pricing_data_callback(callback: types.CallbackQuery, export_type: str):
     """Handle admin export pricing data"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8686,14 +8907,13 @@ async def admin_export_pricing_data_callback(callback: types.CallbackQuery, expo
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_optimization_report_callback(callback: types.CallbackQuery):
     """Handle admin optimization report"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8734,7 +8954,7 @@ async def admin_optimization_report_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -8744,7 +8964,6 @@ async def admin_monthly_reports_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     
     if not is_admin(user_id):
-        import translations
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
@@ -8843,14 +9062,13 @@ async def admin_monthly_reports_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_export_monthly_data_callback(callback: types.CallbackQuery):
     """Handle admin export monthly data"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8899,14 +9117,13 @@ async def admin_export_monthly_data_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_monthly_trends_callback(callback: types.CallbackQuery):
     """Handle admin monthly trends analysis"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -8951,14 +9168,13 @@ async def admin_monthly_trends_callback(callback: types.CallbackQuery):
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_export_format_callback(callback: types.CallbackQuery, export_format: str):
     """Handle admin export in specific format"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -9000,14 +9216,13 @@ async def admin_export_format_callback(callback: types.CallbackQuery, export_for
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
 async def admin_trend_analysis_callback(callback: types.CallbackQuery, analysis_type: str):
     """Handle admin trend analysis"""
     user_id = callback.from_user.id
-    import translations
     
     if not is_admin(user_id):
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
@@ -9061,7 +9276,7 @@ async def admin_trend_analysis_callback(callback: types.CallbackQuery, analysis_
         ]
     ])
     
-    await callback.message.edit_text(admin_text, reply_markup=keyboard, parse_mode="HTML")
+    await safe_edit_message(callback, admin_text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -9089,16 +9304,15 @@ async def admin_influencer_management_callback(callback: types.CallbackQuery):
     """Handle admin influencer management menu"""
     user_id = callback.from_user.id
     
-    print(f"🌟 [Admin] Influencer management callback triggered for user {user_id}")
+    logger.debug("[Admin] Influencer management callback triggered for user %s", user_id)
     
     # Check if user is admin
     if not is_admin(user_id):
-        print(f"🚫 [Admin] Access denied for user {user_id} - not admin")
-        import translations
+        logger.warning("[Admin] Access denied for user %s - not admin", user_id)
         await callback.answer(translations.get_text(user_id, "access_denied"), show_alert=True)
         return
     
-    print(f"✅ [Admin] Influencer management access granted for user {user_id}")
+    logger.debug("[Admin] Influencer management access granted for user %s", user_id)
     
     # Get influencer statistics
     from src.models.database_enhanced import load_influencer_commissions, get_influencer_stats
@@ -9326,5 +9540,162 @@ async def admin_export_influencer_data_callback(callback: types.CallbackQuery):
     await callback.message.answer(export_text, reply_markup=keyboard, parse_mode="HTML")
     await callback.answer()
 
+
+# Dispatch tables for admin_debug_callback. Built here, once, after every
+# admin handler is defined. Exact callback_data values resolve with a single
+# dict lookup; parameterized callbacks fall through to the ordered
+# prefix/predicate list below, which keeps the precedence the old elif
+# ladder had.
+ADMIN_EXACT_DISPATCH = {
+    "admin_panel": admin_panel_callback,
+    "admin_user_management": admin_user_management_callback,
+    "admin_user_details": admin_user_details_callback,
+    "admin_financial_management": admin_financial_management_callback,
+    "admin_system_management": admin_system_management_callback,
+    "admin_content_management": admin_content_management_callback,
+    "admin_analytics_reports": admin_analytics_reports_callback,
+    "admin_view_users": admin_view_users_callback,
+    "admin_reset_user": admin_reset_user_callback,
+    "admin_ban_user": admin_ban_user_callback,
+    "admin_give_package": admin_give_package_callback,
+    "admin_package_stats": admin_package_stats_callback,
+    "admin_hit_stats": admin_hit_stats_callback,
+    "admin_payment_tracking": admin_payment_tracking_callback,
+    "admin_revenue_analytics": admin_revenue_analytics_callback,
+    "admin_bot_stats": admin_bot_stats_callback,
+    "admin_broadcast": admin_broadcast_callback,
+    "admin_database_management": admin_database_management_callback,
+    "admin_logs_monitoring": admin_logs_monitoring_callback,
+    "admin_maintenance_mode": admin_maintenance_mode_callback,
+    "admin_toggle_maintenance": admin_toggle_maintenance_callback,
+    "admin_db_backup": admin_db_backup_callback,
+    "admin_db_optimize": admin_db_optimize_callback,
+    "admin_db_cleanup": admin_db_cleanup_callback,
+    "admin_daily_reports": admin_daily_reports_callback,
+    "admin_weekly_reports": admin_weekly_reports_callback,
+    "admin_monthly_reports": admin_weekly_reports_callback,  # Use weekly reports for now
+    "admin_popular_packages": admin_popular_packages_callback,
+    "admin_user_retention": admin_user_retention_callback,
+    "admin_export_data": admin_export_data_callback,
+    "admin_nft_distribution": admin_nft_distribution_callback,
+    "admin_hit_rate_analytics": admin_hit_rate_analytics_callback,
+    "admin_nft_analytics": admin_nft_analytics_callback,
+    "admin_package_pricing": admin_package_pricing_callback,
+    "admin_pricing_analytics": admin_pricing_analytics_callback,
+    "admin_pending_payments": admin_pending_payments_callback,
+    "admin_transaction_history": admin_transaction_history_callback,
+    "admin_advanced_revenue_analytics": admin_advanced_revenue_analytics_callback,
+    "admin_clean_expired_payments": admin_clean_expired_payments_callback,
+    "admin_db_stats": admin_db_stats_callback,
+    "admin_db_integrity": admin_db_integrity_callback,
+    "admin_db_export": admin_export_data_callback,
+    "admin_view_logs": admin_view_logs_callback,
+    "admin_influencer_management": admin_influencer_management_callback,
+    "admin_view_all_commissions": admin_view_all_commissions_callback,
+    "admin_top_earners": admin_top_earners_callback,
+    "admin_commission_analytics": admin_commission_analytics_callback,
+    "admin_export_influencer_data": admin_export_influencer_data_callback,
+    "admin_system_metrics": admin_system_metrics_callback,
+    "admin_health_check": admin_health_check_callback,
+    "admin_view_alerts": admin_view_alerts_callback,
+    "admin_alert_settings": admin_alert_settings_callback,
+    "admin_reset_metrics": admin_reset_metrics_callback,
+    "admin_set_maintenance_message": admin_set_maintenance_message_callback,
+    "admin_schedule_maintenance": admin_schedule_maintenance_callback,
+    "admin_edit_prices": admin_edit_prices_callback,
+    "admin_bulk_edit_prices": admin_bulk_edit_prices_callback,
+    "admin_price_history": admin_price_history_callback,
+    "admin_revenue_projections": admin_revenue_projections_callback,
+    "admin_price_optimization": admin_price_optimization_callback,
+    "admin_competitive_pricing": admin_competitive_pricing_callback,
+    "admin_ab_testing": admin_ab_testing_callback,
+    "admin_optimization_report": admin_optimization_report_callback,
+    "admin_export_monthly_data": admin_export_monthly_data_callback,
+    "admin_monthly_trends": admin_monthly_trends_callback,
+    "admin_market_adjust": lambda cb: admin_market_price_callback(cb, cb.data),
+}
+
+# Exact callbacks whose handlers also take the callback_data string
+for _data, _handler in (
+    ("admin_schedule_30min", admin_schedule_time_callback),
+    ("admin_schedule_1hour", admin_schedule_time_callback),
+    ("admin_schedule_2hours", admin_schedule_time_callback),
+    ("admin_schedule_custom", admin_schedule_time_callback),
+    ("admin_edit_bronze_price", admin_edit_individual_price_callback),
+    ("admin_edit_silver_price", admin_edit_individual_price_callback),
+    ("admin_edit_gold_price", admin_edit_individual_price_callback),
+    ("admin_edit_black_price", admin_edit_individual_price_callback),
+    ("admin_export_price_history", admin_export_pricing_data_callback),
+    ("admin_export_revenue_report", admin_export_pricing_data_callback),
+    ("admin_export_analytics", admin_export_pricing_data_callback),
+    ("admin_export_monthly_csv", admin_export_format_callback),
+    ("admin_export_monthly_json", admin_export_format_callback),
+    ("admin_export_monthly_pdf", admin_export_format_callback),
+    ("admin_export_monthly_excel", admin_export_format_callback),
+    ("admin_detailed_trends", admin_trend_analysis_callback),
+    ("admin_trends_forecast", admin_trend_analysis_callback),
+):
+    ADMIN_EXACT_DISPATCH[_data] = functools.partial(lambda h, cb: h(cb, cb.data), _handler)
+
+_PRICE_ADJUSTMENT_SUFFIXES = ("_+10", "_-10", "_+25", "_-25", "_+50", "_-50")
+
+# Prefix/predicate matchers indexed by the callback's second underscore token.
+# Every prefix embeds its token ("admin_reset_..." -> "reset"), so a callback
+# can only ever match within its own group; order inside a group preserves
+# the old ladder's precedence (reset_user_ before reset_price_).
+ADMIN_PREFIX_DISPATCH = {
+    "reset": [
+        (lambda d: d.startswith("admin_reset_user_"), admin_reset_user_data_callback),
+        (lambda d: d.startswith("admin_reset_price_"),
+         lambda cb: admin_reset_price_callback(cb, cb.data)),
+    ],
+    "ban": [
+        (lambda d: d.startswith("admin_ban_user_"), admin_ban_user_callback),
+    ],
+    "user": [
+        (lambda d: d.startswith("admin_user_stats_"), admin_user_stats_callback),
+        (lambda d: d.startswith("admin_user_details_page_"), admin_user_details_callback),
+        (lambda d: d.startswith("admin_user_detail_"), admin_individual_user_detail_callback),
+    ],
+    "confirm": [
+        (lambda d: d.startswith("admin_confirm_reset_"), admin_confirm_reset_user_data_callback),
+        (lambda d: d.startswith("admin_confirm_ban_"), admin_confirm_ban_user_callback),
+    ],
+    "unban": [
+        (lambda d: d.startswith("admin_unban_user_"), admin_unban_user_callback),
+    ],
+    "select": [
+        (lambda d: d.startswith("admin_select_package_"), admin_select_package_callback),
+    ],
+    "give": [
+        (lambda d: d.startswith("admin_give_package_"), admin_give_specific_package_callback),
+    ],
+    "broadcast": [
+        (lambda d: d.startswith("admin_broadcast_confirm:"), admin_broadcast_confirm_callback),
+    ],
+    "transaction": [
+        (lambda d: d.startswith("admin_transaction_history_page_"), admin_transaction_history_page_callback),
+    ],
+    "view": [
+        (lambda d: d.startswith("admin_view_users_page_"), admin_view_users_page_callback),
+    ],
+    "price": [
+        (lambda d: d.startswith("admin_price_") and any(x in d for x in _PRICE_ADJUSTMENT_SUFFIXES),
+         lambda cb: admin_price_adjustment_callback(cb, cb.data)),
+    ],
+    "custom": [
+        (lambda d: d.startswith("admin_custom_ton_") or d.startswith("admin_custom_stars_"),
+         lambda cb: admin_custom_price_callback(cb, cb.data)),
+    ],
+    "market": [
+        (lambda d: d.startswith("admin_market_price_"),
+         lambda cb: admin_market_price_callback(cb, cb.data)),
+    ],
+    "bulk": [
+        (lambda d: d.startswith("admin_bulk_") and any(x in d for x in _PRICE_ADJUSTMENT_SUFFIXES),
+         lambda cb: admin_bulk_price_adjustment_callback(cb, cb.data)),
+    ],
+}
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -2,7 +2,10 @@
 Database models for CG Spins Bot
 """
 
+from .db import read_conn, write_conn
+
 from .database import (
+    db_connect,
     init_database,
     load_pending_payments,
     load_processed_transactions,
@@ -16,12 +19,29 @@ from .user import (
     remove_pending_payment,
     save_stars_transaction,
     save_user_data,
+    save_users_bulk,
     load_user_data,
     get_user_data,
-    get_all_users
+    get_all_users,
+    get_users_page,
+    get_user_overview_page,
+    get_package_distribution,
+    count_users,
+    get_package_stats,
+    get_level_stats,
+    get_spin_totals,
+    get_ton_totals,
+    get_stars_totals,
+    get_ton_revenue_by_package,
+    get_stars_revenue_by_package,
+    get_recent_ton_transactions,
+    get_recent_stars_transactions
 )
 
 __all__ = [
+    'read_conn',
+    'write_conn',
+    'db_connect',
     'init_database',
     'load_pending_payments', 
     'load_processed_transactions',
@@ -32,7 +52,21 @@ __all__ = [
     'remove_pending_payment',
     'save_stars_transaction',
     'save_user_data',
+    'save_users_bulk',
     'load_user_data',
     'get_user_data',
-    'get_all_users'
+    'get_all_users',
+    'get_users_page',
+    'get_user_overview_page',
+    'get_package_distribution',
+    'count_users',
+    'get_package_stats',
+    'get_level_stats',
+    'get_spin_totals',
+    'get_ton_totals',
+    'get_stars_totals',
+    'get_ton_revenue_by_package',
+    'get_stars_revenue_by_package',
+    'get_recent_ton_transactions',
+    'get_recent_stars_transactions'
 ]
@@ -6,10 +6,32 @@ import sqlite3
 import time
 from typing import Dict, Any, List, Tuple
 
+DB_PATH = 'cgspins.db'
+
+
+def db_connect(path: str = DB_PATH) -> sqlite3.Connection:
+    """Open a SQLite connection with the bot's performance PRAGMAs applied
+
+    journal_mode=WAL persists in the database file, but synchronous,
+    cache_size, temp_store and busy_timeout are per-connection, so every
+    connection runs the full bootstrap. WAL + synchronous=NORMAL removes
+    reader/writer blocking and halves fsyncs per commit.
+    """
+    # check_same_thread=False so pooled connections can be reused across the
+    # event loop and worker threads; serialization is handled by the pool
+    conn = sqlite3.connect(path, check_same_thread=False)
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-20000")  # ~20MB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    return conn
+
 
 def init_database() -> None:
     """Initialize SQLite database with required tables"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     # Create pending TON payments table
@@ -65,7 +87,10 @@ def init_database() -> None:
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
-    
+
+    # The admin package-stats view groups users by package
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_package ON users(package)')
+
     conn.commit()
     conn.close()
     print("✅ [Backend] Database initialized successfully")
@@ -73,7 +98,7 @@ def init_database() -> None:
 
 def load_pending_payments() -> Dict[int, Dict[str, Any]]:
     """Load pending TON payments from database and fix legacy prefixed IDs"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     cursor.execute('SELECT * FROM pending_ton_payments')
@@ -126,7 +151,7 @@ def load_pending_payments() -> Dict[int, Dict[str, Any]]:
 
 def load_processed_transactions() -> set:
     """Load processed transaction hashes from database"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     # Load TON transactions
@@ -147,7 +172,7 @@ def load_processed_transactions() -> set:
 
 def load_ton_transactions() -> list:
     """Load TON transaction data from database"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     cursor.execute('''
         SELECT tx_hash, user_id, package, amount_nano, processed_at
@@ -169,7 +194,7 @@ def load_ton_transactions() -> list:
 
 def load_stars_transactions() -> list:
     """Load Stars transaction data from database"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     cursor.execute('''
         SELECT transaction_id, user_id, package, amount, timestamp
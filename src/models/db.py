@@ -0,0 +1,83 @@
+"""
+SQLite connection pooling for CG Spins Bot
+
+SQLite allows only one writer at a time, so the bot keeps exactly one
+long-lived read-write connection (serialized through a lock — a writer pool
+bigger than one would only generate SQLITE_BUSY) plus a small pool of
+read-only connections that can run in parallel under WAL. This also stops
+hot paths from re-opening the .db/.db-wal/.db-shm files on every query.
+"""
+
+import contextlib
+import os
+import queue
+import sqlite3
+import threading
+
+from .database import DB_PATH, db_connect
+
+# Singleton read-write connection, created lazily
+_write_connection = None
+_write_lock = threading.Lock()
+
+# Small pool of read-only connections (filled lazily)
+_READ_POOL_SIZE = min(4, os.cpu_count() or 1)
+_read_pool = queue.Queue(maxsize=_READ_POOL_SIZE)
+
+
+def _open_read_connection() -> sqlite3.Connection:
+    """Open a read-only connection with the per-connection PRAGMAs applied"""
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, check_same_thread=False)
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+@contextlib.contextmanager
+def write_conn():
+    """Borrow the singleton read-write connection (serialized via a lock)
+
+    The caller is responsible for conn.commit(); a raised exception rolls
+    the connection back so no half-applied writes leak to the next borrower.
+    """
+    global _write_connection
+    with _write_lock:
+        if _write_connection is None:
+            _write_connection = db_connect()
+        try:
+            yield _write_connection
+        except Exception:
+            _write_connection.rollback()
+            raise
+
+
+@contextlib.contextmanager
+def read_conn():
+    """Borrow a read-only connection from the pool"""
+    try:
+        conn = _read_pool.get_nowait()
+    except queue.Empty:
+        conn = _open_read_connection()
+    try:
+        yield conn
+    finally:
+        try:
+            _read_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def close_all() -> None:
+    """Close pooled connections (for shutdown)"""
+    global _write_connection
+    with _write_lock:
+        if _write_connection is not None:
+            _write_connection.close()
+            _write_connection = None
+    while True:
+        try:
+            _read_pool.get_nowait().close()
+        except queue.Empty:
+            break
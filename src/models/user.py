@@ -7,10 +7,39 @@ import time
 from datetime import datetime
 from typing import Dict, Any, List
 
+from .database import db_connect
+from .db import read_conn, write_conn
+
+# Fixed SQL literal for save_user_data: reusing the exact text on the
+# long-lived pooled connection lets sqlite3's statement cache skip the
+# prepare step on every call. The upsert (unlike INSERT OR REPLACE) leaves
+# columns it doesn't mention — username, banned, banned_at, banned_by —
+# untouched on existing rows.
+_SAVE_USER_SQL = '''
+    INSERT INTO users
+    (user_id, balance, package, level, spin_points, hits, total_spins, spins_available, referrals, referred_by, payment_method, nfts, language, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        balance = excluded.balance,
+        package = excluded.package,
+        level = excluded.level,
+        spin_points = excluded.spin_points,
+        hits = excluded.hits,
+        total_spins = excluded.total_spins,
+        spins_available = excluded.spins_available,
+        referrals = excluded.referrals,
+        referred_by = excluded.referred_by,
+        payment_method = excluded.payment_method,
+        nfts = excluded.nfts,
+        language = excluded.language,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at
+'''
+
 
 def save_processed_transaction(tx_hash: str, user_id: int, package: str, amount: int, payment_id: str, source_wallet: str) -> None:
     """Save processed transaction to database"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -26,7 +55,7 @@ def save_processed_transaction(tx_hash: str, user_id: int, package: str, amount:
 
 def save_pending_payment(user_id: int, payment_info: Dict[str, Any]) -> None:
     """Save or update pending TON payment in database"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -52,7 +81,7 @@ def save_pending_payment(user_id: int, payment_info: Dict[str, Any]) -> None:
 
 def remove_pending_payment(user_id: int) -> None:
     """Remove pending TON payment from database"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     cursor.execute('DELETE FROM pending_ton_payments WHERE user_id = ?', (user_id,))
@@ -64,7 +93,7 @@ def remove_pending_payment(user_id: int) -> None:
 
 def save_stars_transaction(transaction_id: str, user_id: int, package: str, amount: int) -> None:
     """Save Stars transaction to database"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -78,18 +107,9 @@ def save_stars_transaction(transaction_id: str, user_id: int, package: str, amou
     print(f"💾 Saved Stars transaction {transaction_id} to database")
 
 
-def save_user_data(user_id: int, user_info: Dict[str, Any]) -> None:
-    """Save user data to database"""
-    conn = sqlite3.connect('cgspins.db')
-    cursor = conn.cursor()
-    
-    now = time.time()
-    
-    cursor.execute('''
-        INSERT OR REPLACE INTO users 
-        (user_id, balance, package, level, spin_points, hits, total_spins, spins_available, referrals, referred_by, payment_method, nfts, language, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+def _user_row(user_id: int, user_info: Dict[str, Any], now: float) -> tuple:
+    """Build the parameter tuple for _SAVE_USER_SQL"""
+    return (
         user_id,
         user_info.get('balance', 1000),
         user_info.get('package', 'None'),
@@ -105,16 +125,33 @@ def save_user_data(user_id: int, user_info: Dict[str, Any]) -> None:
         user_info.get('language', 'en'),
         user_info.get('created_at', now),
         now
-    ))
-    
-    conn.commit()
-    conn.close()
+    )
+
+
+def save_user_data(user_id: int, user_info: Dict[str, Any]) -> None:
+    """Save user data to database"""
+    with write_conn() as conn:
+        conn.execute(_SAVE_USER_SQL, _user_row(user_id, user_info, time.time()))
+        conn.commit()
     print(f"💾 [Backend] Saved user {user_id} data to database")
 
 
+def save_users_bulk(users: Dict[int, Dict[str, Any]]) -> None:
+    """Save many users in a single transaction (one fsync for the batch)"""
+    if not users:
+        return
+    now = time.time()
+    rows = [_user_row(uid, info, now) for uid, info in users.items()]
+    with write_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(_SAVE_USER_SQL, rows)
+        conn.commit()
+    print(f"💾 [Backend] Saved {len(rows)} users to database in one batch")
+
+
 def load_user_data(user_id: int) -> Dict[str, Any]:
     """Load user data from database"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
@@ -173,9 +210,174 @@ def get_user_data(user_id: int) -> Dict[str, Any]:
     return load_user_data(user_id)
 
 
+def get_users_page(offset: int, limit: int) -> List[tuple]:
+    """Fetch one page of users for the admin selection menus
+
+    Keeps menu opens O(page) instead of materializing the whole users table
+    the way get_all_users() does.
+    """
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT user_id, username, package FROM users ORDER BY user_id DESC LIMIT ? OFFSET ?',
+            (limit, offset)
+        )
+        return cursor.fetchall()
+
+
+def get_user_overview_page(offset: int, limit: int) -> List[tuple]:
+    """(user_id, package, spins_available, level, created_at) rows for the
+    paginated admin user overview, ordered by the user_id primary key
+
+    created_at comes back already rendered as 'YYYY-MM-DD HH:MM:SS':
+    strftime handles both ISO-with-'T' and CURRENT_TIMESTAMP rows in C,
+    so the handler skips a Python datetime parse per row. Rows with
+    unparseable timestamps fall back to the raw value.
+    """
+    with read_conn() as conn:
+        return conn.execute(
+            "SELECT user_id, package, spins_available, level, "
+            "COALESCE(strftime('%Y-%m-%d %H:%M:%S', created_at), created_at, 'Unknown') "
+            'FROM users ORDER BY user_id LIMIT ? OFFSET ?',
+            (limit, offset)
+        ).fetchall()
+
+
+def get_package_distribution() -> List[tuple]:
+    """(package, users) rows across all users, including 'None'"""
+    with read_conn() as conn:
+        return conn.execute(
+            'SELECT package, COUNT(*) FROM users GROUP BY package'
+        ).fetchall()
+
+
+def get_package_stats() -> List[tuple]:
+    """Per-package aggregates for the admin stats views
+
+    Returns (package, users, total_spins, total_hits, total_points) rows;
+    the GROUP BY runs inside sqlite against idx_users_package instead of
+    scanning every user in Python.
+    """
+    with read_conn() as conn:
+        return conn.execute(
+            "SELECT package, COUNT(*), SUM(total_spins), SUM(hits), SUM(spin_points) "
+            "FROM users WHERE package != 'None' GROUP BY package"
+        ).fetchall()
+
+
+def get_level_stats() -> List[tuple]:
+    """(level, users) rows for the admin level-distribution view"""
+    with read_conn() as conn:
+        return conn.execute(
+            "SELECT level, COUNT(*) FROM users GROUP BY level"
+        ).fetchall()
+
+
+def get_spin_totals() -> tuple:
+    """(total_spins, total_hits, active_users) aggregated across all users"""
+    with read_conn() as conn:
+        return conn.execute(
+            "SELECT COALESCE(SUM(total_spins), 0), COALESCE(SUM(hits), 0), "
+            "COALESCE(SUM(total_spins > 0), 0) FROM users"
+        ).fetchone()
+
+
+def get_ton_totals() -> tuple:
+    """(payments, total TON) across all processed TON transactions
+
+    One aggregate query instead of materializing every row just to count
+    and sum it in Python.
+    """
+    with read_conn() as conn:
+        count, total_nano = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(amount_nano), 0) FROM processed_transactions'
+        ).fetchone()
+    return count, total_nano / 1e9
+
+
+def get_stars_totals() -> tuple:
+    """(payments, total Stars) across all Stars transactions"""
+    with read_conn() as conn:
+        return conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(amount), 0) FROM stars_transactions'
+        ).fetchone()
+
+
+def get_ton_revenue_by_package() -> List[tuple]:
+    """(package, sales, total TON) rows for the revenue analytics view"""
+    with read_conn() as conn:
+        rows = conn.execute(
+            'SELECT package, COUNT(*), COALESCE(SUM(amount_nano), 0) '
+            'FROM processed_transactions GROUP BY package'
+        ).fetchall()
+    return [(package, count, total_nano / 1e9) for package, count, total_nano in rows]
+
+
+def get_stars_revenue_by_package() -> List[tuple]:
+    """(package, sales, total Stars) rows for the revenue analytics view"""
+    with read_conn() as conn:
+        return conn.execute(
+            'SELECT package, COUNT(*), COALESCE(SUM(amount), 0) '
+            'FROM stars_transactions GROUP BY package'
+        ).fetchall()
+
+
+def get_recent_ton_transactions(limit: int = 3) -> List[Dict[str, Any]]:
+    """Newest TON transactions, same shape as load_ton_transactions() rows
+
+    LIMIT in SQL instead of loading the full table and slicing in Python.
+    """
+    with read_conn() as conn:
+        rows = conn.execute(
+            'SELECT tx_hash, user_id, package, amount_nano, processed_at '
+            'FROM processed_transactions ORDER BY processed_at DESC LIMIT ?',
+            (limit,)
+        ).fetchall()
+    return [{
+        'tx_hash': row[0],
+        'user_id': row[1],
+        'package': row[2],
+        'amount': row[3] / 1e9,  # Convert from nanoTON to TON
+        'processed_at': row[4]
+    } for row in rows]
+
+
+def get_recent_stars_transactions(limit: int = 3) -> List[Dict[str, Any]]:
+    """Newest Stars transactions, same shape as load_stars_transactions() rows"""
+    with read_conn() as conn:
+        rows = conn.execute(
+            'SELECT transaction_id, user_id, package, amount, timestamp '
+            'FROM stars_transactions ORDER BY timestamp DESC LIMIT ?',
+            (limit,)
+        ).fetchall()
+    return [{
+        'id': row[0],
+        'user_id': row[1],
+        'package': row[2],
+        'amount_stars': row[3],
+        'processed_at': row[4]
+    } for row in rows]
+
+
+_user_count_cache = (0.0, 0)  # (monotonic timestamp, count)
+
+
+def count_users() -> int:
+    """Total user count, cached for 30s (admin menus don't need it exact)"""
+    global _user_count_cache
+    cached_at, count = _user_count_cache
+    now = time.monotonic()
+    if now - cached_at < 30:
+        return count
+    with read_conn() as conn:
+        count = conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+    _user_count_cache = (now, count)
+    return count
+
+
 def get_all_users() -> Dict[int, Dict[str, Any]]:
     """Get all users from database"""
-    conn = sqlite3.connect('cgspins.db')
+    conn = db_connect()
     cursor = conn.cursor()
     
     cursor.execute('SELECT user_id FROM users')
@@ -17,7 +17,7 @@ from .helpers import (
     send_nft_reward_message
 )
 
-from .logger import setup_logger, get_logger
+from .logger import setup_logger, setup_queue_logger, get_logger
 from .error_handler import (
     handle_errors, 
     safe_execute, 
@@ -4,8 +4,10 @@ Provides structured logging with different levels and proper formatting
 """
 
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 class ColoredFormatter(logging.Formatter):
@@ -79,6 +81,39 @@ def setup_logger(name: str = "CGSpinsBot", level: str = "INFO", log_file: Option
     
     return logger
 
+def setup_queue_logger(name: str = "CGSpinsBot", level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
+    """
+    Set up a logger whose handlers run on a background thread
+
+    Records are pushed onto an in-memory queue and written out by a
+    QueueListener thread, so handlers never block the asyncio event loop
+    with stdout/file write() syscalls.
+
+    Args:
+        name: Logger name
+        level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        log_file: Optional file path for logging
+
+    Returns:
+        Configured logger instance
+    """
+    logger = setup_logger(name, level, log_file)
+
+    # Already converted to queue-based logging
+    if any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+        return logger
+
+    # Move the real handlers behind a queue + listener thread
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    logger.handlers = [QueueHandler(log_queue)]
+    listener.start()
+
+    # Keep a reference so the listener isn't garbage collected
+    logger._queue_listener = listener
+
+    return logger
+
 def get_logger(name: str = "CGSpinsBot") -> logging.Logger:
     """
     Get a logger instance, creating it if it doesn't exist
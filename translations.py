@@ -7,6 +7,9 @@ Translation system for CG Spins Bot
 Supports English and Russian languages
 """
 
+import time
+from functools import lru_cache
+
 TRANSLATIONS = {
     "en": {
         # Main Menu
@@ -945,7 +948,29 @@ def get_text(user_id, key, **kwargs):
     print(f"🌐 [Translation] Returning text for key '{key}' in language '{user_lang}': {text[:50]}...")
     return text.format(**kwargs) if kwargs else text
 
+# user_id -> (monotonic timestamp, lang). Every label in a keyboard build
+# goes through get_user_language, and the uncached path reloads the user row
+# from the database; the TTL turns a per-label DB read into one per minute.
+_LANG_CACHE_TTL = 60  # seconds
+_lang_cache = {}
+
+
 def get_user_language(user_id):
+    """Get user's preferred language (cached; see invalidate_user_language)"""
+    cached = _lang_cache.get(user_id)
+    if cached is not None and time.monotonic() - cached[0] < _LANG_CACHE_TTL:
+        return cached[1]
+    language = _load_user_language(user_id)
+    _lang_cache[user_id] = (time.monotonic(), language)
+    return language
+
+
+def invalidate_user_language(user_id):
+    """Drop the cached language, e.g. after the user switches it"""
+    _lang_cache.pop(user_id, None)
+
+
+def _load_user_language(user_id):
     """Get user's preferred language"""
     # Import here to avoid circular imports
     from main import user_data
@@ -1129,11 +1154,16 @@ ADMIN_TRANSLATIONS = {
     }
 }
 
+@lru_cache(maxsize=4096)
+def _admin_text_for_lang(language: str, key: str) -> str:
+    """Resolve an admin label for a language, with English fallback"""
+    return ADMIN_TRANSLATIONS.get(language, {}).get(key, ADMIN_TRANSLATIONS["en"].get(key, key))
+
+
 def get_admin_text(user_id: int, key: str, **kwargs) -> str:
     """Get admin panel text in user's language"""
-    language = get_user_language(user_id)
-    text = ADMIN_TRANSLATIONS.get(language, {}).get(key, ADMIN_TRANSLATIONS["en"].get(key, key))
-    
+    text = _admin_text_for_lang(get_user_language(user_id), key)
+
     # Format with provided parameters
     if kwargs:
         try: